@@ -3,9 +3,9 @@
 Material Icons Display Update Summary
 =====================================
 """
-import json
+from catalogue import get_catalogue
 
-inv = json.load(open('inventory.json'))
+inv = get_catalogue().inventory.records
 
 print("""
 ╔════════════════════════════════════════════════════════════════════╗
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for gi.yatta.moe, api.lunaris.moe and gi.lunaris.moe.
+
+Point the fetchers at it with SKIRK_BASE_URL (see http_client.py); every
+request then arrives here as /<original host>/<path>.
+
+record   forwards each request to the real host, returns the response and
+         saves it to the cassette directory if it was a success (2xx/3xx);
+         429s, other 4xx and 5xx pass through unrecorded, so a throttled
+         recording session can simply be rerun
+replay   serves saved responses only (404 for anything never recorded), with
+         optional fault injection: fixed latency plus jitter, random error
+         responses and random 429s with a Retry-After header. Conditional
+         requests (If-None-Match / If-Modified-Since) get 304s, so the HTTP
+         cache behaves as it would against the real API.
+
+    python api_replay.py record &
+    SKIRK_BASE_URL=http://127.0.0.1:8765 python download_weapons.py --async
+    python api_replay.py replay --latency-ms 80 --jitter-ms 40 --throttle-rate 0.05
+
+Cassettes live in .cache/cassettes/<host>/<key>.json (status, headers, URL)
+with the body next to it in <key>.body. A summary of what was served is
+printed on Ctrl+C.
+"""
+import argparse
+import asyncio
+import hashlib
+import http
+import json
+import os
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+
+from http_client import HttpClient
+
+CASSETTE_DIR = os.path.join(".cache", "cassettes")
+DEFAULT_PORT = 8765
+# Response headers worth replaying; everything else is regenerated
+KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Cache-Control")
+
+
+class Cassettes:
+    """Recorded responses keyed by host and request target (path + query)"""
+
+    def __init__(self, directory=CASSETTE_DIR):
+        self.directory = directory
+
+    def _paths(self, host, target):
+        key = hashlib.sha256(("%s%s" % (host, target)).encode("utf-8")).hexdigest()[:24]
+        base = os.path.join(self.directory, host, key)
+        return base + ".json", base + ".body"
+
+    def load(self, host, target):
+        meta_path, body_path = self._paths(host, target)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None, None
+        return meta, body
+
+    def save(self, host, target, status, headers, body):
+        meta_path, body_path = self._paths(host, target)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        meta = {
+            "url": "https://%s%s" % (host, target),
+            "status": status,
+            "headers": {name: headers[name] for name in KEPT_HEADERS if name in headers},
+            "recorded_at": time.time(),
+        }
+        for path, data in ((body_path, body), (meta_path, json.dumps(meta, indent=2).encode("utf-8"))):
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+
+    def entries(self):
+        for root, _, files in os.walk(self.directory):
+            for name in sorted(files):
+                if name.endswith(".json"):
+                    with open(os.path.join(root, name), "r", encoding="utf-8") as f:
+                        meta = json.load(f)
+                    yield meta, os.path.getsize(os.path.join(root, name[:-len(".json")] + ".body"))
+
+
+class StandIn:
+    """HTTP/1.1 keep-alive server that records or replays API responses"""
+
+    def __init__(self, cassettes, record=False, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0,
+                 error_status=503, throttle_rate=0.0, retry_after=1.0, seed=None):
+        self.cassettes = cassettes
+        self.record = record
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        # Always the real hosts: never SKIRK_BASE_URL, which may point back at this server
+        self.upstream = HttpClient(max_retries=0, base_url=None) if record else None
+        self.stats = {"requests": 0, "connections": 0, "recorded": 0, "missing": 0,
+                      "injected_errors": 0, "throttled": 0, "not_modified": 0, "upstream_errors": 0, "bytes": 0}
+        self.status_counts = {}
+
+    async def respond(self, method, target, headers):
+        """(status, headers, body) for one request"""
+        host, _, rest = target.lstrip("/").partition("/")
+        path = "/" + rest
+        if not host:
+            return 400, {"Content-Type": "text/plain"}, b"expected /<host>/<path>\n"
+
+        if not self.record:
+            delay = self.latency + self.random.uniform(-self.jitter, self.jitter)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            roll = self.random.random()
+            if roll < self.throttle_rate:
+                self.stats["throttled"] += 1
+                return 429, {"Retry-After": "%g" % self.retry_after, "Content-Type": "text/plain"}, b"throttled\n"
+            if roll < self.throttle_rate + self.error_rate:
+                self.stats["injected_errors"] += 1
+                return self.error_status, {"Content-Type": "text/plain"}, b"injected error\n"
+
+        meta, body = self.cassettes.load(host, path)
+        if meta is None and self.record:
+            url = "https://%s%s" % (host, path)
+            loop = asyncio.get_running_loop()
+            try:
+                response = await loop.run_in_executor(None, lambda: self.upstream.get(url, timeout=30))
+            except requests.RequestException as e:
+                self.stats["upstream_errors"] += 1
+                return 502, {"Content-Type": "text/plain"}, ("upstream failed: %s: %s\n" % (url, e)).encode("utf-8")
+            if not 200 <= response.status_code < 400:
+                # Pass throttling and upstream failures through without recording them
+                kept = {name: response.headers[name] for name in KEPT_HEADERS + ("Retry-After",)
+                        if name in response.headers}
+                return response.status_code, kept, response.content
+            self.cassettes.save(host, path, response.status_code, response.headers, response.content)
+            self.stats["recorded"] += 1
+            meta, body = self.cassettes.load(host, path)
+        if meta is None:
+            self.stats["missing"] += 1
+            return 404, {"Content-Type": "text/plain"}, ("not recorded: https://%s%s\n" % (host, path)).encode("utf-8")
+
+        stored = meta.get("headers", {})
+        etag = stored.get("ETag")
+        modified = stored.get("Last-Modified")
+        if meta["status"] == 200 and ((etag and headers.get("if-none-match") == etag)
+                                      or (modified and headers.get("if-modified-since") == modified)):
+            self.stats["not_modified"] += 1
+            return 304, {name: value for name, value in stored.items() if name in ("ETag", "Last-Modified")}, b""
+        return meta["status"], dict(stored), body
+
+    async def handle(self, reader, writer):
+        self.stats["connections"] += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length") or 0)
+                if length:
+                    await reader.readexactly(length)
+
+                self.stats["requests"] += 1
+                parts = urlsplit(target)
+                status, response_headers, body = await self.respond(
+                    method, parts.path + ("?" + parts.query if parts.query else ""), headers)
+                self.status_counts[status] = self.status_counts.get(status, 0) + 1
+                keep_alive = headers.get("connection", "").lower() != "close"
+                response_headers["Content-Length"] = str(len(body))
+                response_headers["Connection"] = "keep-alive" if keep_alive else "close"
+                head = "HTTP/1.1 %d %s\r\n" % (status, http.HTTPStatus(status).phrase)
+                head += "".join("%s: %s\r\n" % item for item in response_headers.items()) + "\r\n"
+                writer.write(head.encode("latin-1"))
+                if method != "HEAD":
+                    writer.write(body)
+                    self.stats["bytes"] += len(body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=DEFAULT_PORT, ready=None):
+        server = await asyncio.start_server(self.handle, host, port)
+        bound = server.sockets[0].getsockname()
+        if ready:
+            ready(bound[1])
+        async with server:
+            await server.serve_forever()
+
+    def summary(self):
+        s = self.stats
+        statuses = ", ".join("%d×%d" % (n, status) for status, n in sorted(self.status_counts.items()))
+        return ("%d requests on %d connections (%s); %d recorded, %d missing, %d throttled, "
+                "%d injected errors, %d upstream errors, %d not modified, %.1f KB served" % (
+                    s["requests"], s["connections"], statuses or "none", s["recorded"], s["missing"],
+                    s["throttled"], s["injected_errors"], s["upstream_errors"], s["not_modified"],
+                    s["bytes"] / 1024))
+
+
+def serve_in_background(stand_in, host="127.0.0.1", port=0):
+    """Run `stand_in` on a daemon thread; returns its base URL for SKIRK_BASE_URL or HttpClient(base_url=...)"""
+    started = threading.Event()
+    bound = {}
+
+    def ready(actual_port):
+        bound["port"] = actual_port
+        started.set()
+
+    thread = threading.Thread(target=lambda: asyncio.run(stand_in.serve(host, port, ready)), daemon=True)
+    thread.start()
+    started.wait()
+    return "http://%s:%d" % (host, bound["port"])
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Record or replay the game data APIs locally")
+    parser.add_argument("mode", choices=["record", "replay", "list"])
+    parser.add_argument("--cassettes", default=CASSETTE_DIR, help="cassette directory (default: %(default)s)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    faults = parser.add_argument_group("replay fault injection")
+    faults.add_argument("--latency-ms", type=float, default=0.0, help="delay before every response")
+    faults.add_argument("--jitter-ms", type=float, default=0.0, help="uniform +/- variation of the delay")
+    faults.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with an error")
+    faults.add_argument("--error-status", type=int, default=503, help="status for injected errors (default: 503)")
+    faults.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of requests answered with 429")
+    faults.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429s")
+    faults.add_argument("--seed", type=int, help="seed the fault injection for repeatable runs")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    cassettes = Cassettes(args.cassettes)
+
+    if args.mode == "list":
+        total = 0
+        for meta, size in cassettes.entries():
+            total += size
+            print("%3d %9.1f KB  %s" % (meta["status"], size / 1024, meta["url"]))
+        print("%.1f KB in %s" % (total / 1024, args.cassettes))
+        return
+
+    stand_in = StandIn(cassettes, record=args.mode == "record", latency_ms=args.latency_ms,
+                       jitter_ms=args.jitter_ms, error_rate=args.error_rate, error_status=args.error_status,
+                       throttle_rate=args.throttle_rate, retry_after=args.retry_after, seed=args.seed)
+
+    def ready(port):
+        print("%s on http://%s:%d (cassettes: %s)" % (
+            "Recording" if stand_in.record else "Replaying", args.host, port, args.cassettes))
+        print("  export SKIRK_BASE_URL=http://%s:%d" % (args.host, port), flush=True)
+
+    try:
+        asyncio.run(stand_in.serve(args.host, args.port, ready))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print("\n" + stand_in.summary())
+
+
+if __name__ == "__main__":
+    main()
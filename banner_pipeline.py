@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Banner data pipeline: banners API + character_map.json + characters.json ->
+banners-data/*.json and banners-data.json.
+
+Replaces process_banners.py, update_banners_with_images.py,
+update_gacha_images.py and consolidate_banners.py, which passed their results
+to each other through banners-data/ and re-parsed and rewrote the same files
+three times. Here every input is parsed once, characters are joined through
+an id index in memory, and each output is written exactly once after all of
+them have been built, so a failure never leaves half-updated files behind.
+The outputs are byte-identical to the four-script sequence.
+
+    python banner_pipeline.py                     # fetch from gi.lunaris.moe (HTTP cache applies)
+    python banner_pipeline.py --banners raw.json  # use a saved API response instead
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from catalogue import get_catalogue
+from http_cache import HttpCache
+from jsonio import write_json
+
+BANNERS_URL = "https://gi.lunaris.moe/data/banners.json"
+OUTPUT_DIR = Path("banners-data")
+CONSOLIDATED_PATH = "banners-data.json"
+GACHA_IMAGE_URL = "https://gi.yatta.moe/assets/UI/UI_Gacha_AvatarImg_{}.png?vh=2024123000"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build banners-data.json from the banners API")
+    parser.add_argument("--banners", metavar="FILE", help="read the banners API response from FILE")
+    return parser.parse_args()
+
+
+def load_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def fetch_banners():
+    print("Fetching banners data from gi.lunaris.moe...")
+    cache = HttpCache()
+    data = cache.get_json(BANNERS_URL)
+    print("✓ Successfully fetched banners data")
+    print(f"  {cache.summary()}")
+    return data
+
+
+def join_names(banners_data, character_map):
+    """{version: [{id, name}]} in API order, with a placeholder name for unknown ids"""
+    processed = {}
+    for version, character_ids in banners_data["version"].items():
+        entries = []
+        for char_id in character_ids:
+            mapped = character_map.get(str(char_id))
+            if mapped is None:
+                print(f"⚠ Warning: Character ID {char_id} not found in character map")
+            entries.append({"id": char_id, "name": mapped["name"] if mapped else f"Unknown (ID: {char_id})"})
+        processed[version] = entries
+    return processed
+
+
+def character_appearances(processed):
+    """{name: {id, versions}}, newest version first"""
+    appearances = {}
+    for version, entries in processed.items():
+        for entry in entries:
+            appearances.setdefault(entry["name"], {"id": entry["id"], "versions": []})["versions"].append(version)
+    for info in appearances.values():
+        info["versions"].sort(key=float, reverse=True)
+    return appearances
+
+
+def summarize(processed, appearances):
+    total_appearances = sum(len(info["versions"]) for info in appearances.values())
+    return {
+        "total_versions": len(processed),
+        "unique_characters": len(appearances),
+        "total_character_appearances": total_appearances,
+        "average_appearances_per_character": round(total_appearances / len(appearances), 2),
+        "versions": list(processed.keys()),
+    }
+
+
+def add_artwork(processed, appearances, characters):
+    """
+    Join characters.json records in by id. Fields are set in the order the old image
+    passes set them (icon, vision and weapon first, then the gacha artwork over
+    the icon plus an icon fallback) so the JSON comes out key-for-key the same.
+    """
+    by_id = {}
+    with_icon = {}
+    for char in characters:
+        by_id[str(char.get("id"))] = char
+        if char.get("image", ""):
+            with_icon[str(char.get("id"))] = char
+
+    def apply(target, char_id):
+        icon_char = with_icon.get(char_id)
+        if icon_char is not None:
+            target["image"] = icon_char["image"]
+            target["vision"] = icon_char.get("vision", "Unknown")
+            target["weapon"] = icon_char.get("weapon", "Unknown")
+        char = by_id.get(char_id)
+        if char is not None:
+            target["image"] = GACHA_IMAGE_URL.format(char.get("name", "Unknown").replace(" ", ""))
+            target["icon"] = char.get("image", "")
+
+    for name, info in appearances.items():
+        char_id = str(info["id"])
+        if char_id not in with_icon:
+            print(f"⚠ Warning: Image not found for {name} (ID: {char_id})")
+            info["image"] = ""
+            info["vision"] = "Unknown"
+            info["weapon"] = "Unknown"
+        apply(info, char_id)
+
+    for entries in processed.values():
+        for entry in entries:
+            apply(entry, str(entry["id"]))
+
+
+def main():
+    args = parse_args()
+    try:
+        banners_data = load_json(args.banners) if args.banners else fetch_banners()
+        character_map = get_catalogue().character_map
+        characters = get_catalogue().characters
+        character_map.load()
+        characters.load()
+    except Exception as e:
+        print(f"✗ Error loading banner inputs: {e}")
+        sys.exit(1)
+    print(f"✓ Loaded {len(character_map)} mapped characters, {len(characters)} character records")
+
+    processed = join_names(banners_data, character_map)
+    appearances = character_appearances(processed)
+    summary = summarize(processed, appearances)
+    add_artwork(processed, appearances, characters)
+
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    write_json(OUTPUT_DIR / "banners_raw.json", banners_data, indent=2)
+    write_json(OUTPUT_DIR / "banners_processed.json", processed, indent=2)
+    write_json(OUTPUT_DIR / "character_appearances.json", appearances, indent=2)
+    write_json(OUTPUT_DIR / "summary.json", summary, indent=2)
+    write_json(CONSOLIDATED_PATH, {"banners": processed, "characters": appearances, "summary": summary},
+               indent=2, ensure_ascii=True)
+
+    print(f"✓ Created {CONSOLIDATED_PATH} and banners-data/")
+    print(f"  - Banners: {summary['total_versions']} versions")
+    print(f"  - Characters: {summary['unique_characters']} unique characters")
+    print(f"  - Appearances: {summary['total_character_appearances']} "
+          f"({summary['average_appearances_per_character']} per character)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark cold-start catalogue loading: plain json.load against catalogue.py
+with and without its marshal snapshots.
+
+Every measurement runs in a fresh interpreter (imports excluded from the
+timing) against a scratch site built like bench_pipeline.py's, at 1x, 10x
+and 100x the real catalogue, and loads all of it: the six record datasets
+plus version_diffs.json, character_changes.json and changelog_data.json.
+
+    json       json.load of every file
+    marshal    catalogue.load_document of every file from valid snapshots (no records)
+    records    catalogue with snapshots off: json.load plus building records
+    miss       catalogue with no snapshots yet: parse, build records, write snapshots
+    hit        catalogue with valid snapshots: marshal load plus building records
+
+The two speedups printed compare like with like: json against marshal
+(decoding alone) and records against hit (a whole catalogue load).
+
+Before timing, the decoded snapshots are checked against json.load.
+
+    python benchmarks/bench_catalogue.py --scales 1 10
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from bench_pipeline import build_fixture, copy_name  # noqa: E402
+from catalogue import DATASETS, DOCUMENTS, SNAPSHOT_DIR, load_document  # noqa: E402
+
+MODES = ("json", "marshal", "records", "miss", "hit")
+
+CHILD = r"""
+import json, sys, time
+mode = sys.argv[1]
+if mode == "json":
+    files = json.loads(sys.argv[2])
+    started = time.perf_counter()
+    for path in files:
+        with open(path, "r", encoding="utf-8") as f:
+            json.load(f)
+elif mode == "marshal":
+    import os
+    from catalogue import SNAPSHOT_DIR, load_document
+    files = json.loads(sys.argv[2])
+    started = time.perf_counter()
+    for path in files:
+        load_document(path, os.path.join(SNAPSHOT_DIR, path + ".marshal"))
+else:
+    from catalogue import DATASETS, DOCUMENTS, get_catalogue
+    started = time.perf_counter()
+    catalogue = get_catalogue()
+    for name in DATASETS:
+        len(catalogue.dataset(name))
+    for name in DOCUMENTS:
+        catalogue.document(name)
+print(time.perf_counter() - started)
+"""
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark cold-start catalogue loading")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100],
+                        help="catalogue multipliers (default: 1 10 100)")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="fresh processes per mode; the fastest is reported (default: 5)")
+    return parser.parse_args()
+
+
+def scaled_document(name, scale):
+    """A top-level-keyed copy of ROOT/name with every key repeated `scale` times"""
+    with open(os.path.join(ROOT, name), "r", encoding="utf-8") as f:
+        document = json.load(f)
+    return {copy_name(key, copy): value for copy in range(scale) for key, value in document.items()}
+
+
+def build_site(directory, scale):
+    sizes = build_fixture(directory, scale)
+    # inventory.json is generated, so derive it from the scaled materials.json
+    subprocess.run([sys.executable, os.path.join(ROOT, "generate_inventory.py")], cwd=directory,
+                   check=True, stdout=subprocess.DEVNULL)
+    for filename in DOCUMENTS.values():
+        with open(os.path.join(directory, filename), "w", encoding="utf-8") as f:
+            json.dump(scaled_document(filename, scale), f, indent=2, ensure_ascii=False)
+    return sizes
+
+
+def files():
+    return [filename for filename, _ in DATASETS.values()] + list(DOCUMENTS.values())
+
+
+def run_child(directory, mode):
+    env = dict(os.environ, PYTHONPATH=ROOT, SKIRK_CATALOGUE_SNAPSHOTS="0" if mode == "records" else "1")
+    env.pop("SKIRK_CATALOGUE_SNAPSHOT_DIR", None)
+    env.pop("SKIRK_METRICS_FILE", None)
+    if mode == "miss":
+        shutil.rmtree(os.path.join(directory, SNAPSHOT_DIR), ignore_errors=True)
+    result = subprocess.run([sys.executable, "-c", CHILD, mode, json.dumps(files())], cwd=directory, env=env,
+                            check=True, capture_output=True, text=True)
+    return float(result.stdout.split()[-1])
+
+
+def check_snapshots(directory):
+    """Every snapshot must decode to exactly what json.load gives"""
+    for filename in files():
+        path = os.path.join(directory, filename)
+        with open(path, "r", encoding="utf-8") as f:
+            expected = json.load(f)
+        document, _ = load_document(path, os.path.join(directory, SNAPSHOT_DIR, filename + ".marshal"))
+        if document != expected:
+            raise RuntimeError("snapshot of %s does not match its source" % filename)
+
+
+def main():
+    args = parse_args()
+    print("%6s %9s  %s  %8s %8s" % ("scale", "source", "  ".join("%10s" % mode for mode in MODES),
+                                    "decode", "load"))
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory(prefix="bench-catalogue-") as directory:
+            build_site(directory, scale)
+            source_bytes = sum(os.path.getsize(os.path.join(directory, name)) for name in files())
+            run_child(directory, "miss")
+            check_snapshots(directory)
+            best = {}
+            for mode in MODES:
+                best[mode] = min(run_child(directory, mode) for _ in range(args.repeat))
+            print("%5dx %7.1fMB  %s  %7.2fx %7.2fx" % (
+                scale, source_bytes / 1e6, "  ".join("%8.1fms" % (best[mode] * 1000) for mode in MODES),
+                best["json"] / best["marshal"], best["records"] / best["hit"]), flush=True)
+
+
+if __name__ == "__main__":
+    main()
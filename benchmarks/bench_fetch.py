@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark download_weapons.py's serial fetch loop against fetch_engine.
+
+Starts a local stub API (keep-alive HTTP/1.1, one thread per connection) that
+answers /weapon/<id> with a small JSON body after a fixed --latency-ms, then
+fetches --count ids two ways through the shared HttpClient:
+
+    serial   one request at a time with the 0.15s pause download_weapons.py
+             makes between requests (what it does without --async)
+    async    fetch_engine.fetch_all at --rate requests per second with at most
+             --max-in-flight requests open (what --async does)
+
+Both runs must return the same bodies. Prints wall time, request rate and the
+peak number of requests the server saw at once for each, and exits 1 if the
+speedup is below --min-speedup.
+
+    python benchmarks/bench_fetch.py                       # 227 weapons, 80ms latency
+    python benchmarks/bench_fetch.py --count 60 --latency-ms 150
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fetch_engine import DEFAULT_MAX_IN_FLIGHT, DEFAULT_RATE, fetch_all  # noqa: E402
+from http_client import HttpClient  # noqa: E402
+
+# Pause between requests in download_weapons.py's serial mode
+SERIAL_DELAY = 0.15
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark serial against fetch_engine fetching")
+    parser.add_argument("--count", type=int, default=227, help="ids to fetch (default: %(default)s, the weapon count)")
+    parser.add_argument("--latency-ms", type=float, default=80.0,
+                        help="stub server response latency (default: %(default)s)")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE,
+                        help="async requests per second (default: %(default)s)")
+    parser.add_argument("--max-in-flight", type=int, default=DEFAULT_MAX_IN_FLIGHT,
+                        help="async concurrent requests (default: %(default)s)")
+    parser.add_argument("--min-speedup", type=float, default=5.0,
+                        help="fail below this speedup (default: %(default)s)")
+    return parser.parse_args()
+
+
+class StubServer(ThreadingHTTPServer):
+    """Answers every GET after a fixed delay and tracks how many it serves at once"""
+
+    daemon_threads = True
+
+    def __init__(self, latency):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.requests = 0
+
+    def reset(self):
+        with self.lock:
+            self.peak = 0
+            self.requests = 0
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.active += 1
+            server.requests += 1
+            server.peak = max(server.peak, server.active)
+        try:
+            time.sleep(server.latency)
+            body = json.dumps({"data": {"id": self.path.rsplit("/", 1)[-1], "name": self.path}}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run_serial(fetch, keys):
+    results = {}
+    for key in keys:
+        results[key] = fetch(key)
+        time.sleep(SERIAL_DELAY)
+    return results
+
+
+def run_async(fetch, keys, rate, max_in_flight):
+    return fetch_all(keys, fetch, rate=rate, max_in_flight=max_in_flight)
+
+
+def main():
+    args = parse_args()
+    server = StubServer(args.latency_ms / 1000)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = "http://127.0.0.1:%d/weapon" % server.server_address[1]
+    client = HttpClient(max_retries=0, default_host_limit=max(DEFAULT_MAX_IN_FLIGHT, args.max_in_flight))
+    keys = [str(11000 + i) for i in range(args.count)]
+
+    def fetch(key):
+        return client.get_json("%s/%s" % (base, key), timeout=10)
+
+    print("%d ids, %.0fms latency; async at %.1f req/s, %d in flight" % (
+        args.count, args.latency_ms, args.rate, args.max_in_flight))
+    print("%-8s %9s %10s %6s" % ("mode", "seconds", "req/s", "peak"))
+    timings = {}
+    outputs = {}
+    for mode, run in (("serial", lambda: run_serial(fetch, keys)),
+                      ("async", lambda: run_async(fetch, keys, args.rate, args.max_in_flight))):
+        server.reset()
+        started = time.perf_counter()
+        outputs[mode] = run()
+        timings[mode] = time.perf_counter() - started
+        print("%-8s %8.2fs %10.1f %6d" % (mode, timings[mode], server.requests / timings[mode], server.peak),
+              flush=True)
+    server.shutdown()
+    client.close()
+
+    failed = [key for key, result in outputs["async"].items() if isinstance(result, Exception)]
+    if failed or outputs["async"] != outputs["serial"]:
+        sys.exit("✗ async results differ from serial (%d failed)" % len(failed))
+    speedup = timings["serial"] / timings["async"]
+    print("\nSpeedup: %.1fx" % speedup)
+    if speedup < args.min_speedup:
+        sys.exit("✗ below the %.1fx target" % args.min_speedup)
+
+
+if __name__ == "__main__":
+    main()
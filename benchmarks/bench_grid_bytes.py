@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Measure the image bytes each grid page downloads, with and without the
+thumbnails from optimize_images.py.
+
+For weapons.html, artifacts.html, inventory.html and characters.html, builds
+the tile image URLs the way script.js and characters.js do from the JSON the
+page fetches, then sums over the distinct URLs:
+
+    original     the mirrored original in images/manifest.json (what the page
+                 loaded before it read images/grid-variants.json)
+    thumbnails   the srcset candidate a browser picks from
+                 images/grid-variants.json for the tile's `sizes` slot at
+                 --viewport and --dpr, or the original when the URL has none
+
+Run download_images.py and optimize_images.py first; tiles whose image is not
+mirrored are counted but not sized. The `sizes` values below must match the
+renderers, and the run fails if either script no longer contains them.
+Exits 1 if the whole set of pages loads less than --min-ratio times fewer bytes.
+
+    python benchmarks/bench_grid_bytes.py
+    python benchmarks/bench_grid_bytes.py --viewport 390 --dpr 3 --no-avif
+"""
+import argparse
+import json
+import os
+import re
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from download_images import MANIFEST_PATH as MIRROR_MANIFEST  # noqa: E402
+from image_variants import GRID_MANIFEST  # noqa: E402
+
+ICON_BASE = "https://gi.yatta.moe/assets/UI"
+CHARACTER_PLACEHOLDER = "https://via.placeholder.com/220x280?text=No+Image"
+
+# page -> (data file, renderer, [(tile image URL for a record, sizes)])
+PAGES = {
+    "weapons.html": ("weapons.json", "script.js", [
+        (lambda item: "%s/%s.png" % (ICON_BASE, item.get("icon") or item.get("name") or "weapon"),
+         "(max-width: 768px) 64px, 136px"),
+    ]),
+    "artifacts.html": ("artifacts.json", "script.js", [
+        (lambda item: "%s/reliquary/%s.png?vh=2024123000" % (
+            ICON_BASE, item.get("icon") or item.get("name") or "artifact"),
+         "(max-width: 768px) 64px, 124px"),
+    ]),
+    "inventory.html": ("inventory.json", "script.js", [
+        (lambda item: "%s/%s.png" % (ICON_BASE, item.get("icon")), "60px"),
+    ]),
+    "characters.html": ("characters.json", "characters.js", [
+        (lambda char: char.get("image") or CHARACTER_PLACEHOLDER, "(max-width: 768px) 110px, 240px"),
+        (lambda char: char.get("icon"), "(max-width: 768px) 18px, 28px"),
+    ]),
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Measure grid page image bytes with and without thumbnails")
+    parser.add_argument("--viewport", type=int, default=1280, help="viewport width in CSS px (default: %(default)s)")
+    parser.add_argument("--dpr", type=float, default=1.0, help="device pixel ratio (default: %(default)s)")
+    parser.add_argument("--no-avif", action="store_true", help="browser without AVIF support: use the WebP sources")
+    parser.add_argument("--min-ratio", type=float, default=2.0,
+                        help="fail below this reduction over all pages (default: %(default)s)")
+    return parser.parse_args()
+
+
+def load_json(path):
+    with open(os.path.join(ROOT, path), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def slot_width(sizes, viewport):
+    """CSS width `sizes` gives the image at `viewport` (only "(max-width: Npx) Wpx" conditions)"""
+    for part in sizes.split(","):
+        match = re.fullmatch(r"\s*\(max-width:\s*(\d+)px\)\s*(\d+)px\s*", part)
+        if not match:
+            return int(part.strip()[:-2])
+        if viewport <= int(match.group(1)):
+            return int(match.group(2))
+    raise ValueError("no default width in sizes %r" % sizes)
+
+
+def pick(entry, slot, dpr, no_avif):
+    """Path of the candidate a browser loads: the first usable format, smallest width covering slot * dpr"""
+    for fmt in ("avif", "webp"):
+        if fmt in entry and not (fmt == "avif" and no_avif):
+            widths = sorted(entry[fmt].items(), key=lambda item: int(item[0]))
+            for width, path in widths:
+                if int(width) >= slot * dpr:
+                    return path
+            return widths[-1][1]
+    return None
+
+
+def measure(page, mirror, variants, args):
+    """(tiles, unsized tiles, original bytes, thumbnail bytes) for one page"""
+    data_file, _, images = PAGES[page]
+    seen = {}
+    for record in load_json(data_file):
+        for tile_url, sizes in images:
+            url = tile_url(record)
+            if url and url not in seen:
+                seen[url] = sizes
+
+    unsized = original = thumbnails = 0
+    for url, sizes in seen.items():
+        base_url = url.split("?", 1)[0]
+        record = mirror.get(url) or mirror.get(base_url)
+        if not record:
+            unsized += 1
+            continue
+        original += record["size"]
+        entry = variants.get(base_url)
+        path = entry and pick(entry, slot_width(sizes, args.viewport), args.dpr, args.no_avif)
+        thumbnails += os.path.getsize(os.path.join(ROOT, path)) if path else record["size"]
+    return len(seen), unsized, original, thumbnails
+
+
+def main():
+    args = parse_args()
+
+    stale = []
+    for page, (_, renderer, images) in PAGES.items():
+        with open(os.path.join(ROOT, renderer), "r", encoding="utf-8") as f:
+            source = f.read()
+        stale.extend("%s: %s" % (renderer, sizes) for _, sizes in images if "'%s'" % sizes not in source)
+    if stale:
+        sys.exit("✗ sizes no longer used by the renderers, update PAGES: %s" % "; ".join(stale))
+
+    try:
+        mirror = load_json(MIRROR_MANIFEST)
+        variants = load_json(GRID_MANIFEST)
+    except (OSError, ValueError) as e:
+        sys.exit("✗ %s; run download_images.py and optimize_images.py first" % e)
+
+    print("%dpx viewport at %gx, %s" % (args.viewport, args.dpr, "WebP" if args.no_avif else "AVIF/WebP"))
+    print("%-16s %6s %8s %12s %14s %7s" % ("page", "tiles", "unsized", "original KB", "thumbnails KB", "ratio"))
+    total_original = total_thumbnails = 0
+    for page in PAGES:
+        tiles, unsized, original, thumbnails = measure(page, mirror, variants, args)
+        total_original += original
+        total_thumbnails += thumbnails
+        ratio = original / thumbnails if thumbnails else 0
+        print("%-16s %6d %8d %12.1f %14.1f %6.1fx" % (
+            page, tiles, unsized, original / 1024, thumbnails / 1024, ratio))
+
+    if not total_thumbnails:
+        sys.exit("✗ none of the grid images are mirrored")
+    ratio = total_original / total_thumbnails
+    print("\nAll grid pages: %.1f KB -> %.1f KB (%.1fx fewer bytes)" % (
+        total_original / 1024, total_thumbnails / 1024, ratio))
+    if ratio < args.min_ratio:
+        sys.exit("✗ below the %.1fx target" % args.min_ratio)
+
+
+if __name__ == "__main__":
+    main()
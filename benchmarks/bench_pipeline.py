@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Offline benchmarks for the data and page pipeline.
+
+Builds a scratch site from the data snapshots in the repo (materials.json,
+weapons.json, artifacts.json, characters.json, character_map.json and
+banners-data.json), multiplied to 1x, 10x and 100x the real catalogue, and
+times each stage by running its real entry point there:
+
+    inventory        generate_inventory: inventory.json + inventory-index/
+    inventory-index  generate_inventory --index-only
+    banners          banner_pipeline
+    weapon-pages     generate_weapon_pages (full rebuild)
+    artifact-pages   generate_artifact_pages (full rebuild)
+    search-index     build_search_index
+
+No network is used: the banner and Lunaris API responses are seeded into the
+scratch site's HTTP cache (banners from banners-data.json, Lunaris as empty),
+so the fetch code paths run but are served from disk. Copies of a record get
+ids offset by SCALE_ID_OFFSET and a " #n" name suffix so every page and key
+is distinct.
+
+Results are saved to benchmarks/results/<commit>.json (with -dirty for
+uncommitted trees) so runs can be compared across commits:
+
+    python benchmarks/bench_pipeline.py                       # 1x, 10x, 100x
+    python benchmarks/bench_pipeline.py --scales 1 10 --only inventory banners
+    python benchmarks/bench_pipeline.py --compare 1bd0789     # against a saved run
+"""
+import argparse
+import contextlib
+import datetime
+import glob
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+sys.path.insert(0, ROOT)
+
+# Serve the seeded API responses from the scratch cache no matter how old they look
+os.environ["SKIRK_HTTP_CACHE"] = "1"
+os.environ["SKIRK_HTTP_CACHE_TTL"] = str(10 ** 9)
+os.environ.pop("SKIRK_HTTP_CACHE_DIR", None)
+os.environ.pop("SKIRK_JSON_MODE", None)
+
+import banner_pipeline  # noqa: E402
+import build_search_index  # noqa: E402
+import instrumentation  # noqa: E402
+import generate_artifact_pages  # noqa: E402
+import generate_inventory  # noqa: E402
+import generate_weapon_pages  # noqa: E402
+from download_weapons import weapon_detail_path  # noqa: E402
+from http_cache import HttpCache  # noqa: E402
+
+SCALE_ID_OFFSET = 10 ** 9
+DEFAULT_SCALES = (1, 10, 100)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline offline at synthetic catalogue sizes")
+    parser.add_argument("--scales", type=int, nargs="+", default=list(DEFAULT_SCALES),
+                        help="catalogue multipliers (default: 1 10 100)")
+    parser.add_argument("--only", nargs="+", choices=[name for name, _, _ in BENCHMARKS],
+                        help="run only these benchmarks")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="runs per benchmark at 1x; the fastest is reported. Larger scales run "
+                             "max(1, repeat // scale) times (default: 3)")
+    parser.add_argument("--jobs", type=int, default=1, help="--jobs passed to the page generators")
+    parser.add_argument("--compare", metavar="REF",
+                        help="compare with a saved result (commit prefix or path)")
+    parser.add_argument("--no-save", action="store_true", help="do not write benchmarks/results/")
+    return parser.parse_args()
+
+
+def load_json(name):
+    with open(os.path.join(ROOT, name), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_json(path, obj):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False)
+
+
+def copy_id(value, copy):
+    """The id of the `copy`-th duplicate of a record, keeping the original's type"""
+    if not copy:
+        return value
+    scaled = int(value) + copy * SCALE_ID_OFFSET
+    return str(scaled) if isinstance(value, str) else scaled
+
+
+def copy_name(name, copy):
+    return name if not copy else "%s #%d" % (name, copy)
+
+
+def scaled_records(records, scale):
+    out = []
+    for copy in range(scale):
+        for record in records:
+            record = dict(record, id=copy_id(record.get("id"), copy))
+            if "name" in record:
+                record["name"] = copy_name(record["name"], copy)
+            out.append(record)
+    return out
+
+
+def build_fixture(directory, scale):
+    """Write a scratch site with every catalogue `scale` times its real size"""
+    weapons = scaled_records(load_json("weapons.json"), scale)
+    write_json(os.path.join(directory, "weapons.json"), weapons)
+    artifacts = scaled_records(load_json("artifacts.json"), scale)
+    write_json(os.path.join(directory, "artifacts.json"), artifacts)
+    characters = scaled_records(load_json("characters.json"), scale)
+    write_json(os.path.join(directory, "characters.json"), characters)
+
+    materials = load_json("materials.json")
+    items = {}
+    for copy in range(scale):
+        for item in materials["data"]["items"].values():
+            item = dict(item, id=copy_id(item["id"], copy), name=copy_name(item["name"], copy))
+            items[str(item["id"])] = item
+    materials["data"]["items"] = items
+    write_json(os.path.join(directory, "materials.json"), materials)
+
+    character_map = {}
+    for copy in range(scale):
+        for char_id, entry in load_json("character_map.json").items():
+            character_map[str(copy_id(int(char_id), copy))] = dict(entry, name=copy_name(entry["name"], copy))
+    write_json(os.path.join(directory, "character_map.json"), character_map)
+
+    # Weapon detail files are only present after download_weapons.py has run
+    for weapon in weapons:
+        original = weapon["name"].rsplit(" #", 1)[0]
+        source = os.path.join(ROOT, weapon_detail_path(original))
+        if os.path.exists(source):
+            target = os.path.join(directory, weapon_detail_path(weapon["name"]))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copyfile(source, target)
+
+    # The banners API payload ({"version": {version: [character ids]}}) recovered from
+    # banners-data.json; copies become later versions featuring the copied characters
+    banners = load_json("banners-data.json")["banners"]
+    versions = {}
+    for copy in range(scale):
+        for version, entries in banners.items():
+            key = "%.1f" % (float(version) + 10 * copy) if copy else version
+            versions[key] = [copy_id(entry["id"], copy) for entry in entries]
+
+    cwd = os.getcwd()
+    os.chdir(directory)
+    try:
+        cache = HttpCache()
+        for url, payload in ((banner_pipeline.BANNERS_URL, {"version": versions}), (generate_artifact_pages.LUNARIS_URL, {})):
+            cache.put(url, json.dumps(payload).encode("utf-8"))
+    finally:
+        os.chdir(cwd)
+
+    return {"weapons": len(weapons), "artifacts": len(artifacts),
+            "characters": len(characters), "materials": len(items), "banner_versions": len(versions)}
+
+
+def call_main(module, *argv):
+    saved = sys.argv
+    sys.argv = [module.__file__, *argv]
+    try:
+        module.main()
+    finally:
+        sys.argv = saved
+
+
+def bench_inventory(args):
+    call_main(generate_inventory)
+
+
+def bench_inventory_index(args):
+    call_main(generate_inventory, "--index-only")
+
+
+def bench_banners(args):
+    call_main(banner_pipeline)
+
+
+def bench_weapon_pages(args):
+    call_main(generate_weapon_pages, "--jobs", str(args.jobs))
+
+
+def bench_artifact_pages(args):
+    call_main(generate_artifact_pages, "--jobs", str(args.jobs))
+
+
+def bench_search_index(args):
+    call_main(build_search_index)
+
+
+# (name, function, fixture count used for throughput)
+BENCHMARKS = [
+    ("inventory", bench_inventory, "materials"),
+    ("inventory-index", bench_inventory_index, "materials"),
+    ("banners", bench_banners, "banner_versions"),
+    ("weapon-pages", bench_weapon_pages, "weapons"),
+    ("artifact-pages", bench_artifact_pages, "artifacts"),
+    ("search-index", bench_search_index, None),
+]
+
+
+def http_requests():
+    return instrumentation.snapshot()["counters"].get("http.requests", 0)
+
+
+def time_benchmark(function, args, repeat):
+    best = None
+    for _ in range(repeat):
+        output = io.StringIO()
+        requests_before = http_requests()
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(output):
+            function(args)
+        elapsed = time.perf_counter() - started
+        if http_requests() != requests_before:
+            raise RuntimeError("%s went to the network; is a response missing from the seeded cache?"
+                               % function.__name__)
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def git(*argv):
+    try:
+        result = subprocess.run(["git", *argv], cwd=ROOT, capture_output=True, text=True)
+    except OSError:
+        return ""
+    return result.stdout.strip()
+
+
+def result_name():
+    commit = git("rev-parse", "--short", "HEAD") or "unknown"
+    # Benchmark output and results never make the tree dirty on their own
+    dirty = git("status", "--porcelain", "--untracked-files=no")
+    return commit + ("-dirty" if dirty else "")
+
+
+def find_result(ref):
+    if os.path.exists(ref):
+        return ref
+    matches = sorted(glob.glob(os.path.join(RESULTS_DIR, ref + "*.json")))
+    if not matches:
+        sys.exit("No saved result matches %s in %s" % (ref, RESULTS_DIR))
+    return matches[0]
+
+
+def compare(baseline_path, results):
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    print("\nCompared with %s:" % os.path.relpath(baseline_path))
+    print("%-16s %6s %10s %10s %8s" % ("benchmark", "scale", "before", "after", "ratio"))
+    for name, by_scale in results.items():
+        for scale, entry in by_scale.items():
+            before = baseline.get(name, {}).get(scale)
+            if before:
+                print("%-16s %5sx %9.3fs %9.3fs %7.2fx" % (
+                    name, scale, before["seconds"], entry["seconds"], entry["seconds"] / before["seconds"]))
+
+
+def main():
+    args = parse_args()
+    selected = [bench for bench in BENCHMARKS if not args.only or bench[0] in args.only]
+    print("Pipeline benchmarks on %s, Python %s, %d CPU(s)" % (
+        platform.platform(terse=True), platform.python_version(), os.cpu_count() or 1))
+    print("%-16s %6s %10s %12s" % ("benchmark", "scale", "seconds", "records/s"))
+
+    results = {name: {} for name, _, _ in selected}
+    cwd = os.getcwd()
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory(prefix="bench-pipeline-") as directory:
+            sizes = build_fixture(directory, scale)
+            repeat = max(1, args.repeat // scale)
+            os.chdir(directory)
+            try:
+                # Index-only rebuild needs an inventory.json to start from
+                with contextlib.redirect_stdout(io.StringIO()):
+                    bench_inventory(args)
+                for name, function, unit in selected:
+                    seconds = time_benchmark(function, args, repeat)
+                    records = sizes[unit] if unit else sizes["weapons"] + sizes["artifacts"] + sizes["characters"]
+                    results[name][str(scale)] = {"seconds": round(seconds, 4), "records": records,
+                                                 "repeat": repeat}
+                    print("%-16s %5dx %9.3fs %12.0f" % (name, scale, seconds, records / seconds), flush=True)
+            finally:
+                os.chdir(cwd)
+
+    if not args.no_save:
+        path = os.path.join(RESULTS_DIR, result_name() + ".json")
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "commit": result_name(),
+                "date": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(terse=True),
+                "cpus": os.cpu_count(),
+                "jobs": args.jobs,
+                "results": results,
+            }, f, indent=2)
+        print("\nSaved %s" % os.path.relpath(path))
+
+    if args.compare:
+        compare(find_result(args.compare), results)
+
+
+if __name__ == "__main__":
+    main()
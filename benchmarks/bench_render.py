@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark parallel page rendering across job counts.
+
+Renders the weapon and artifact pages, optionally repeated --scale times to
+stand in for a larger catalogue, into a temporary directory with 1, 2, 4, ...
+jobs up to the CPU count. Prints throughput and speedup per job count and
+checks that every run produced byte-identical files.
+
+    python benchmarks/bench_render.py --scale 10
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from generate_artifact_pages import create_artifact_page, sanitize_filename  # noqa: E402
+from generate_weapon_pages import generate_weapon_page, load_weapon_detail  # noqa: E402
+from parallel_render import render_pages  # noqa: E402
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark parallel page rendering")
+    parser.add_argument('--scale', type=int, default=1,
+                        help="render every page this many times (default: 1)")
+    parser.add_argument('--jobs', type=int, nargs='+',
+                        help="job counts to try (default: 1, 2, 4, ... up to the CPU count)")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="runs per job count; the fastest is reported (default: 3)")
+    return parser.parse_args()
+
+
+def default_jobs():
+    cpus = os.cpu_count() or 1
+    jobs = [1]
+    while jobs[-1] * 2 <= cpus:
+        jobs.append(jobs[-1] * 2)
+    if jobs[-1] != cpus:
+        jobs.append(cpus)
+    return jobs
+
+
+def load_tasks(out_dir, scale):
+    with open(os.path.join(ROOT, 'weapons.json'), 'r', encoding='utf-8') as f:
+        weapons = json.load(f)
+    with open(os.path.join(ROOT, 'artifacts.json'), 'r', encoding='utf-8') as f:
+        artifacts = json.load(f)
+
+    weapon_pages = []
+    artifact_pages = []
+    details = [load_weapon_detail(weapon) for weapon in weapons]
+    for copy in range(scale):
+        for weapon, detail in zip(weapons, details):
+            path = os.path.join(out_dir, f"w{copy}-{weapon.get('id')}.html")
+            weapon_pages.append((path, (weapon, detail)))
+        for artifact in artifacts:
+            path = os.path.join(out_dir, f"a{copy}-{sanitize_filename(artifact.get('name', 'Unknown'))}.html")
+            artifact_pages.append((path, (artifact, None)))
+    return [(generate_weapon_page, weapon_pages), (create_artifact_page, artifact_pages)]
+
+
+def digest(out_dir):
+    h = hashlib.sha256()
+    for name in sorted(os.listdir(out_dir)):
+        with open(os.path.join(out_dir, name), 'rb') as f:
+            h.update(name.encode('utf-8') + b'\0' + f.read())
+    return h.hexdigest()
+
+
+def run(tasks, jobs):
+    started = time.perf_counter()
+    pages = 0
+    for render, pending in tasks:
+        for _, html, error in render_pages(pending, render, jobs):
+            if html is None:
+                raise RuntimeError(error)
+            pages += 1
+    return time.perf_counter() - started, pages
+
+
+def main():
+    args = parse_args()
+    # Detail files and image manifests are read relative to the site root
+    os.chdir(ROOT)
+    job_counts = args.jobs or default_jobs()
+
+    print(f"Rendering at {args.scale}x scale on {os.cpu_count()} CPU(s)")
+    print(f"{'jobs':>5} {'seconds':>9} {'pages/s':>9} {'speedup':>8}")
+
+    baseline = None
+    reference = None
+    for jobs in job_counts:
+        with tempfile.TemporaryDirectory() as out_dir:
+            tasks = load_tasks(out_dir, args.scale)
+            best = None
+            for _ in range(args.repeat):
+                elapsed, pages = run(tasks, jobs)
+                best = elapsed if best is None else min(best, elapsed)
+            result = digest(out_dir)
+
+        if reference is None:
+            reference = result
+        elif result != reference:
+            print(f"✗ output with {jobs} jobs differs from {job_counts[0]} job(s)")
+            sys.exit(1)
+        baseline = baseline or best
+        print(f"{jobs:>5} {best:>9.2f} {pages / best:>9.0f} {baseline / best:>7.2f}x")
+
+    print("✓ Output byte-identical across job counts")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+"""
+Build orchestrator for the site's data and page pipeline.
+
+Every script is a step with declared inputs, outputs and the steps it must
+run after. Steps form a DAG; independent branches (weapons, artifacts,
+banners, inventory, ...) run in parallel, each step as its own process.
+
+A step is skipped when none of its dependencies ran in this build, its
+inputs (files, or every file under a directory, plus the script itself)
+hash the same as on its last successful run, and its outputs still exist.
+Steps that fetch from the network only re-run when their outputs are
+missing, their inputs changed, or --refresh is given.
+
+    python build.py                  # everything, skipping what is current
+    python build.py weapons banners  # only these groups (and what they need)
+    python build.py --refresh        # re-fetch API data too
+    python build.py --list           # show the DAG
+
+Step output goes to .cache/build/logs/<step>.log; failures print its tail.
+Each build writes build_report.json with per-step wall and CPU time, bytes
+and files written, and HTTP metrics (see instrumentation.py, which also
+diffs two reports).
+"""
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import instrumentation
+from build_manifest import BUILD_DIR
+
+STATE_PATH = os.path.join(BUILD_DIR, "state.json")
+LOG_DIR = os.path.join(BUILD_DIR, "logs")
+METRICS_DIR = os.path.join(BUILD_DIR, "metrics")
+STATE_VERSION = 1
+RENDER_JOBS = str(max(1, (os.cpu_count() or 1) // 2))
+
+
+class Step:
+    def __init__(self, name, group, command, inputs=(), outputs=(), after=(), fetch=False, optional=False):
+        self.name = name
+        self.group = group
+        self.command = list(command)
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.after = list(after)
+        # Talks to a remote API: its inputs cannot capture upstream changes
+        self.fetch = fetch
+        # Only built when named on the command line; dependents run after it if it is
+        self.optional = optional
+
+    @property
+    def script(self):
+        return self.command[0]
+
+
+STEPS = [
+    Step("weapons-fetch", "weapons", ["download_weapons.py", "--async", "--incremental"],
+         outputs=["weapons.json", "Data/weapons"], fetch=True),
+    Step("weapon-pages", "weapons", ["generate_weapon_pages.py", "--incremental", "--jobs", RENDER_JOBS],
+         inputs=["weapons.json", "Data/weapons", "templates", "page_templates.py", "catalogue.py", "images/variants.json"],
+         outputs=["weapons", "weapon.html"], after=["weapons-fetch", "images-optimize"]),
+
+    Step("artifacts-fetch", "artifacts", ["download_artifacts.py"],
+         outputs=["artifacts.json", "Data/artifacts"], fetch=True),
+    Step("artifact-pages", "artifacts", ["generate_artifact_pages.py", "--incremental", "--jobs", RENDER_JOBS],
+         inputs=["artifacts.json", "templates", "page_templates.py", "catalogue.py", "images/variants.json"],
+         outputs=["artifacts"], after=["artifacts-fetch", "images-optimize"]),
+
+    Step("search-index", "search", ["build_search_index.py"],
+         inputs=["characters.json", "weapons.json", "artifacts.json", "catalogue.py"],
+         outputs=["search-index.json"], after=["weapons-fetch", "artifacts-fetch"]),
+
+    Step("banners", "banners", ["banner_pipeline.py"],
+         inputs=["character_map.json", "characters.json", "catalogue.py"],
+         outputs=["banners-data/banners_raw.json", "banners-data/banners_processed.json",
+                  "banners-data/character_appearances.json", "banners-data/summary.json",
+                  "banners-data.json"], fetch=True),
+
+    Step("inventory", "inventory", ["generate_inventory.py"],
+         inputs=["materials.json", "catalogue.py"], outputs=["inventory.json", "inventory-index"]),
+
+    Step("character-diffs", "characters", ["split_character_diffs.py"],
+         inputs=["version_diffs.json", "character_changes.json", "catalogue.py"], outputs=["character-diffs"]),
+
+    # Fails the build on broken cross-references between the data files and generated pages
+    Step("validate", "validate", ["validate.py"],
+         inputs=["characters.json", "weapons.json", "artifacts.json", "materials.json", "inventory.json",
+                 "character_map.json", "banners-data.json", "Data/weapons", "Data/data", "weapons", "artifacts",
+                 "character-diffs", "inventory-index", "catalogue.py", "catalogue_db.py", "jsonio.py",
+                 "build_search_index.py", "script.js", "search-normalize-vectors.json", "version_diffs.json",
+                 "character_changes.json"],
+         after=["weapon-pages", "artifact-pages", "banners", "inventory", "character-diffs"]),
+
+    # Icon mirroring needs every data file and Pillow, so it is opt-in: python build.py images
+    Step("images-download", "images", ["download_images.py"],
+         inputs=["characters.json", "weapons.json", "artifacts.json", "inventory.json"],
+         outputs=["images/manifest.json"], fetch=True, optional=True,
+         after=["weapons-fetch", "artifacts-fetch", "inventory"]),
+    Step("images-optimize", "images", ["optimize_images.py"],
+         inputs=["images/manifest.json"], outputs=["images/variants.json", "images/grid-variants.json"], optional=True,
+         after=["images-download"]),
+
+    Step("catalogue-db", "catalogue", ["catalogue_db.py", "import"],
+         inputs=["characters.json", "weapons.json", "Data/weapons", "artifacts.json", "materials.json",
+                 "character_map.json", "banners-data.json", "character_changes.json", "version_diffs.json",
+                 "catalogue.py"],
+         outputs=["catalogue.db"], optional=True, after=["weapons-fetch", "artifacts-fetch", "banners"]),
+]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the site build pipeline")
+    parser.add_argument("targets", nargs="*", help="steps or groups to build (default: all)")
+    parser.add_argument("--jobs", type=int, default=4, help="steps to run at once (default: %(default)s)")
+    parser.add_argument("--refresh", action="store_true", help="re-run network fetch steps")
+    parser.add_argument("--force", action="store_true", help="run every selected step")
+    parser.add_argument("--dry-run", action="store_true", help="show what would run")
+    parser.add_argument("--list", action="store_true", help="print the steps and exit")
+    parser.add_argument("--report", default=instrumentation.REPORT_PATH,
+                        help="where to write the build report (default: %(default)s)")
+    return parser.parse_args()
+
+
+def path_hash(path):
+    """Hash of a file, or of every file (name and content) under a directory"""
+    h = hashlib.sha256()
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                full = os.path.join(root, name)
+                h.update(os.path.relpath(full, path).encode("utf-8") + b"\0")
+                with open(full, "rb") as f:
+                    h.update(hashlib.sha256(f.read()).digest())
+    elif os.path.exists(path):
+        with open(path, "rb") as f:
+            h.update(f.read())
+    else:
+        return None
+    return h.hexdigest()
+
+
+def input_fingerprint(step):
+    # Files the step rewrites in place are outputs, not inputs
+    paths = sorted(set(step.inputs + [step.script]) - set(step.outputs))
+    return {path: path_hash(path) for path in paths}
+
+
+def select_steps(targets):
+    by_name = {step.name: step for step in STEPS}
+    if not targets:
+        return [step for step in STEPS if not step.optional]
+    wanted = set()
+    for target in targets:
+        matches = [s.name for s in STEPS if target in (s.name, s.group)]
+        if not matches:
+            sys.exit("Unknown step or group: %s (see --list)" % target)
+        wanted.update(matches)
+
+    # Pull in everything the selected steps depend on
+    stack = list(wanted)
+    while stack:
+        for dep in by_name[stack.pop()].after:
+            if dep not in wanted and not by_name[dep].optional:
+                wanted.add(dep)
+                stack.append(dep)
+    return [step for step in STEPS if step.name in wanted]
+
+
+def load_state():
+    try:
+        with open(STATE_PATH, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("version") == STATE_VERSION:
+            return state
+    except (OSError, ValueError):
+        pass
+    return {"version": STATE_VERSION, "steps": {}}
+
+
+def save_state(state):
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    tmp = STATE_PATH + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, ensure_ascii=False, sort_keys=True)
+    os.replace(tmp, STATE_PATH)
+
+
+class Builder:
+    def __init__(self, steps, args):
+        self.steps = {step.name: step for step in steps}
+        self.args = args
+        self.state = load_state()
+        self.lock = threading.Lock()
+        self.results = {}   # name -> (status, started, finished)
+        self.details = {}   # name -> reason, CPU time and the step's own metrics snapshot
+        self.ran = set()
+        self.origin = time.perf_counter()
+        self.started_at = datetime.datetime.now(datetime.timezone.utc)
+
+    def reason_to_run(self, step, fingerprint):
+        """Why `step` must run, or None when it is up to date"""
+        if self.args.force:
+            return "forced"
+        if step.fetch and self.args.refresh:
+            return "refresh"
+        ran_deps = [dep for dep in step.after if dep in self.ran]
+        if ran_deps:
+            return "after " + ", ".join(ran_deps)
+        previous = self.state["steps"].get(step.name)
+        if previous:
+            if previous.get("command") != step.command:
+                return "command changed"
+            changed = [path for path, h in fingerprint.items() if previous.get("inputs", {}).get(path) != h]
+            if changed:
+                return "changed: " + ", ".join(changed[:3]) + (" ..." if len(changed) > 3 else "")
+        elif not step.fetch:
+            # Data already fetched (e.g. committed) is trusted until --refresh
+            return "never built"
+        missing = [path for path in step.outputs if not os.path.exists(path)]
+        if missing:
+            return "missing: " + ", ".join(missing[:3])
+        return None
+
+    def execute(self, step):
+        """Run the step's script; returns (exit code, log path, CPU seconds, peak RSS in KB, metrics)"""
+        os.makedirs(LOG_DIR, exist_ok=True)
+        log_path = os.path.join(LOG_DIR, step.name + ".log")
+        metrics_path = os.path.join(METRICS_DIR, step.name + ".json")
+        if os.path.exists(metrics_path):
+            os.remove(metrics_path)
+        env = dict(os.environ, SKIRK_METRICS_FILE=metrics_path)
+
+        cpu = max_rss = None
+        with open(log_path, "wb") as log:
+            proc = subprocess.Popen([sys.executable] + step.command, stdout=log, stderr=subprocess.STDOUT, env=env)
+            if hasattr(os, "wait4"):
+                # Reap the child ourselves to get its resource usage
+                _, status, usage = os.wait4(proc.pid, 0)
+                proc.returncode = os.waitstatus_to_exitcode(status)
+                cpu = usage.ru_utime + usage.ru_stime
+                max_rss = usage.ru_maxrss
+            else:
+                proc.wait()
+
+        try:
+            with open(metrics_path, "r", encoding="utf-8") as f:
+                metrics = json.load(f)
+        except (OSError, ValueError):
+            metrics = {}
+        if cpu is None:
+            cpu = metrics.get("cpu_seconds")
+        return proc.returncode, log_path, cpu, max_rss, metrics
+
+    def run_step(self, step):
+        started = time.perf_counter() - self.origin
+        # Hashing happens outside the lock so parallel branches do not queue behind each other
+        fingerprint = input_fingerprint(step)
+        with self.lock:
+            reason = self.reason_to_run(step, fingerprint)
+        if reason is None:
+            return step.name, "skipped", started, started, ""
+        if self.args.dry_run:
+            with self.lock:
+                self.ran.add(step.name)
+            return step.name, "would run", started, started, reason
+
+        # Called from worker threads: one write per line so concurrent steps never interleave
+        sys.stdout.write("▶ %-20s %s\n" % (step.name, reason))
+        sys.stdout.flush()
+        returncode, log_path, cpu, max_rss, metrics = self.execute(step)
+        finished = time.perf_counter() - self.origin
+        with self.lock:
+            self.details[step.name] = {"reason": reason, "cpu": cpu, "max_rss": max_rss, "metrics": metrics}
+        if returncode != 0:
+            with open(log_path, "r", encoding="utf-8", errors="replace") as f:
+                tail = "".join(f.readlines()[-15:])
+            return step.name, "failed", started, finished, "exit %d, see %s\n%s" % (returncode, log_path, tail)
+
+        # Inputs hashed after the run so in-place rewrites by this step are not seen as changes
+        fingerprint = input_fingerprint(step)
+        with self.lock:
+            self.ran.add(step.name)
+            self.state["steps"][step.name] = {
+                "command": step.command,
+                "inputs": fingerprint,
+                "seconds": round(finished - started, 3),
+            }
+            save_state(self.state)
+        return step.name, "ran", started, finished, reason
+
+    def run(self):
+        pending = dict(self.steps)
+        done = set()
+        blocked = set()
+        futures = {}
+        with ThreadPoolExecutor(max_workers=max(1, self.args.jobs)) as pool:
+            while pending or futures:
+                for name, step in list(pending.items()):
+                    deps = [d for d in step.after if d in self.steps]
+                    if any(d in blocked for d in deps):
+                        del pending[name]
+                        blocked.add(name)
+                        self.results[name] = ("blocked", 0.0, 0.0)
+                        print("✗ %-20s blocked by a failed dependency" % name)
+                    elif all(d in done for d in deps):
+                        del pending[name]
+                        futures[pool.submit(self.run_step, step)] = name
+                if not futures:
+                    break
+                finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    del futures[future]
+                    name, status, started, ended, detail = future.result()
+                    self.results[name] = (status, started, ended)
+                    if status == "failed":
+                        blocked.add(name)
+                        print("✗ %-20s %s" % (name, detail))
+                    else:
+                        done.add(name)
+                        if status == "ran":
+                            print("✓ %-20s %.1fs" % (name, ended - started), flush=True)
+                        elif status == "would run":
+                            print("· %-20s would run (%s)" % (name, detail))
+        return not blocked
+
+    def critical_path(self):
+        """Chain of steps that determined the build's end time"""
+        if not self.results:
+            return []
+        name = max(self.results, key=lambda n: self.results[n][2])
+        path = [name]
+        while True:
+            deps = [d for d in self.steps[name].after if d in self.results]
+            if not deps:
+                break
+            name = max(deps, key=lambda d: self.results[d][2])
+            path.append(name)
+        return list(reversed(path))
+
+    def summary(self):
+        wall = time.perf_counter() - self.origin
+        print("\n%-22s %-10s %8s %8s" % ("step", "status", "start", "time"))
+        for name in self.steps:
+            status, started, ended = self.results.get(name, ("not run", 0.0, 0.0))
+            print("%-22s %-10s %7.1fs %7.1fs" % (name, status, started, ended - started))
+        if self.args.dry_run:
+            return
+        if all(status == "skipped" for status, _, _ in self.results.values()):
+            print("\nEverything is up to date (%.1fs)" % wall)
+            return
+        path = self.critical_path()
+        busy = sum(self.results[n][2] - self.results[n][1] for n in path)
+        total = sum(ended - started for _, started, ended in self.results.values())
+        print("\nCritical path: %s" % " → ".join(path))
+        print("  %.1fs on the critical path, %.1fs of step time, %.1fs wall (%.1fx parallelism)"
+              % (busy, total, wall, total / wall if wall else 1.0))
+
+    def report(self):
+        """Machine-readable record of this build for build_report.json"""
+        steps = {}
+        counters = {}
+        latencies = []
+        for name in self.steps:
+            status, started, ended = self.results.get(name, ("not run", 0.0, 0.0))
+            detail = self.details.get(name, {})
+            metrics = detail.get("metrics") or {}
+            entry = {
+                "status": status,
+                "reason": detail.get("reason"),
+                "start_seconds": round(started, 3),
+                "wall_seconds": round(ended - started, 3),
+                "cpu_seconds": round(detail["cpu"], 3) if detail.get("cpu") is not None else None,
+                "max_rss_kb": detail.get("max_rss"),
+            }
+            if metrics:
+                entry.update(instrumentation.step_metrics(metrics))
+                for key, n in metrics.get("counters", {}).items():
+                    counters[key] = counters.get(key, 0) + n
+                latencies.extend(metrics.get("samples", {}).get("http.latency_ms", []))
+            steps[name] = entry
+
+        statuses = [entry["status"] for entry in steps.values()]
+        return {
+            "version": instrumentation.REPORT_VERSION,
+            "commit": git_commit(),
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "targets": self.args.targets,
+            "jobs": self.args.jobs,
+            "critical_path": self.critical_path() if "ran" in statuses else [],
+            "totals": {
+                "wall_seconds": round(time.perf_counter() - self.origin, 3),
+                "cpu_seconds": round(sum(entry["cpu_seconds"] or 0 for entry in steps.values()), 3),
+                "steps": {status: statuses.count(status) for status in sorted(set(statuses))},
+                "files_written": counters.get("files.written", 0),
+                "bytes_written": counters.get("bytes.written", 0),
+                "http": instrumentation.http_summary(counters, latencies),
+            },
+            "steps": steps,
+        }
+
+    def write_report(self, path):
+        # Keep the last report around so `python instrumentation.py diff` has a baseline
+        if os.path.exists(path):
+            os.makedirs(os.path.dirname(instrumentation.PREVIOUS_REPORT_PATH), exist_ok=True)
+            shutil.copyfile(path, instrumentation.PREVIOUS_REPORT_PATH)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2, ensure_ascii=False)
+        os.replace(tmp, path)
+        print("Report written to %s" % path)
+
+
+def git_commit():
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True)
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def main():
+    args = parse_args()
+    if args.list:
+        for step in STEPS:
+            after = (" after " + ", ".join(step.after)) if step.after else ""
+            flags = "".join(flag for flag, on in ((" (fetch)", step.fetch), (" (optional)", step.optional)) if on)
+            print("%-22s [%s] %s%s%s" % (step.name, step.group, " ".join(step.command), flags, after))
+        return
+
+    builder = Builder(select_steps(args.targets), args)
+    ok = builder.run()
+    builder.summary()
+    if not args.dry_run:
+        builder.write_report(args.report)
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Input-hash manifest for incremental page generation.
+
+For every output page the manifest records a hash of everything that went
+into it (data record, template version, API slice). On the next run a page
+whose inputs hash the same, and whose file still exists, is skipped instead
+of being re-rendered and rewritten, so unchanged pages keep their mtime and
+stay out of git diffs and redeploys.
+"""
+import hashlib
+import json
+import os
+
+BUILD_DIR = os.path.join(".cache", "build")
+
+
+def hash_inputs(*parts):
+    """Stable hash of JSON-serialisable inputs"""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(json.dumps(part, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class BuildManifest:
+    """Maps output path -> input hash from the previous build"""
+
+    def __init__(self, name):
+        self.path = os.path.join(BUILD_DIR, name + ".json")
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.pages = json.load(f)
+        except (OSError, ValueError):
+            self.pages = {}
+        self.seen = set()
+
+    def is_current(self, output_path, input_hash):
+        self.seen.add(str(output_path))
+        return self.pages.get(str(output_path)) == input_hash and os.path.exists(output_path)
+
+    def update(self, output_path, input_hash):
+        self.seen.add(str(output_path))
+        self.pages[str(output_path)] = input_hash
+
+    def save(self):
+        # Forget pages that were not generated this run
+        self.pages = {path: h for path, h in self.pages.items() if path in self.seen}
+        os.makedirs(BUILD_DIR, exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.pages, f, indent=2, ensure_ascii=False, sort_keys=True)
+        os.replace(tmp, self.path)
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Build search-index.json for the global search modal in script.js.
+
+Instead of downloading characters.json, weapons.json and artifacts.json and
+scanning every record per keystroke, the modal loads this one minified file:
+
+    types   [[tag, link pattern, image pattern, default description], ...]
+    records [[type, name, description, link arg, image arg], ...]
+    keys    normalized searchable text per record (name plus title/type)
+    prefix  1-2 character word prefix -> record ids
+
+'%s' in a pattern is filled with the record's argument; an empty link
+argument means the name, an empty description the type's default, and an
+image argument that is already a full URL is used as-is. Posting lists are
+delta-encoded (each id is stored as the gap from the previous one).
+
+Queries are normalized the same way as the keys and match at the start of a
+word: the query's first word prefix gives the candidates, and longer queries
+are then checked against just those keys. normalize() here and
+normalizeSearchText() in script.js must agree; validate.py checks both
+against search-normalize-vectors.json. The size report warns if the index
+is not smaller than the three source files; a trigram table for mid-word
+matches would make it larger, which is why there is none.
+"""
+import argparse
+import gzip
+import json
+import os
+import re
+import unicodedata
+
+import instrumentation
+from catalogue import get_catalogue
+from generate_artifact_pages import icon_url_for as artifact_icon_url, sanitize_filename
+from generate_weapon_pages import icon_url_for as weapon_icon_url, page_path
+
+OUTPUT_PATH = "search-index.json"
+SOURCES = ("characters.json", "weapons.json", "artifacts.json")
+INDEX_VERSION = 2
+
+# Type tag, link pattern, image pattern, default description
+TYPES = [
+    ("character", "characters.html?search=%s", "https://gi.yatta.moe/assets/UI/%s.png", "Character"),
+    ("weapon", "weapons/%s.html", "https://gi.yatta.moe/assets/UI/%s.png", "Weapon"),
+    ("artifact", "artifacts/%s.html", "https://gi.yatta.moe/assets/UI/reliquary/%s.png", "Artifact Set"),
+]
+CHARACTER, WEAPON, ARTIFACT = range(3)
+
+APOSTROPHE_RE = re.compile(r"['’]")
+
+
+def normalize(text):
+    """
+    Step for step what normalizeSearchText() in script.js does: NFKD, drop
+    marks (category M), lowercase, drop apostrophes, then collapse every run
+    of characters that are not letters or digits (categories L and N) to one
+    space.
+    """
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(c for c in text if unicodedata.category(c)[0] != "M").lower()
+    text = APOSTROPHE_RE.sub("", text)
+    return " ".join("".join(c if unicodedata.category(c)[0] in "LN" else " " for c in text).split())
+
+
+def word_prefixes(text):
+    return {word[:n] for word in text.split() for n in (1, 2) if len(word) >= n}
+
+
+def load_records(name):
+    try:
+        return get_catalogue().dataset(name).records
+    except (OSError, ValueError):
+        print(f"⚠ Could not read {name}.json, skipping")
+        return []
+
+
+def pattern_arg(value, pattern):
+    """Argument that fills `pattern` to give `value`; the value itself if it does not fit"""
+    head, _, tail = pattern.partition("%s")
+    if value.startswith(head) and value.endswith(tail) and len(value) >= len(head) + len(tail):
+        return value[len(head):len(value) - len(tail)]
+    return value
+
+
+def make_record(kind, name, description, link, image, searchable):
+    image_pattern, default_description = TYPES[kind][2:]
+    return (
+        kind,
+        name,
+        "" if description == default_description else description,
+        "" if link == name else link,
+        pattern_arg(image, image_pattern) if image else "",
+        searchable,
+    )
+
+
+def collect_records():
+    """(type, name, description, link arg, image arg, searchable text) per entry, in display order"""
+    records = []
+    for char in load_records("characters"):
+        name = char.get("name")
+        if name:
+            title = char.get("title") or ""
+            records.append(make_record(CHARACTER, name, title or "Character", name,
+                                       char.get("image") or "", f"{name} {title}"))
+
+    for weapon in load_records("weapons"):
+        name = weapon.get("name")
+        if name:
+            kind = weapon.get("type") or ""
+            records.append(make_record(WEAPON, name, kind or "Weapon", page_path(weapon).stem,
+                                       weapon_icon_url(weapon), f"{name} {kind}"))
+
+    for artifact in load_records("artifacts"):
+        name = artifact.get("name")
+        if name:
+            # Drop the ?vh= cache buster so the image pattern fits
+            records.append(make_record(ARTIFACT, name, "Artifact Set", sanitize_filename(name),
+                                       artifact_icon_url(artifact).split("?", 1)[0], name))
+    return records
+
+
+def delta_encode(ids):
+    out = []
+    previous = 0
+    for rid in ids:
+        out.append(rid - previous)
+        previous = rid
+    return out
+
+
+def build_index(records):
+    keys = []
+    prefix = {}
+    for rid, record in enumerate(records):
+        key = normalize(record[5])
+        keys.append(key)
+        for p in word_prefixes(key):
+            prefix.setdefault(p, []).append(rid)
+
+    return {
+        "v": INDEX_VERSION,
+        "types": [list(t) for t in TYPES],
+        "records": [list(record[:5]) for record in records],
+        "keys": keys,
+        "prefix": {p: delta_encode(ids) for p, ids in sorted(prefix.items())},
+    }
+
+
+def write_index(index, path):
+    data = json.dumps(index, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    instrumentation.record_write(path, len(data))
+    return data
+
+
+def report(data, path):
+    source_bytes = 0
+    source_gz = 0
+    for source in SOURCES:
+        try:
+            with open(source, "rb") as f:
+                raw = f.read()
+        except OSError:
+            continue
+        source_bytes += len(raw)
+        source_gz += len(gzip.compress(raw))
+        print(f"  {source:<22} {len(raw) / 1024:8.1f} KB")
+
+    index_gz = len(gzip.compress(data))
+    print(f"  {'sources total':<22} {source_bytes / 1024:8.1f} KB  ({source_gz / 1024:.1f} KB gzipped)")
+    print(f"  {path:<22} {len(data) / 1024:8.1f} KB  ({index_gz / 1024:.1f} KB gzipped)")
+    if source_bytes:
+        print(f"  index is {len(data) / source_bytes:.0%} of the sources "
+              f"({index_gz / max(source_gz, 1):.0%} gzipped)")
+        if index_gz >= source_gz:
+            print("⚠ The index is no smaller than the files it replaces")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the global search index")
+    parser.add_argument("--output", default=OUTPUT_PATH, help="index file to write (default: %(default)s)")
+    args = parser.parse_args()
+
+    records = collect_records()
+    index = build_index(records)
+    data = write_index(index, args.output)
+
+    print(f"✓ Indexed {len(records)} records, {len(index['prefix'])} prefixes")
+    report(data, args.output)
+
+
+if __name__ == "__main__":
+    main()
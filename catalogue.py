@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+Shared, indexed access to the site's catalogue files.
+
+    characters     characters.json     Character
+    weapons        weapons.json        Weapon
+    artifacts      artifacts.json      Artifact
+    materials      materials.json      Material (category resolved from the type table)
+    inventory      inventory.json      Material
+    character_map  character_map.json  CharacterMapEntry
+
+Each dataset is parsed on first use, once per process, into compact
+__slots__ records. Lookups by id (int or str), by name and by type are dict
+hits; the id index is built with the records, the name and type indexes on
+first use. A dataset whose file has changed on disk (mtime or size) is
+reloaded the next time it is fetched from the catalogue, so a script that
+rewrites inventory.json and then reads it back sees the new data.
+
+Parsing pretty-printed JSON dominates load time, so every file read is also
+saved as a marshal snapshot in .cache/catalogue/<file>.marshal and later
+loads read that instead. A snapshot is used when the source's mtime and size
+match its header, or, failing that, when the source's sha256 does (a touched
+but unchanged file); otherwise the source is parsed and the snapshot
+rewritten. SKIRK_CATALOGUE_SNAPSHOTS=0 turns snapshots off and
+SKIRK_CATALOGUE_SNAPSHOT_DIR moves them. Large files without records
+(version_diffs.json, character_changes.json, changelog_data.json) are
+available decoded through catalogue.document(name) on the same terms.
+
+Records keep the source dict in `raw` for writers that must reproduce it
+unchanged, and support record.get(key) / record[key] against it.
+
+    from catalogue import get_catalogue
+    weapons = get_catalogue().weapons
+    weapons.get(11101).name          # 'Dull Blade'
+    weapons.by_type("Sword")         # [Weapon(...), ...]
+"""
+import hashlib
+import json
+import marshal
+import os
+import struct
+import sys
+import threading
+
+import instrumentation
+
+SNAPSHOT_DIR = os.environ.get("SKIRK_CATALOGUE_SNAPSHOT_DIR", os.path.join(".cache", "catalogue"))
+SNAPSHOTS = os.environ.get("SKIRK_CATALOGUE_SNAPSHOTS", "1") != "0"
+SNAPSHOT_VERSION = 1
+# marshal's format is only guaranteed within one Python version
+SNAPSHOT_TAG = "%d.%d" % sys.version_info[:2]
+
+
+def _slots(fields):
+    return tuple(attr for attr, _, _ in fields)
+
+
+class Record:
+    """Named fields read from a source dict, which is kept in `raw`"""
+    __slots__ = ("raw",)
+    FIELDS = ()        # (attribute, source key, default)
+    TYPE_FIELD = None  # attribute behind Dataset.by_type()
+
+    def __init__(self, raw):
+        self.raw = raw
+        for attr, key, default in self.FIELDS:
+            setattr(self, attr, raw.get(key, default))
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "__init__" in cls.__dict__ or not cls.FIELDS:
+            return
+        # Straight-line assignments, as namedtuple does: twice as fast as the loop above
+        # when a load builds tens of thousands of records
+        source = "def __init__(self, raw):\n    self.raw = raw\n    get = raw.get\n"
+        source += "".join("    self.%s = get(%r, %r)\n" % field for field in cls.FIELDS)
+        namespace = {}
+        exec(source, namespace)
+        cls.__init__ = namespace["__init__"]
+
+    def get(self, key, default=None):
+        return self.raw.get(key, default)
+
+    def __getitem__(self, key):
+        return self.raw[key]
+
+    def __repr__(self):
+        return "%s(id=%r, name=%r)" % (type(self).__name__, self.id, self.name)
+
+
+class Character(Record):
+    FIELDS = (("id", "id", None), ("name", "name", None), ("title", "title", ""), ("vision", "vision", None),
+              ("weapon", "weapon", None), ("rarity", "rarity", None), ("region", "region", None),
+              ("version", "version", None), ("image", "image", ""), ("icon", "icon", ""),
+              ("release_date", "release_date", None))
+    __slots__ = _slots(FIELDS)
+    TYPE_FIELD = "vision"
+
+
+class Weapon(Record):
+    FIELDS = (("id", "id", None), ("name", "name", None), ("type", "type", None), ("rarity", "rarity", None),
+              ("icon", "icon", None), ("atk", "atk", None), ("secondary_stat", "secondaryStat", None),
+              ("secondary_label", "secondaryLabel", None), ("special_prop", "specialProp", None))
+    __slots__ = _slots(FIELDS)
+    TYPE_FIELD = "type"
+
+
+class Artifact(Record):
+    FIELDS = (("id", "id", None), ("name", "name", None), ("rarity", "rarity", None), ("icon", "icon", None),
+              ("route", "route", None), ("sort_order", "sortOrder", None), ("level_list", "levelList", ()),
+              ("set_bonus_2pc", "setBonus2pc", None), ("set_bonus_4pc", "setBonus4pc", None))
+    __slots__ = _slots(FIELDS)
+    TYPE_FIELD = "rarity"
+
+
+class Material(Record):
+    FIELDS = (("id", "id", None), ("name", "name", None), ("type", "type", None), ("category", "category", None),
+              ("icon", "icon", None), ("rank", "rank", 1), ("map_mark", "mapMark", False), ("route", "route", ""))
+    __slots__ = _slots(FIELDS)
+    TYPE_FIELD = "type"
+
+
+class CharacterMapEntry(Record):
+    FIELDS = (("name", "name", None), ("route", "route", None), ("file", "file", None))
+    __slots__ = _slots(FIELDS) + ("id",)
+
+    def __init__(self, char_id, raw):
+        super().__init__(raw)
+        self.id = int(char_id)
+
+
+def _parse_list(record_type):
+    return lambda data: [record_type(entry) for entry in data]
+
+
+def _parse_materials(data):
+    types = data["data"]["types"]
+    records = []
+    for raw in data["data"]["items"].values():
+        record = Material(raw)
+        record.category = types.get(record.type, record.type)
+        records.append(record)
+    return records
+
+
+def _parse_character_map(data):
+    return [CharacterMapEntry(char_id, entry) for char_id, entry in data.items()]
+
+
+DATASETS = {
+    "characters": ("characters.json", _parse_list(Character)),
+    "weapons": ("weapons.json", _parse_list(Weapon)),
+    "artifacts": ("artifacts.json", _parse_list(Artifact)),
+    "materials": ("materials.json", _parse_materials),
+    "inventory": ("inventory.json", _parse_list(Material)),
+    "character_map": ("character_map.json", _parse_character_map),
+}
+
+# Large JSON files read whole, without records
+DOCUMENTS = {
+    "version_diffs": "version_diffs.json",
+    "character_changes": "character_changes.json",
+    "changelog_data": "changelog_data.json",
+}
+
+
+def _signature(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _write_snapshot(snapshot_path, header, document):
+    """<header length><marshalled header><marshalled document>, written atomically"""
+    try:
+        head = marshal.dumps(header)
+        data = struct.pack("<I", len(head)) + head + marshal.dumps(document)
+        os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
+        tmp = "%s.%d.tmp" % (snapshot_path, os.getpid())
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, snapshot_path)
+    except (OSError, ValueError):
+        # A read-only checkout still works, just without snapshots
+        pass
+
+
+def _read_snapshot(snapshot_path):
+    """(header, marshalled document) of a snapshot in the current format, or (None, None)"""
+    try:
+        with open(snapshot_path, "rb") as f:
+            data = f.read()
+        (length,) = struct.unpack_from("<I", data)
+        header = marshal.loads(data[4:4 + length])
+    except (OSError, EOFError, ValueError, TypeError, struct.error):
+        return None, None
+    if not isinstance(header, tuple) or len(header) != 5 or header[:2] != (SNAPSHOT_VERSION, SNAPSHOT_TAG):
+        return None, None
+    return header, memoryview(data)[4 + length:]
+
+
+def load_document(path, snapshot_path=None):
+    """
+    (decoded JSON of `path`, its (mtime_ns, size)), read from the snapshot at
+    `snapshot_path` when that is still valid and written back to it when not.
+    """
+    signature = _signature(path)
+    if not SNAPSHOTS or snapshot_path is None:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f), signature
+
+    header, payload = _read_snapshot(snapshot_path)
+    if header is not None and tuple(header[2:4]) == signature:
+        try:
+            document = marshal.loads(payload)
+        except (EOFError, ValueError, TypeError):
+            header = None
+        else:
+            instrumentation.count("catalogue.snapshot_hits")
+            return document, signature
+
+    with open(path, "rb") as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+    if header is not None and header[4] == digest:
+        # Touched (checkout, copy) but unchanged: keep the payload, update the header
+        try:
+            document = marshal.loads(payload)
+        except (EOFError, ValueError, TypeError):
+            pass
+        else:
+            instrumentation.count("catalogue.snapshot_hits")
+            _write_snapshot(snapshot_path, (SNAPSHOT_VERSION, SNAPSHOT_TAG) + signature + (digest,), document)
+            return document, signature
+
+    instrumentation.count("catalogue.snapshot_misses")
+    document = json.loads(data.decode("utf-8"))
+    _write_snapshot(snapshot_path, (SNAPSHOT_VERSION, SNAPSHOT_TAG) + signature + (digest,), document)
+    return document, signature
+
+
+class Document:
+    """One decoded JSON file, loaded on first use and again after it changes"""
+
+    def __init__(self, name, path, snapshot_path=None):
+        self.name = name
+        self.path = path
+        self.snapshot_path = snapshot_path
+        self.lock = threading.Lock()
+        self.signature = None
+        self._value = None
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def _decode(self, document):
+        return document
+
+    def _reset(self):
+        self._value = None
+
+    def refresh(self):
+        """Forget the loaded value if the file changed since it was read"""
+        if self._value is None:
+            return
+        try:
+            current = _signature(self.path)
+        except OSError:
+            current = None
+        if current != self.signature:
+            with self.lock:
+                self._reset()
+
+    def load(self):
+        with self.lock:
+            if self._value is None:
+                document, signature = load_document(self.path, self.snapshot_path)
+                self._value = self._decode(document)
+                self.signature = signature
+            return self._value
+
+    @property
+    def value(self):
+        return self._value if self._value is not None else self.load()
+
+
+class Dataset(Document):
+    """Records of one catalogue file with id, name and type indexes"""
+
+    def __init__(self, name, path, parse, snapshot_path=None):
+        super().__init__(name, path, snapshot_path)
+        self.parse = parse
+        self._by_id = None
+        self._by_name = None
+        self._by_type = None
+
+    def _decode(self, document):
+        records = self.parse(document)
+        by_id = {}
+        for record in records:
+            by_id.setdefault(str(record.id), record)
+        self._by_id = by_id
+        self._by_name = self._by_type = None
+        return records
+
+    def _reset(self):
+        self._value = self._by_id = self._by_name = self._by_type = None
+
+    @property
+    def records(self):
+        return self._value if self._value is not None else self.load()
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def dicts(self):
+        """The source dicts, in file order"""
+        return [record.raw for record in self.records]
+
+    def get(self, record_id, default=None):
+        """Record by id; ints and numeric strings are interchangeable"""
+        self.records
+        return self._by_id.get(str(record_id), default)
+
+    def __contains__(self, record_id):
+        return self.get(record_id) is not None
+
+    def by_name(self, name, default=None):
+        """Record by exact name, falling back to a case-insensitive match"""
+        index = self._by_name
+        if index is None:
+            index = {}
+            for record in self.records:
+                if record.name is not None:
+                    index.setdefault(record.name, record)
+                    index.setdefault(record.name.casefold(), record)
+            self._by_name = index
+        return index.get(name) or index.get(name.casefold(), default)
+
+    def by_type(self, value):
+        """Records whose type field (weapon type, character vision, ...) equals `value`"""
+        return self.types().get(value, [])
+
+    def types(self):
+        """{type value: [records]} in file order"""
+        index = self._by_type
+        if index is None:
+            index = {}
+            field = self.records[0].TYPE_FIELD if self.records else None
+            if field:
+                for record in self.records:
+                    index.setdefault(getattr(record, field), []).append(record)
+            self._by_type = index
+        return index
+
+
+class Catalogue:
+    """Lazily loaded datasets and documents of one site root"""
+
+    def __init__(self, root="."):
+        self.root = os.path.abspath(root)
+        self.lock = threading.Lock()
+        self.loaded = {}
+
+    def _open(self, name):
+        with self.lock:
+            entry = self.loaded.get(name)
+            if entry is None:
+                if name in DATASETS:
+                    filename, parse = DATASETS[name]
+                    entry = Dataset(name, os.path.join(self.root, filename), parse, self.snapshot_path(filename))
+                else:
+                    filename = DOCUMENTS[name]
+                    entry = Document(name, os.path.join(self.root, filename), self.snapshot_path(filename))
+                self.loaded[name] = entry
+        entry.refresh()
+        return entry
+
+    def snapshot_path(self, filename):
+        return os.path.join(self.root, SNAPSHOT_DIR, filename + ".marshal")
+
+    def dataset(self, name):
+        if name not in DATASETS:
+            raise KeyError(name)
+        return self._open(name)
+
+    def document(self, name):
+        """Decoded JSON of a file in DOCUMENTS; shared, so treat it as read-only"""
+        if name not in DOCUMENTS:
+            raise KeyError(name)
+        return self._open(name).value
+
+    characters = property(lambda self: self.dataset("characters"))
+    weapons = property(lambda self: self.dataset("weapons"))
+    artifacts = property(lambda self: self.dataset("artifacts"))
+    materials = property(lambda self: self.dataset("materials"))
+    inventory = property(lambda self: self.dataset("inventory"))
+    character_map = property(lambda self: self.dataset("character_map"))
+
+
+_catalogues = {}
+_catalogues_lock = threading.Lock()
+
+
+def get_catalogue(root="."):
+    """Process-wide catalogue for `root` (the site root, by default the working directory)"""
+    key = os.path.abspath(root)
+    with _catalogues_lock:
+        if key not in _catalogues:
+            _catalogues[key] = Catalogue(key)
+        return _catalogues[key]
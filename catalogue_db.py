@@ -0,0 +1,517 @@
+#!/usr/bin/env python3
+"""
+SQLite store for the catalogue, built from the JSON files and able to
+regenerate them.
+
+    python catalogue_db.py import                  # JSON files -> catalogue.db
+    python catalogue_db.py export --out dist       # catalogue.db -> JSON files
+    python catalogue_db.py roundtrip               # import + export must reproduce the JSON files
+    python catalogue_db.py search "hydro sword"    # full-text search over names and descriptions
+    python catalogue_db.py uses-material "Mist Veiled Lead Elixir"
+    python catalogue_db.py reruns 4.x              # characters whose 4.x banners were reruns
+    python catalogue_db.py changed-in 5.1          # characters whose kits changed in 5.1 patches
+    python catalogue_db.py sql "SELECT type, COUNT(*) FROM weapons GROUP BY type"
+
+Tables: characters, weapons, weapon_materials (ascension costs from
+Data/weapons/ detail files), artifacts, materials, character_map, banners
+(one row per featured character per version), character_changes with
+character_change_versions, and version_diffs. Columns hold the fields worth
+filtering on, indexed by id, type, rarity and version; every row also keeps
+its source entry as JSON, the `documents` table keeps each file's
+wrapper (materials.json's type table, banners-data.json's summary, ...) and
+`sources` each file's line ending, so `export` writes each file byte for
+byte as it was imported (with jsonio.write_json and the indent and
+ensure_ascii of the script that produces it). `roundtrip` checks exactly
+that against the files on disk, and validate.py runs it. A `search`
+FTS5 table covers names and descriptions of characters, weapons, artifacts
+and materials (where SQLite lacks FTS5, search falls back to LIKE on names).
+
+The JSON files stay the source of truth for the site; the database is
+optional and rebuilt whole by `import` (written beside the target and
+swapped in, so readers never see a half-built file). SKIRK_CATALOGUE_DB sets
+its path.
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+from catalogue import get_catalogue, load_document
+from download_weapons import weapon_detail_path
+from jsonio import line_ending, write_json
+
+DB_PATH = os.environ.get("SKIRK_CATALOGUE_DB", "catalogue.db")
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE characters (
+    id INTEGER PRIMARY KEY, position INTEGER NOT NULL, name TEXT, title TEXT, vision TEXT, weapon TEXT,
+    rarity INTEGER, region TEXT, version TEXT, release_date TEXT, raw TEXT NOT NULL
+);
+CREATE INDEX characters_name ON characters (name COLLATE NOCASE);
+CREATE INDEX characters_vision ON characters (vision);
+CREATE INDEX characters_weapon ON characters (weapon);
+CREATE INDEX characters_rarity ON characters (rarity);
+CREATE INDEX characters_version ON characters (version);
+
+CREATE TABLE weapons (
+    id INTEGER PRIMARY KEY, position INTEGER NOT NULL, name TEXT, type TEXT, rarity INTEGER,
+    secondary_label TEXT, description TEXT, raw TEXT NOT NULL
+);
+CREATE INDEX weapons_name ON weapons (name COLLATE NOCASE);
+CREATE INDEX weapons_type ON weapons (type);
+CREATE INDEX weapons_rarity ON weapons (rarity);
+
+CREATE TABLE weapon_materials (
+    weapon_id INTEGER NOT NULL, material_id INTEGER NOT NULL, quantity INTEGER,
+    PRIMARY KEY (weapon_id, material_id)
+);
+CREATE INDEX weapon_materials_material ON weapon_materials (material_id);
+
+CREATE TABLE artifacts (
+    id INTEGER PRIMARY KEY, position INTEGER NOT NULL, name TEXT, rarity INTEGER, sort_order INTEGER,
+    set_bonus_2pc TEXT, set_bonus_4pc TEXT, raw TEXT NOT NULL
+);
+CREATE INDEX artifacts_name ON artifacts (name COLLATE NOCASE);
+CREATE INDEX artifacts_rarity ON artifacts (rarity);
+
+CREATE TABLE materials (
+    id INTEGER PRIMARY KEY, position INTEGER NOT NULL, key TEXT NOT NULL, name TEXT, type TEXT,
+    category TEXT, rank INTEGER, raw TEXT NOT NULL
+);
+CREATE INDEX materials_name ON materials (name COLLATE NOCASE);
+CREATE INDEX materials_type ON materials (type);
+CREATE INDEX materials_rank ON materials (rank);
+
+CREATE TABLE character_map (
+    id INTEGER PRIMARY KEY, position INTEGER NOT NULL, key TEXT NOT NULL, name TEXT, raw TEXT NOT NULL
+);
+
+CREATE TABLE banners (
+    version TEXT NOT NULL, major INTEGER, minor INTEGER, version_position INTEGER NOT NULL,
+    slot INTEGER NOT NULL, character_id INTEGER, name TEXT, raw TEXT NOT NULL,
+    PRIMARY KEY (version, slot)
+);
+CREATE INDEX banners_character ON banners (character_id, major, minor);
+CREATE INDEX banners_version ON banners (major, minor);
+
+CREATE TABLE character_changes (
+    key TEXT PRIMARY KEY, position INTEGER NOT NULL, character_id INTEGER, name TEXT, raw TEXT NOT NULL
+);
+CREATE INDEX character_changes_character ON character_changes (character_id);
+
+CREATE TABLE character_change_versions (
+    key TEXT NOT NULL, patch_version TEXT NOT NULL, major INTEGER, minor INTEGER,
+    PRIMARY KEY (key, patch_version)
+);
+CREATE INDEX character_change_versions_version ON character_change_versions (major, minor);
+
+CREATE TABLE version_diffs (key TEXT PRIMARY KEY, position INTEGER NOT NULL, raw TEXT NOT NULL);
+
+CREATE TABLE documents (file TEXT PRIMARY KEY, skeleton TEXT NOT NULL);
+
+CREATE TABLE sources (file TEXT PRIMARY KEY, newline TEXT NOT NULL);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE search USING fts5(
+    kind UNINDEXED, ref UNINDEXED, name, description, tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+# file -> (export builder name, indent, ensure_ascii), matching the scripts that write them
+EXPORTS = {
+    "characters.json": ("characters", 2, False),
+    "weapons.json": ("weapons", 4, False),
+    "artifacts.json": ("artifacts", 4, False),
+    "materials.json": ("materials", 2, True),
+    "character_map.json": ("character_map", 2, False),
+    "banners-data.json": ("banners", 2, True),
+    "character_changes.json": ("character_changes", 2, False),
+    "version_diffs.json": ("version_diffs", 2, False),
+}
+
+
+def has_fts5():
+    try:
+        sqlite3.connect(":memory:").execute("CREATE VIRTUAL TABLE t USING fts5(x)")
+    except sqlite3.OperationalError:
+        return False
+    return True
+
+
+def parse_version(text):
+    """(major, minor) of "4.2", "4.2.51" or "4.x"; minor is None for "4" and "4.x" """
+    parts = str(text).split(".")
+    major = int(parts[0])
+    minor = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else None
+    return major, minor
+
+
+def dumps(obj):
+    return json.dumps(obj, ensure_ascii=False)
+
+
+class CatalogueDB:
+    """Connection to a catalogue database with the cross-entity queries"""
+
+    def __init__(self, path=DB_PATH, readonly=True):
+        if readonly and not os.path.exists(path):
+            raise FileNotFoundError("%s not found; run python catalogue_db.py import" % path)
+        uri = "file:%s?mode=ro" % os.path.abspath(path) if readonly else path
+        self.path = path
+        self.connection = sqlite3.connect(uri, uri=readonly)
+        self.connection.row_factory = sqlite3.Row
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if readonly and version != SCHEMA_VERSION:
+            self.connection.close()
+            raise ValueError("%s has schema version %d, expected %d; run python catalogue_db.py import"
+                             % (path, version, SCHEMA_VERSION))
+        self.fts = bool(self.connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search'").fetchone())
+
+    def close(self):
+        self.connection.close()
+
+    def query(self, sql, params=()):
+        return self.connection.execute(sql, params).fetchall()
+
+    def search(self, text, kinds=None, limit=20):
+        """(kind, ref, name, description) rows best match first; words match as prefixes"""
+        kinds = list(kinds or ("character", "weapon", "artifact", "material"))
+        placeholders = ", ".join("?" * len(kinds))
+        if self.fts:
+            match = " ".join('"%s"*' % word.replace('"', '""') for word in text.split())
+            if not match:
+                return []
+            return self.query("SELECT kind, ref, name, description FROM search WHERE search MATCH ? "
+                              "AND kind IN (%s) ORDER BY rank LIMIT ?" % placeholders, [match, *kinds, limit])
+        rows = []
+        for kind, table in (("character", "characters"), ("weapon", "weapons"),
+                            ("artifact", "artifacts"), ("material", "materials")):
+            if kind in kinds:
+                rows += self.query("SELECT ? AS kind, id AS ref, name, '' AS description FROM %s "
+                                   "WHERE name LIKE ? ORDER BY position LIMIT ?" % table,
+                                   (kind, "%" + text + "%", limit))
+        return rows[:limit]
+
+    def material_ids(self, material):
+        """Ids of a material given by id or (case-insensitive) name"""
+        if str(material).isdigit():
+            return [int(material)]
+        return [row["id"] for row in self.query("SELECT id FROM materials WHERE name = ? COLLATE NOCASE",
+                                                (material,))]
+
+    def weapons_using(self, material):
+        """Weapons whose ascension needs `material` (id or name), with the total quantity"""
+        ids = self.material_ids(material)
+        if not ids:
+            return []
+        return self.query("SELECT w.id, w.name, w.type, w.rarity, m.material_id, m.quantity "
+                          "FROM weapon_materials m JOIN weapons w ON w.id = m.weapon_id "
+                          "WHERE m.material_id IN (%s) ORDER BY w.rarity DESC, w.name"
+                          % ", ".join("?" * len(ids)), ids)
+
+    def reruns(self, version):
+        """Banner appearances in `version` ("4.x" or "4.2") by characters featured in an earlier version"""
+        major, minor = parse_version(version)
+        condition = "b.major = ?" + (" AND b.minor = ?" if minor is not None else "")
+        params = [major] + ([minor] if minor is not None else [])
+        return self.query(
+            "SELECT b.version, b.character_id, b.name, "
+            "  (SELECT e.version FROM banners e WHERE e.character_id = b.character_id "
+            "   AND (e.major < b.major OR (e.major = b.major AND e.minor < b.minor)) "
+            "   ORDER BY e.major DESC, e.minor DESC LIMIT 1) AS previous "
+            "FROM banners b WHERE %s AND previous IS NOT NULL "
+            "ORDER BY b.major, b.minor, b.slot" % condition, params)
+
+    def changed_in(self, version):
+        """Characters whose kits changed in patches of `version` ("5.x" or "5.1")"""
+        major, minor = parse_version(version)
+        condition = "v.major = ?" + (" AND v.minor = ?" if minor is not None else "")
+        params = [major] + ([minor] if minor is not None else [])
+        return self.query(
+            "SELECT c.key, COALESCE(m.name, c.name) AS name, GROUP_CONCAT(v.patch_version, ', ') AS patches "
+            "FROM character_change_versions v JOIN character_changes c ON c.key = v.key "
+            "LEFT JOIN character_map m ON m.id = c.character_id "
+            "WHERE %s GROUP BY c.key ORDER BY c.position" % condition, params)
+
+    # Exports: each returns the document of one JSON file
+
+    def _raws(self, sql):
+        return [json.loads(row[0]) for row in self.connection.execute(sql)]
+
+    def _skeleton(self, file):
+        row = self.connection.execute("SELECT skeleton FROM documents WHERE file = ?", (file,)).fetchone()
+        return json.loads(row[0])
+
+    def export_characters(self):
+        return self._raws("SELECT raw FROM characters ORDER BY position")
+
+    def export_weapons(self):
+        return self._raws("SELECT raw FROM weapons ORDER BY position")
+
+    def export_artifacts(self):
+        return self._raws("SELECT raw FROM artifacts ORDER BY position")
+
+    def export_materials(self):
+        document = self._skeleton("materials.json")
+        document["data"]["items"] = {key: json.loads(raw) for key, raw in self.connection.execute(
+            "SELECT key, raw FROM materials ORDER BY position")}
+        return document
+
+    def export_character_map(self):
+        return {key: json.loads(raw) for key, raw in self.connection.execute(
+            "SELECT key, raw FROM character_map ORDER BY position")}
+
+    def export_banners(self):
+        document = self._skeleton("banners-data.json")
+        banners = {}
+        for version, raw in self.connection.execute(
+                "SELECT version, raw FROM banners ORDER BY version_position, slot"):
+            banners.setdefault(version, []).append(json.loads(raw))
+        document["banners"] = banners
+        return document
+
+    def export_character_changes(self):
+        document = self._skeleton("character_changes.json")
+        document["characters"] = {key: json.loads(raw) for key, raw in self.connection.execute(
+            "SELECT key, raw FROM character_changes ORDER BY position")}
+        return document
+
+    def export_version_diffs(self):
+        return {key: json.loads(raw) for key, raw in self.connection.execute(
+            "SELECT key, raw FROM version_diffs ORDER BY position")}
+
+    def export(self, out_dir=".", files=None):
+        """Write the JSON files (all of EXPORTS by default) to `out_dir`; returns the paths written"""
+        written = []
+        for file in files or EXPORTS:
+            builder, indent, ensure_ascii = EXPORTS[file]
+            path = os.path.join(out_dir, file)
+            newline = self.connection.execute("SELECT newline FROM sources WHERE file = ?", (file,)).fetchone()[0]
+            write_json(path, getattr(self, "export_" + builder)(), indent=indent, ensure_ascii=ensure_ascii,
+                       newline=newline)
+            written.append(path)
+        return written
+
+
+def _load_root_document(root, filename):
+    return load_document(os.path.join(root, filename), get_catalogue(root).snapshot_path(filename))[0]
+
+
+def _insert(db, table, rows):
+    rows = list(rows)
+    if rows:
+        db.executemany("INSERT INTO %s VALUES (%s)" % (table, ", ".join("?" * len(rows[0]))), rows)
+    return len(rows)
+
+
+def import_catalogue(root=".", path=DB_PATH):
+    """Rebuild the database at `path` from the JSON files under `root`; returns row counts per table"""
+    catalogue = get_catalogue(root)
+    tmp = "%s.%d.tmp" % (path, os.getpid())
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    db = sqlite3.connect(tmp)
+    counts = {}
+    search = []
+    try:
+        db.executescript(SCHEMA)
+        fts = has_fts5()
+        if fts:
+            db.executescript(FTS_SCHEMA)
+
+        counts["characters"] = _insert(db, "characters", (
+            (c.id, i, c.name, c.title, c.vision, c.weapon, c.rarity, c.region, c.version, c.release_date,
+             dumps(c.raw)) for i, c in enumerate(catalogue.characters)))
+        search += [("character", c.id, c.name, " ".join(filter(None, (c.title, c.vision, c.weapon, c.region))))
+                   for c in catalogue.characters]
+
+        weapon_rows = []
+        material_rows = []
+        for i, weapon in enumerate(catalogue.weapons):
+            description = ""
+            detail_path = os.path.join(root, weapon_detail_path(weapon.name or ""))
+            if os.path.exists(detail_path):
+                with open(detail_path, "r", encoding="utf-8") as f:
+                    detail = json.load(f)
+                description = detail.get("description") or ""
+                for item_id, quantity in (detail.get("ascension") or {}).items():
+                    material_rows.append((int(weapon.id), int(item_id), quantity))
+            weapon_rows.append((int(weapon.id), i, weapon.name, weapon.type, weapon.rarity,
+                                weapon.secondary_label, description, dumps(weapon.raw)))
+            search.append(("weapon", int(weapon.id), weapon.name,
+                           " ".join(filter(None, (weapon.type, weapon.secondary_label, description)))))
+        counts["weapons"] = _insert(db, "weapons", weapon_rows)
+        counts["weapon_materials"] = _insert(db, "weapon_materials", material_rows)
+
+        counts["artifacts"] = _insert(db, "artifacts", (
+            (int(a.id), i, a.name, a.rarity, a.sort_order, a.set_bonus_2pc, a.set_bonus_4pc, dumps(a.raw))
+            for i, a in enumerate(catalogue.artifacts)))
+        search += [("artifact", int(a.id), a.name, " ".join(filter(None, (a.set_bonus_2pc, a.set_bonus_4pc))))
+                   for a in catalogue.artifacts]
+
+        materials = _load_root_document(root, "materials.json")
+        types = materials["data"]["types"]
+        counts["materials"] = _insert(db, "materials", (
+            (item["id"], i, key, item.get("name"), item.get("type"), types.get(item.get("type"), item.get("type")),
+             item.get("rank", 1), dumps(item)) for i, (key, item) in enumerate(materials["data"]["items"].items())))
+        search += [("material", m.id, m.name, m.category or "") for m in catalogue.materials]
+        skeleton = dict(materials, data=dict(materials["data"], items={}))
+        db.execute("INSERT INTO documents VALUES (?, ?)", ("materials.json", dumps(skeleton)))
+
+        counts["character_map"] = _insert(db, "character_map", (
+            (int(key), i, key, entry.get("name"), dumps(entry))
+            for i, (key, entry) in enumerate(_load_root_document(root, "character_map.json").items())))
+
+        banners = _load_root_document(root, "banners-data.json")
+        rows = []
+        for position, (version, entries) in enumerate(banners["banners"].items()):
+            major, minor = parse_version(version)
+            for slot, entry in enumerate(entries):
+                rows.append((version, major, minor, position, slot, entry.get("id"), entry.get("name"), dumps(entry)))
+        counts["banners"] = _insert(db, "banners", rows)
+        db.execute("INSERT INTO documents VALUES (?, ?)", ("banners-data.json", dumps(dict(banners, banners={}))))
+
+        changes = catalogue.document("character_changes")
+        rows = []
+        versions = []
+        for i, (key, entry) in enumerate(changes["characters"].items()):
+            prefix = key.split("-", 1)[0]
+            rows.append((key, i, int(prefix) if prefix.isdigit() else None, entry.get("name"), dumps(entry)))
+            for patch in entry.get("changed_in_patch_versions", []):
+                versions.append((key, patch) + parse_version(patch))
+        counts["character_changes"] = _insert(db, "character_changes", rows)
+        counts["character_change_versions"] = _insert(db, "character_change_versions", versions)
+        db.execute("INSERT INTO documents VALUES (?, ?)",
+                   ("character_changes.json", dumps(dict(changes, characters={}))))
+
+        counts["version_diffs"] = _insert(db, "version_diffs", (
+            (key, i, dumps(diff)) for i, (key, diff) in enumerate(catalogue.document("version_diffs").items())))
+
+        _insert(db, "sources", ((file, line_ending(os.path.join(root, file))) for file in EXPORTS))
+        if fts:
+            counts["search"] = _insert(db, "search", search)
+        db.execute("PRAGMA user_version = %d" % SCHEMA_VERSION)
+        db.commit()
+        db.execute("ANALYZE")
+        db.commit()
+    except BaseException:
+        db.close()
+        os.remove(tmp)
+        raise
+    db.close()
+    os.replace(tmp, path)
+    return counts
+
+
+def round_trip(root="."):
+    """Import `root` into a scratch database and export it again; returns the files that come out different"""
+    with tempfile.TemporaryDirectory(prefix="catalogue-db-") as directory:
+        path = os.path.join(directory, "catalogue.db")
+        import_catalogue(root, path)
+        db = CatalogueDB(path)
+        try:
+            db.export(directory)
+        finally:
+            db.close()
+        differ = []
+        for file in EXPORTS:
+            with open(os.path.join(root, file), "rb") as original:
+                with open(os.path.join(directory, file), "rb") as exported:
+                    if original.read() != exported.read():
+                        differ.append(file)
+        return differ
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build, query and export the SQLite catalogue")
+    parser.add_argument("--db", default=DB_PATH, help="database path (default: %(default)s)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("import", help="rebuild the database from the JSON files")
+    export = commands.add_parser("export", help="write the JSON files from the database")
+    export.add_argument("--out", default=".", help="output directory (default: the site root)")
+    export.add_argument("files", nargs="*", metavar="FILE",
+                        help="files to write (default: all of %s)" % ", ".join(EXPORTS))
+    commands.add_parser("roundtrip", help="check that import and export reproduce the JSON files byte for byte")
+    search = commands.add_parser("search", help="full-text search over names and descriptions")
+    search.add_argument("text")
+    search.add_argument("--kind", action="append", choices=["character", "weapon", "artifact", "material"])
+    search.add_argument("--limit", type=int, default=20)
+    uses = commands.add_parser("uses-material", help="weapons whose ascension needs a material")
+    uses.add_argument("material", help="material id or name")
+    reruns = commands.add_parser("reruns", help="rerun banners in a version (4.x or 4.2)")
+    reruns.add_argument("version")
+    changed = commands.add_parser("changed-in", help="characters changed in a version's patches (5.x or 5.1)")
+    changed.add_argument("version")
+    sql = commands.add_parser("sql", help="run a read-only SQL query")
+    sql.add_argument("statement")
+    return parser.parse_args()
+
+
+def print_rows(rows):
+    if not rows:
+        print("(no rows)")
+        return
+    columns = rows[0].keys()
+    widths = [max(len(str(column)), *(len(str(row[column])) for row in rows)) for column in columns]
+    print("  ".join(str(column).ljust(width) for column, width in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(str(row[column]).ljust(width) for column, width in zip(columns, widths)))
+    print("(%d row%s)" % (len(rows), "" if len(rows) == 1 else "s"))
+
+
+def main():
+    args = parse_args()
+    if args.command == "import":
+        started = time.perf_counter()
+        counts = import_catalogue(path=args.db)
+        print("✓ Imported the catalogue into %s in %.2fs (%.1f KB)" % (
+            args.db, time.perf_counter() - started, os.path.getsize(args.db) / 1024))
+        for table, n in counts.items():
+            print("  %6d %s" % (n, table))
+        if "search" not in counts:
+            print("⚠ SQLite was built without FTS5; search falls back to matching names")
+        return
+    if args.command == "roundtrip":
+        differ = round_trip()
+        for file in EXPORTS:
+            print("%s %s" % ("✗" if file in differ else "✓", file))
+        if differ:
+            sys.exit("✗ %d of %d files did not round-trip" % (len(differ), len(EXPORTS)))
+        return
+
+    try:
+        db = CatalogueDB(args.db)
+    except (FileNotFoundError, ValueError) as e:
+        sys.exit("✗ %s" % e)
+    try:
+        if args.command == "export":
+            unknown = sorted(set(args.files) - set(EXPORTS))
+            if unknown:
+                sys.exit("✗ Cannot export %s (choose from %s)" % (", ".join(unknown), ", ".join(EXPORTS)))
+            os.makedirs(args.out, exist_ok=True)
+            for path in db.export(args.out, args.files or None):
+                print("✓ Wrote %s" % path)
+        elif args.command == "search":
+            print_rows(db.search(args.text, args.kind, args.limit))
+        elif args.command == "uses-material":
+            print_rows(db.weapons_using(args.material))
+        elif args.command == "reruns":
+            print_rows(db.reruns(args.version))
+        elif args.command == "changed-in":
+            print_rows(db.changed_in(args.version))
+        elif args.command == "sql":
+            print_rows(db.query(args.statement))
+    except sqlite3.Error as e:
+        sys.exit("✗ %s" % e)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
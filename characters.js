@@ -5,6 +5,7 @@ let activeFilters = {
   weapon: []
 };
 let searchTerm = ''; // for name search
+let gridVariants = {}; // thumbnails from loadGridVariants() in script.js
 
 
 document.addEventListener('DOMContentLoaded', () => {
@@ -19,10 +20,10 @@ document.addEventListener('DOMContentLoaded', () => {
   searchTerm = '';
   activeFilters = { rarity: [], element: [], weapon: [] };
 
-  fetch('characters.json')
-    .then(r => r.json())
-    .then(data => {
+  Promise.all([fetch('characters.json').then(r => r.json()), loadGridVariants()])
+    .then(([data, variants]) => {
       allCharacters = data;
+      gridVariants = variants;
       setupFilters();
       renderCharacters(data, container);
     })
@@ -179,12 +180,12 @@ function renderCharacters(chars, container) {
       weaponIcon.style.display = 'none';
     }
 
-    meta.appendChild(elementIcon);
+    meta.appendChild(tileImageElement(gridVariants, elementIcon, '(max-width: 768px) 18px, 28px'));
     meta.appendChild(weaponIcon);
 
     inner.appendChild(versionBadge);
     inner.appendChild(rarityBadge);
-    inner.appendChild(img);
+    inner.appendChild(tileImageElement(gridVariants, img, '(max-width: 768px) 110px, 240px'));
     inner.appendChild(title);
     inner.appendChild(constellation);
     inner.appendChild(meta);
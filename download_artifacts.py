@@ -1,11 +1,15 @@
-import requests
 import os
-import json
 import time
 from datetime import datetime
 
+from http_cache import HttpCache
+from journal import Journal
+from jsonio import write_json
+
 # Artifact API endpoints
 BASE_URL = "https://gi.yatta.moe/api/v2/en/reliquary"
+# Progress of the current run, so an interrupted run can resume
+JOURNAL_PATH = "Data/artifacts.journal"
 
 # Create folder structure
 os.makedirs("Data/artifacts", exist_ok=True)
@@ -13,21 +17,25 @@ os.makedirs("Data/artifacts", exist_ok=True)
 print("Fetching artifacts from Project Amber...")
 print("=" * 70)
 
+cache = HttpCache()
+journal = Journal(JOURNAL_PATH)
+
 try:
     # Get artifact index
-    response = requests.get(BASE_URL, timeout=10)
-    response.raise_for_status()
-    
-    data = response.json()
+    data = cache.get_json(BASE_URL, timeout=10)
     artifacts_index = data.get("data", {}).get("items", {})
     
     total_artifacts = len(artifacts_index)
     print("Found %d artifacts.\n" % total_artifacts)
     
-    artifacts_list = []
-    success_count = 0
+    resumed = journal.load()
+    if resumed:
+        print("Resuming run from %s: %d artifact(s) already done\n" % (journal.started_at, len(resumed)))
+    journal.start()
     
     for idx, (artifact_id, artifact_data) in enumerate(artifacts_index.items(), 1):
+        if artifact_id in resumed:
+            continue
         try:
             # Extract all available data from artifacts_index
             name = artifact_data.get("name", "artifact_%s" % artifact_id)
@@ -70,12 +78,10 @@ try:
             filename = "".join(c if c.isalnum() or c in (' ', '-', '_') else '' for c in name)
             file_path = "Data/artifacts/%s.json" % filename
             
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(artifact_data, f, indent=4, ensure_ascii=False)
+            write_json(file_path, artifact_data, indent=4)
             
-            artifacts_list.append(full_data)
+            journal.record(artifact_id, file_path, full_data)
             
-            success_count += 1
             status = "[%d/%d] OK: %s | Rarity: %d★ | 2pc: %s | 4pc: %s" % (
                 idx, total_artifacts, 
                 name[:35].ljust(35),
@@ -92,9 +98,13 @@ try:
             print("[%d/%d] ERROR: %s - %s" % (idx, total_artifacts, artifact_id, str(e)[:40]))
             time.sleep(0.05)
     
+    # Rebuild from the journal so artifacts finished by an interrupted run count too
+    artifacts_list = journal.entries(artifacts_index)
+    success_count = len(artifacts_list)
+    
     # Save comprehensive artifacts.json for easy access
-    with open("artifacts.json", "w", encoding="utf-8") as f:
-        json.dump(artifacts_list, f, indent=4, ensure_ascii=False)
+    write_json("artifacts.json", artifacts_list, indent=4)
+    journal.finish()
     
     print("\n" + "=" * 70)
     print("SUCCESS: Processed %d/%d artifacts!" % (success_count, total_artifacts))
@@ -108,7 +118,12 @@ try:
         rarity_counts[rarity] = rarity_counts.get(rarity, 0) + 1
     for rarity in sorted(rarity_counts.keys()):
         print("  %d★: %d artifacts" % (rarity, rarity_counts[rarity]))
+    print("\n" + cache.summary())
     
+except KeyboardInterrupt:
+    print("\nInterrupted. %d artifact(s) saved to %s; rerun to resume." % (len(journal.records), JOURNAL_PATH))
 except Exception as e:
     print("FATAL ERROR: %s" % str(e))
+    if journal.records:
+        print("%d artifact(s) saved to %s; rerun to resume." % (len(journal.records), JOURNAL_PATH))
 
@@ -1,47 +1,221 @@
 import os
 import json
-import requests
+import shutil
+import hashlib
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+
+import instrumentation
+from catalogue import get_catalogue
+from http_client import get_client
+
+IMAGES_DIR = "images"
+# Content-addressed store: every distinct image body is kept exactly once
+OBJECTS_DIR = os.path.join(IMAGES_DIR, "objects")
+MANIFEST_PATH = os.path.join(IMAGES_DIR, "manifest.json")
+CHUNK_SIZE = 64 * 1024
 
-os.makedirs("images", exist_ok=True)
+base_site = "https://gi.yatta.moe"
 
-headers = {
-    "User-Agent": "Mozilla/5.0"
-}
 
-base_site = "https://gi.yatta.moe"
+def parse_args():
+    parser = argparse.ArgumentParser(description="Mirror character, weapon, artifact and material icons")
+    parser.add_argument("--workers", type=int, default=8,
+                        help="parallel downloads (default: %(default)s)")
+    parser.add_argument("--verify", action="store_true",
+                        help="re-hash stored images instead of trusting their size")
+    parser.add_argument("--only", nargs="+", choices=["characters", "weapons", "artifacts", "materials"],
+                        help="limit the mirror to these catalogues")
+    return parser.parse_args()
+
+
+def url_extension(img_url):
+    ext = os.path.splitext(urlparse(img_url).path)[1]
+    return ext if ext else ".png"
 
-for filename in os.listdir("data"):
-    if filename.endswith(".json"):
 
-        filepath = os.path.join("data", filename)
+def safe_name(name):
+    return "".join(c if c.isalnum() or c in (' ', '-', '_') else '_' for c in name)
 
-        with open(filepath, "r", encoding="utf-8") as f:
-            data = json.load(f)
 
-        character = data.get("data", {})
+def load_json(path, default):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
 
-        name = character.get("name", filename.replace(".json", ""))
 
-        # Change these if your JSON uses different keys
-        image_fields = ["icon", "sideIcon", "gachaIcon"]
+def load_records(name):
+    try:
+        return get_catalogue().dataset(name).records
+    except (OSError, ValueError):
+        return []
 
-        for field in image_fields:
-            img_url = character.get(field)
 
+def character_images():
+    """Icons referenced by the character detail files and characters.json"""
+    # Change these if your JSON uses different keys
+    image_fields = ["icon", "sideIcon", "gachaIcon"]
+
+    if os.path.isdir("data"):
+        for filename in sorted(os.listdir("data")):
+            if not filename.endswith(".json"):
+                continue
+            data = load_json(os.path.join("data", filename), {})
+            character = data.get("data", {})
+            name = character.get("name", filename.replace(".json", ""))
+            for field in image_fields:
+                img_url = character.get(field)
+                if img_url:
+                    if img_url.startswith("/"):
+                        img_url = base_site + img_url
+                    yield img_url, "%s_%s%s" % (name, field, url_extension(img_url))
+
+    for char in load_records("characters"):
+        for field in ("image", "icon"):
+            img_url = char.get(field)
             if img_url:
-                if img_url.startswith("/"):
-                    img_url = base_site + img_url
+                yield img_url, os.path.join("characters", "%s_%s%s" % (safe_name(char["name"]), field, url_extension(img_url)))
+
+
+def weapon_images():
+    for weapon in load_records("weapons"):
+        if weapon.get("icon"):
+            yield "%s/assets/UI/%s.png" % (base_site, weapon["icon"]), os.path.join("weapons", weapon["icon"] + ".png")
 
-                try:
-                    img_data = requests.get(img_url, headers=headers).content
 
-                    extension = img_url.split(".")[-1]
-                    save_path = f"images/{name}_{field}.{extension}"
+def artifact_images():
+    for artifact in load_records("artifacts"):
+        if artifact.get("icon"):
+            yield "%s/assets/UI/reliquary/%s.png" % (base_site, artifact["icon"]), os.path.join("artifacts", artifact["icon"] + ".png")
 
-                    with open(save_path, "wb") as img_file:
-                        img_file.write(img_data)
 
-                    print("Downloaded:", save_path)
+def material_images():
+    for item in load_records("inventory"):
+        if item.get("icon"):
+            yield "%s/assets/UI/%s.png" % (base_site, item["icon"]), os.path.join("materials", item["icon"] + ".png")
 
+
+SOURCES = {
+    "characters": character_images,
+    "weapons": weapon_images,
+    "artifacts": artifact_images,
+    "materials": material_images,
+}
+
+
+def object_path(digest, ext):
+    return os.path.join(OBJECTS_DIR, digest[:2], digest + ext)
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def is_stored(record, verify):
+    """True when the manifest entry still points at an intact stored object"""
+    if not record:
+        return False
+    path = record["path"]
+    try:
+        if os.path.getsize(path) != record["size"]:
+            return False
+    except OSError:
+        return False
+    return not verify or file_sha256(path) == record["sha256"]
+
+
+def download(client, img_url):
+    """Stream an image to the object store and return its manifest record"""
+    os.makedirs(OBJECTS_DIR, exist_ok=True)
+    tmp_path = os.path.join(OBJECTS_DIR, "tmp-%d-%d" % (os.getpid(), threading.get_ident()))
+    h = hashlib.sha256()
+    size = 0
+
+    with client.get(img_url, stream=True, timeout=15) as response:
+        response.raise_for_status()
+        with open(tmp_path, "wb") as img_file:
+            for chunk in response.iter_content(CHUNK_SIZE):
+                img_file.write(chunk)
+                h.update(chunk)
+                size += len(chunk)
+
+    digest = h.hexdigest()
+    path = object_path(digest, url_extension(img_url))
+    if os.path.exists(path):
+        # Same bytes already mirrored from another URL
+        os.remove(tmp_path)
+    else:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(tmp_path, path)
+        instrumentation.record_write(path, size)
+    return {"sha256": digest, "size": size, "path": path}
+
+
+def link(object_file, save_path):
+    """Expose a stored object under its readable name without copying when possible"""
+    os.makedirs(os.path.dirname(save_path) or ".", exist_ok=True)
+    try:
+        if os.path.samefile(object_file, save_path):
+            return
+        os.remove(save_path)
+    except OSError:
+        pass
+    try:
+        os.link(object_file, save_path)
+    except OSError:
+        shutil.copyfile(object_file, save_path)
+
+
+def main():
+    args = parse_args()
+    os.makedirs(IMAGES_DIR, exist_ok=True)
+
+    # Group readable names by URL so each URL is fetched at most once
+    targets = {}
+    for kind in args.only or SOURCES:
+        for img_url, name in SOURCES[kind]():
+            targets.setdefault(img_url, []).append(os.path.join(IMAGES_DIR, name))
+
+    manifest = load_json(MANIFEST_PATH, {})
+    pending = [img_url for img_url in targets if not is_stored(manifest.get(img_url), args.verify)]
+    print("Mirroring %d images (%d already stored, %d to download)..." % (
+        len(targets), len(targets) - len(pending), len(pending)))
+
+    client = get_client()
+    errors = 0
+    try:
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            futures = {pool.submit(download, client, img_url): img_url for img_url in pending}
+            for future in as_completed(futures):
+                img_url = futures[future]
+                try:
+                    manifest[img_url] = future.result()
+                    print("Downloaded:", img_url)
                 except Exception as e:
-                    print("Error downloading image:", e)
\ No newline at end of file
+                    errors += 1
+                    print("Error downloading image:", img_url, e)
+    finally:
+        with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+    for img_url, save_paths in targets.items():
+        record = manifest.get(img_url)
+        if record and os.path.exists(record["path"]):
+            for save_path in save_paths:
+                link(record["path"], save_path)
+
+    objects = {manifest[img_url]["sha256"] for img_url in targets if img_url in manifest}
+    print("\n✓ %d URLs mirrored as %d unique images, %d errors" % (
+        sum(1 for u in targets if u in manifest), len(objects), errors))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,134 +1,325 @@
-import requests
 import os
 import json
 import time
+import hashlib
+import argparse
 from datetime import datetime
 
+from catalogue import get_catalogue
+from fetch_engine import fetch_all, DEFAULT_RATE, DEFAULT_MAX_IN_FLIGHT
+from http_cache import HttpCache
+from journal import Journal
+from jsonio import write_json
+
 # Base API: https://gi.yatta.moe/en/archive/weapon
 BASE_URL = "https://gi.yatta.moe/api/v2/en/weapon"
 DETAIL_URL = "https://gi.yatta.moe/api/v2/en/weapon"
 
-# Create folder structure
-os.makedirs("Data/weapons", exist_ok=True)
-
-print("Fetching weapons from Project Amber...")
-print("=" * 70)
-
-try:
-    # Get weapon index
-    response = requests.get(BASE_URL, timeout=10)
-    response.raise_for_status()
-    
-    data = response.json()
-    weapons_index = data.get("data", {}).get("items", {})
-    props_map = data.get("data", {}).get("props", {})  # Prop name mapping
-    
+# Per-weapon index hashes from the last sync, used by --incremental
+MANIFEST_PATH = "Data/weapons_manifest.json"
+# Progress of the current run, so an interrupted crawl can resume
+JOURNAL_PATH = "Data/weapons.journal"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Download weapon data from Project Amber")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="fetch weapon details concurrently instead of one at a time")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE,
+                        help="async mode: max requests per second (default: %(default)s)")
+    parser.add_argument("--max-in-flight", type=int, default=DEFAULT_MAX_IN_FLIGHT,
+                        help="async mode: max concurrent requests (default: %(default)s)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only fetch weapons that are new or changed since the last sync")
+    parser.add_argument("--restart", action="store_true",
+                        help="ignore progress from an interrupted run and start over")
+    return parser.parse_args()
+
+
+def build_weapon_entry(weapon_id, weapon_preview, weapon_data, props_map):
+    """Build the simplified weapons.json card entry from detailed weapon data"""
+    # Extract base stats from upgrade section
+    atk = "—"
+    secondary_stat = "—"
+    secondary_label = "—"
+
+    if "upgrade" in weapon_data and "prop" in weapon_data["upgrade"]:
+        props = weapon_data["upgrade"]["prop"]
+
+        # Calculate level 90 stats
+        base_atk = 0
+        secondary_value = 0
+        secondary_type = ""
+
+        # Get base values at level 1
+        for prop in props:
+            prop_type = prop.get("propType", "")
+            init_value = prop.get("initValue", 0)
+
+            if prop_type == "FIGHT_PROP_BASE_ATTACK":
+                base_atk = init_value
+            elif prop_type != "NONE":
+                secondary_value = init_value
+                secondary_type = prop_type
+
+        # Get added values from promotions
+        promote_atk = 0
+        promote_secondary = 0
+        if "promote" in weapon_data["upgrade"]:
+            for promote in weapon_data["upgrade"]["promote"]:
+                if promote.get("addProps"):
+                    for prop_type, value in promote["addProps"].items():
+                        if prop_type == "FIGHT_PROP_BASE_ATTACK":
+                            promote_atk += value
+                        elif prop_type == secondary_type:
+                            promote_secondary += value
+
+        # Calculate level 90 stats
+        atk_level_90 = int(base_atk + promote_atk) if base_atk else "—"
+        atk = atk_level_90
+
+        # For secondary stats, also handle growth curves
+        if secondary_type and secondary_type != "NONE":
+            final_secondary = secondary_value + promote_secondary
+            stat_label = props_map.get(secondary_type, secondary_type)
+            # Convert to percentage display
+            percentage = int(final_secondary * 100) if isinstance(final_secondary, (int, float)) else final_secondary
+            secondary_stat = "%d%%" % percentage
+            secondary_label = stat_label
+
+    return {
+        "id": weapon_id,
+        "name": weapon_data.get("name", "weapon_%s" % weapon_id),
+        "type": weapon_data.get("type", "Unknown"),
+        "rarity": weapon_preview.get("rank", 3),
+        "icon": weapon_data.get("icon", ""),
+        "atk": atk,
+        "secondaryStat": secondary_stat,
+        "secondaryLabel": secondary_label,
+        "specialProp": weapon_data.get("specialProp", "NONE")
+    }
+
+
+def weapon_detail_path(weapon_name):
+    filename = "".join(c if c.isalnum() or c in (' ', '-', '_') else '' for c in weapon_name)
+    return "Data/weapons/%s.json" % filename
+
+
+def save_weapon_detail(weapon_id, weapon_data):
+    """Save detailed weapon data to Data/weapons/<name>.json"""
+    weapon_name = weapon_data.get("name", "weapon_%s" % weapon_id)
+    file_path = weapon_detail_path(weapon_name)
+
+    write_json(file_path, weapon_data, indent=4)
+    return file_path
+
+
+def process_weapon(journal, weapon_id, weapon_preview, weapon_data, props_map):
+    """Save a fetched weapon, journal it and return its card entry"""
+    file_path = save_weapon_detail(weapon_id, weapon_data)
+    entry = build_weapon_entry(weapon_id, weapon_preview, weapon_data, props_map)
+    journal.record(weapon_id, file_path, entry)
+    return entry
+
+
+def print_ok(idx, total_weapons, entry):
+    status = "[%d/%d] OK: %s | ATK: %s | %s" % (idx, total_weapons, entry["name"][:35].ljust(35), str(entry["atk"]).rjust(4), entry["secondaryLabel"])
+    print(status)
+
+
+def print_error(idx, total_weapons, weapon_id, e):
+    print("[%d/%d] ERROR: %s - %s" % (idx, total_weapons, weapon_id, str(e)[:40]))
+
+
+def index_hash(weapon_preview):
+    """Content hash of a weapon's entry in the index (data.items)"""
+    canonical = json.dumps(weapon_preview, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+def load_manifest():
+    try:
+        with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+            return json.load(f).get("weapons", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(records):
+    write_json(MANIFEST_PATH, {"version": 1, "weapons": records}, indent=4)
+
+
+def load_previous_entries():
+    """Previous weapons.json entries by id, used when the manifest lacks a snapshot"""
+    try:
+        return {str(w.id): w.raw for w in get_catalogue().weapons}
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return {}
+
+
+def plan_incremental(weapons_index, manifest):
+    """Split the index into weapon ids that need fetching and ids that can be reused"""
+    changed = []
+    unchanged = []
+    for weapon_id, weapon_preview in weapons_index.items():
+        record = manifest.get(weapon_id)
+        if (record is None or record.get("hash") != index_hash(weapon_preview)
+                or not record.get("entry") or not os.path.exists(record.get("file", ""))):
+            changed.append(weapon_id)
+        else:
+            unchanged.append(weapon_id)
+    return changed, unchanged
+
+
+def fetch_serial(cache, journal, weapons_index, props_map):
+    """Fetch weapon details one at a time with a fixed delay between requests"""
     total_weapons = len(weapons_index)
-    print("Found %d weapons.\n" % total_weapons)
-    
-    weapons_list = []
-    success_count = 0
-    
+    entries = {}
+
     for idx, (weapon_id, weapon_preview) in enumerate(weapons_index.items(), 1):
         try:
             # Get detailed weapon data
             detail_url = "%s/%s" % (DETAIL_URL, weapon_id)
-            detail_resp = requests.get(detail_url, timeout=5)
-            detail_resp.raise_for_status()
-            
-            weapon_data = detail_resp.json().get("data", {})
-            
-            # Extract base stats from upgrade section
-            atk = "—"
-            secondary_stat = "—"
-            secondary_label = "—"
-            
-            if "upgrade" in weapon_data and "prop" in weapon_data["upgrade"]:
-                props = weapon_data["upgrade"]["prop"]
-                
-                # Calculate level 90 stats
-                base_atk = 0
-                secondary_value = 0
-                secondary_type = ""
-                
-                # Get base values at level 1
-                for prop in props:
-                    prop_type = prop.get("propType", "")
-                    init_value = prop.get("initValue", 0)
-                    
-                    if prop_type == "FIGHT_PROP_BASE_ATTACK":
-                        base_atk = init_value
-                    elif prop_type != "NONE":
-                        secondary_value = init_value
-                        secondary_type = prop_type
-                
-                # Get added values from promotions
-                promote_atk = 0
-                promote_secondary = 0
-                if "promote" in weapon_data["upgrade"]:
-                    for promote in weapon_data["upgrade"]["promote"]:
-                        if promote.get("addProps"):
-                            for prop_type, value in promote["addProps"].items():
-                                if prop_type == "FIGHT_PROP_BASE_ATTACK":
-                                    promote_atk += value
-                                elif prop_type == secondary_type:
-                                    promote_secondary += value
-                
-                # Calculate level 90 stats
-                atk_level_90 = int(base_atk + promote_atk) if base_atk else "—"
-                atk = atk_level_90
-                
-                # For secondary stats, also handle growth curves
-                if secondary_type and secondary_type != "NONE":
-                    final_secondary = secondary_value + promote_secondary
-                    stat_label = props_map.get(secondary_type, secondary_type)
-                    # Convert to percentage display
-                    percentage = int(final_secondary * 100) if isinstance(final_secondary, (int, float)) else final_secondary
-                    secondary_stat = "%d%%" % percentage
-                    secondary_label = stat_label
-            
-            # Save to individual JSON file
-            weapon_name = weapon_data.get("name", "weapon_%s" % weapon_id)
-            filename = "".join(c if c.isalnum() or c in (' ', '-', '_') else '' for c in weapon_name)
-            file_path = "Data/weapons/%s.json" % filename
-            
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(weapon_data, f, indent=4, ensure_ascii=False)
-            
-            # Build simplified entry for weapons.json
-            weapons_list.append({
-                "id": weapon_id,
-                "name": weapon_name,
-                "type": weapon_data.get("type", "Unknown"),
-                "rarity": weapon_preview.get("rank", 3),
-                "icon": weapon_data.get("icon", ""),
-                "atk": atk,
-                "secondaryStat": secondary_stat,
-                "secondaryLabel": secondary_label,
-                "specialProp": weapon_data.get("specialProp", "NONE")
-            })
-            
-            success_count += 1
-            status = "[%d/%d] OK: %s | ATK: %s | %s" % (idx, total_weapons, weapon_name[:35].ljust(35), str(atk).rjust(4), secondary_label)
-            print(status)
-            
+            weapon_data = cache.get_json(detail_url, timeout=5).get("data", {})
+            entry = process_weapon(journal, weapon_id, weapon_preview, weapon_data, props_map)
+            entries[weapon_id] = entry
+            print_ok(idx, total_weapons, entry)
+
             # Be gentle with API - don't hammer it
             time.sleep(0.15)
-            
+
         except Exception as e:
-            print("[%d/%d] ERROR: %s - %s" % (idx, total_weapons, weapon_id, str(e)[:40]))
+            print_error(idx, total_weapons, weapon_id, e)
             time.sleep(0.1)
-    
-    # Save simplified weapons.json for card display
-    with open("weapons.json", "w", encoding="utf-8") as f:
-        json.dump(weapons_list, f, indent=4, ensure_ascii=False)
-    
-    print("\n" + "=" * 70)
-    print("SUCCESS: Processed %d/%d weapons!" % (success_count, total_weapons))
-    print("Saved detailed data to Data/weapons/")
-    print("Saved display data to weapons.json")
-    print("Completed at: %s" % datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+
+    return entries
+
+
+def fetch_async(cache, journal, weapons_index, props_map, rate, max_in_flight):
+    """Fetch weapon details concurrently under a token-bucket rate limit"""
+    total_weapons = len(weapons_index)
+    entries = {}
+    done = [0]
+
+    def fetch(weapon_id):
+        return cache.get_json("%s/%s" % (DETAIL_URL, weapon_id), timeout=5).get("data", {})
+
+    def on_result(weapon_id, result):
+        done[0] += 1
+        try:
+            if isinstance(result, Exception):
+                raise result
+            entry = process_weapon(journal, weapon_id, weapons_index[weapon_id], result, props_map)
+            entries[weapon_id] = entry
+            print_ok(done[0], total_weapons, entry)
+        except Exception as e:
+            print_error(done[0], total_weapons, weapon_id, e)
+
+    fetch_all(weapons_index.keys(), fetch, rate=rate, max_in_flight=max_in_flight, on_result=on_result)
+    return entries
+
+
+def main():
+    args = parse_args()
+
+    # Create folder structure
+    os.makedirs("Data/weapons", exist_ok=True)
+
+    print("Fetching weapons from Project Amber...")
     print("=" * 70)
-    
-except Exception as e:
-    print("Error: %s" % e)
+
+    cache = HttpCache()
+    journal = Journal(JOURNAL_PATH)
+    if args.restart:
+        journal.finish()
+
+    try:
+        started = time.perf_counter()
+
+        # Get weapon index
+        data = cache.get_json(BASE_URL, timeout=10)
+        weapons_index = data.get("data", {}).get("items", {})
+        props_map = data.get("data", {}).get("props", {})  # Prop name mapping
+
+        total_weapons = len(weapons_index)
+        print("Found %d weapons.\n" % total_weapons)
+
+        manifest = load_manifest() if args.incremental else {}
+        to_fetch = weapons_index
+        if args.incremental:
+            changed, unchanged = plan_incremental(weapons_index, manifest)
+            to_fetch = {weapon_id: weapons_index[weapon_id] for weapon_id in changed}
+            print("Incremental sync: %d new or changed, %d unchanged\n" % (len(changed), len(unchanged)))
+
+        resumed = journal.load()
+        if resumed:
+            print("Resuming run from %s: %d weapon(s) already done\n" % (journal.started_at, len(resumed)))
+            to_fetch = {weapon_id: preview for weapon_id, preview in to_fetch.items() if weapon_id not in resumed}
+        journal.start()
+
+        if args.use_async:
+            print("Async mode: %.1f req/s, %d in flight\n" % (args.rate, args.max_in_flight))
+            fetch_async(cache, journal, to_fetch, props_map, args.rate, args.max_in_flight)
+        else:
+            fetch_serial(cache, journal, to_fetch, props_map)
+
+        # Rebuild from the journal so weapons finished by an interrupted run count too
+        entries = {weapon_id: record["entry"] for weapon_id, record in journal.records.items()}
+        fetched_count = len(entries)
+
+        # Record what was fetched so the next --incremental run can skip it.
+        # In incremental mode unchanged weapons are reused, and a weapon whose
+        # detail fetch failed keeps its previous snapshot instead of being dropped.
+        previous = load_previous_entries() if args.incremental else {}
+        records = {}
+        kept = 0
+        for weapon_id, weapon_preview in weapons_index.items():
+            record = manifest.get(weapon_id)
+            if weapon_id in entries:
+                entry = entries[weapon_id]
+                records[weapon_id] = {
+                    "hash": index_hash(weapon_preview),
+                    "file": weapon_detail_path(entry["name"]),
+                    "entry": entry
+                }
+                continue
+            snapshot = (record or {}).get("entry") or previous.get(weapon_id)
+            if snapshot is None:
+                continue
+            entries[weapon_id] = snapshot
+            if weapon_id in to_fetch:
+                kept += 1
+            # A failed fetch keeps the old hash so the next sync retries it
+            records[weapon_id] = record or {"hash": None, "file": weapon_detail_path(snapshot["name"]), "entry": snapshot}
+        save_manifest(records)
+        if kept:
+            print("\nKept previous snapshot for %d weapon(s) that failed to fetch" % kept)
+
+        # Keep weapons.json in index order regardless of completion order
+        weapons_list = [entries[weapon_id] for weapon_id in weapons_index if weapon_id in entries]
+
+        # Save simplified weapons.json for card display
+        write_json("weapons.json", weapons_list, indent=4)
+        journal.finish()
+
+        print("\n" + "=" * 70)
+        print("SUCCESS: Processed %d/%d weapons!" % (len(weapons_list), total_weapons))
+        if args.incremental:
+            print("Fetched %d weapon(s), reused %d" % (fetched_count, len(weapons_list) - fetched_count))
+        print("Saved detailed data to Data/weapons/")
+        print("Saved display data to weapons.json")
+        print(cache.summary())
+        print("Elapsed: %.1fs" % (time.perf_counter() - started))
+        print("Completed at: %s" % datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        print("=" * 70)
+
+    except KeyboardInterrupt:
+        print("\nInterrupted. %d weapon(s) saved to %s; rerun to resume." % (len(journal.records), JOURNAL_PATH))
+    except Exception as e:
+        print("Error: %s" % e)
+        if journal.records:
+            print("%d weapon(s) saved to %s; rerun to resume." % (len(journal.records), JOURNAL_PATH))
+
+
+if __name__ == "__main__":
+    main()
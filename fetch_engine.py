@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Asyncio fetch engine with bounded concurrency and token-bucket rate limiting.
+
+Blocking fetch callables (requests based) run on a thread pool while the event
+loop decides when each one may start, so the API sees a steady request rate
+instead of bursts followed by fixed sleeps.
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_RATE = 25.0        # requests per second
+DEFAULT_MAX_IN_FLIGHT = 8  # concurrent requests
+
+
+class TokenBucket:
+    """Allow `rate` acquisitions per second with bursts of up to `capacity`"""
+
+    def __init__(self, rate, capacity=None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+async def _fetch_all(keys, fetch, rate, max_in_flight, on_result):
+    bucket = TokenBucket(rate, capacity=max_in_flight)
+    in_flight = asyncio.Semaphore(max_in_flight)
+    loop = asyncio.get_running_loop()
+    results = {}
+
+    with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+        async def run(key):
+            async with in_flight:
+                await bucket.acquire()
+                try:
+                    result = await loop.run_in_executor(pool, fetch, key)
+                except Exception as e:
+                    result = e
+            results[key] = result
+            if on_result:
+                on_result(key, result)
+
+        await asyncio.gather(*(run(key) for key in keys))
+
+    return results
+
+
+def fetch_all(keys, fetch, rate=DEFAULT_RATE, max_in_flight=DEFAULT_MAX_IN_FLIGHT, on_result=None):
+    """
+    Call `fetch(key)` for every key, at most `max_in_flight` at a time and no
+    faster than `rate` calls per second.
+
+    Returns {key: result}; a failed call maps to the exception it raised.
+    `on_result(key, result)` is invoked on the event loop as each call finishes.
+    """
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be at least 1")
+    return asyncio.run(_fetch_all(list(keys), fetch, rate, max_in_flight, on_result))
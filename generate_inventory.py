@@ -1,38 +1,121 @@
 #!/usr/bin/env python3
+import argparse
+import hashlib
 import json
+import os
 
-# Load materials data
-with open('materials.json', 'r') as f:
-    materials_response = json.load(f)
-
-materials_data = materials_response['data']
-items = materials_data['items']
-types = materials_data['types']
-
-# Convert to inventory format
-inventory = []
-
-for item_id, item_info in items.items():
-    inventory_item = {
-        'id': item_info['id'],
-        'name': item_info['name'],
-        'category': types.get(item_info['type'], item_info['type']),
-        'icon': item_info['icon'],
-        'rank': item_info.get('rank', 1),
-        'type': item_info['type'],
-        'mapMark': item_info.get('mapMark', False),
-        'route': item_info.get('route', '')
-    }
-    inventory.append(inventory_item)
-
-# Sort by rank (descending) and name
-inventory.sort(key=lambda x: (-x['rank'], x['name']))
-
-# Save to inventory.json
-with open('inventory.json', 'w', encoding='utf-8') as f:
-    json.dump(inventory, f, indent=2, ensure_ascii=False)
-
-print(f"✓ Generated inventory.json with {len(inventory)} items!")
-print(f"\nTop 10 items by rarity:")
-for item in inventory[:10]:
-    print(f"  [{item['id']}] {item['name']} (Rank {item['rank']}) - {item['category']}")
+from catalogue import get_catalogue
+from jsonio import COMPRESSED_SUFFIXES, write_bytes, write_json
+
+INVENTORY_PATH = 'inventory.json'
+
+# Sharded lookup files for pages that only need a few items (see inventory-lookup.js)
+INDEX_DIR = 'inventory-index'
+INDEX_MANIFEST = 'manifest.json'
+INDEX_VERSION = 1
+SHARD_SIZE = 128
+LOOKUP_FIELDS = ('name', 'icon', 'rank', 'category')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate inventory.json and its sharded lookup index")
+    parser.add_argument('--index-only', action='store_true',
+                        help="rebuild inventory-index/ from the existing inventory.json")
+    return parser.parse_args()
+
+
+def build_inventory():
+    # Convert materials.json records (category already resolved) to inventory format
+    inventory = []
+
+    for material in get_catalogue().materials:
+        inventory_item = {
+            'id': material.id,
+            'name': material.name,
+            'category': material.category,
+            'icon': material.icon,
+            'rank': material.rank,
+            'type': material.type,
+            'mapMark': material.map_mark,
+            'route': material.route
+        }
+        inventory.append(inventory_item)
+
+    # Sort by rank (descending) and name
+    inventory.sort(key=lambda x: (-x['rank'], x['name']))
+    return inventory
+
+
+def write_shard(directory, prefix, number, payload):
+    """Write a minified shard named after its content hash so it can be cached forever"""
+    data = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    filename = "%s-%d-%s.json" % (prefix, number, hashlib.sha256(data).hexdigest()[:10])
+    write_bytes(os.path.join(directory, filename), data)
+    return filename, len(data)
+
+
+def write_inventory_index(inventory, directory=INDEX_DIR, shard_size=SHARD_SIZE):
+    """
+    Split the inventory into contiguous id ranges and write, per range, a
+    lookup shard (id -> name/icon/rank/category) and an items shard (id -> full
+    record), plus a manifest listing each range and its files.
+    """
+    os.makedirs(directory, exist_ok=True)
+    by_id = sorted(inventory, key=lambda item: item['id'])
+
+    shards = []
+    lookup_bytes = 0
+    for number, start in enumerate(range(0, len(by_id), shard_size)):
+        chunk = by_id[start:start + shard_size]
+        lookup = {str(item['id']): {field: item.get(field) for field in LOOKUP_FIELDS} for item in chunk}
+        full = {str(item['id']): item for item in chunk}
+        lookup_file, size = write_shard(directory, 'lookup', number, lookup)
+        items_file, _ = write_shard(directory, 'items', number, full)
+        lookup_bytes += size
+        shards.append({
+            'first': chunk[0]['id'],
+            'last': chunk[-1]['id'],
+            'lookup': lookup_file,
+            'items': items_file,
+        })
+
+    manifest = {'version': INDEX_VERSION, 'count': len(by_id), 'shards': shards}
+    manifest_data = json.dumps(manifest, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    write_bytes(os.path.join(directory, INDEX_MANIFEST), manifest_data)
+
+    # Drop shards (and their precompressed copies) from previous builds
+    current = {INDEX_MANIFEST} | {s['lookup'] for s in shards} | {s['items'] for s in shards}
+    for name in os.listdir(directory):
+        base, ext = os.path.splitext(name)
+        if name not in current and not (ext in COMPRESSED_SUFFIXES and base in current):
+            os.remove(os.path.join(directory, name))
+
+    return shards, lookup_bytes
+
+
+def main():
+    args = parse_args()
+
+    if args.index_only:
+        inventory = get_catalogue().inventory.dicts()
+    else:
+        inventory = build_inventory()
+
+        # Save to inventory.json
+        write_json(INVENTORY_PATH, inventory, indent=2)
+
+        print(f"✓ Generated inventory.json with {len(inventory)} items!")
+        print(f"\nTop 10 items by rarity:")
+        for item in inventory[:10]:
+            print(f"  [{item['id']}] {item['name']} (Rank {item['rank']}) - {item['category']}")
+
+    shards, lookup_bytes = write_inventory_index(inventory)
+    full_bytes = os.path.getsize(INVENTORY_PATH)
+    print(f"\n✓ Wrote {len(shards)} shards of up to {SHARD_SIZE} items to {INDEX_DIR}/")
+    print(f"  lookup shards: {lookup_bytes / 1024:.1f} KB total, "
+          f"{lookup_bytes / max(len(shards), 1) / 1024:.1f} KB each "
+          f"(inventory.json: {full_bytes / 1024:.1f} KB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+On-disk HTTP response cache shared by the fetch scripts.
+
+Responses are stored under .cache/http keyed by URL. Within the TTL a cached
+body is served without touching the network; after that the cache revalidates
+with If-None-Match / If-Modified-Since and a 304 reuses the stored body.
+
+Environment overrides:
+    SKIRK_HTTP_CACHE=0            disable caching entirely
+    SKIRK_HTTP_CACHE_DIR=path     cache directory (default .cache/http)
+    SKIRK_HTTP_CACHE_TTL=secs     serve without revalidating for this long (default 600)
+    SKIRK_HTTP_CACHE_MAX_MB=n     evict least recently used entries above this size (default 200)
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+import instrumentation
+from http_client import get_client
+
+CACHE_DIR = os.environ.get("SKIRK_HTTP_CACHE_DIR", os.path.join(".cache", "http"))
+DEFAULT_TTL = float(os.environ.get("SKIRK_HTTP_CACHE_TTL", 600))
+DEFAULT_MAX_BYTES = int(float(os.environ.get("SKIRK_HTTP_CACHE_MAX_MB", 200)) * 1024 * 1024)
+ENABLED = os.environ.get("SKIRK_HTTP_CACHE", "1") != "0"
+
+
+class HttpCache:
+    """URL-keyed response cache with conditional revalidation and LRU eviction"""
+
+    def __init__(self, directory=CACHE_DIR, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES,
+                 client=None, enabled=ENABLED):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.client = client or get_client()
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.total_bytes = None  # computed lazily on first store
+        self.stats = {"fresh": 0, "revalidated": 0, "downloaded": 0, "bytes": 0}
+        if enabled:
+            os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.directory, key)
+        return base + ".body", base + ".meta"
+
+    def _load(self, url):
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None, None
+        if meta.get("url") != url:
+            return None, None
+        return meta, body
+
+    def _write(self, path, data):
+        tmp = "%s.%d.%d.tmp" % (path, os.getpid(), threading.get_ident())
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _store(self, url, meta, body):
+        body_path, meta_path = self._paths(url)
+        try:
+            old_size = os.path.getsize(body_path)
+        except OSError:
+            old_size = 0
+        self._write(body_path, body)
+        self._write(meta_path, json.dumps(meta).encode("utf-8"))
+        with self.lock:
+            if self.total_bytes is None:
+                self.total_bytes = self._scan_size()
+            else:
+                self.total_bytes += len(body) - old_size
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def _save_meta(self, url, meta):
+        _, meta_path = self._paths(url)
+        self._write(meta_path, json.dumps(meta).encode("utf-8"))
+
+    def _scan_size(self):
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".body"):
+                total += entry.stat().st_size
+        return total
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        bodies = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".body"):
+                st = entry.stat()
+                bodies.append((st.st_mtime, st.st_size, entry.path))
+        bodies.sort()
+        total = sum(size for _, size, _ in bodies)
+        for _, size, path in bodies:
+            if total <= self.max_bytes:
+                break
+            for p in (path, path[:-len(".body")] + ".meta"):
+                try:
+                    os.remove(p)
+                except OSError:
+                    pass
+            total -= size
+        self.total_bytes = total
+
+    def _count(self, key, nbytes=0):
+        with self.lock:
+            self.stats[key] += 1
+            self.stats["bytes"] += nbytes
+        instrumentation.count("http.cache." + key)
+        instrumentation.count("http.cache.bytes", nbytes)
+
+    def get(self, url, headers=None, timeout=10):
+        """Return the response body for `url`, from cache when possible"""
+        if not self.enabled:
+            response = self.client.get(url, headers=headers, timeout=timeout)
+            response.raise_for_status()
+            self._count("downloaded", len(response.content))
+            return response.content
+
+        meta, body = self._load(url)
+        now = time.time()
+        body_path, _ = self._paths(url)
+
+        if meta is not None and now - meta.get("stored_at", 0) < self.ttl:
+            os.utime(body_path)
+            self._count("fresh")
+            return body
+
+        request_headers = dict(headers or {})
+        if meta is not None:
+            if meta.get("etag"):
+                request_headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                request_headers["If-Modified-Since"] = meta["last_modified"]
+
+        response = self.client.get(url, headers=request_headers, timeout=timeout)
+
+        if response.status_code == 304 and meta is not None:
+            meta["stored_at"] = now
+            meta["etag"] = response.headers.get("ETag", meta.get("etag"))
+            meta["last_modified"] = response.headers.get("Last-Modified", meta.get("last_modified"))
+            self._save_meta(url, meta)
+            os.utime(body_path)
+            self._count("revalidated")
+            return body
+
+        response.raise_for_status()
+        body = response.content
+        self.put(url, body, etag=response.headers.get("ETag"),
+                 last_modified=response.headers.get("Last-Modified"), stored_at=now)
+        self._count("downloaded", len(body))
+        return body
+
+    def put(self, url, body, etag=None, last_modified=None, stored_at=None):
+        """Store `body` as the response for `url`, as if it had just been downloaded"""
+        self._store(url, {
+            "url": url,
+            "stored_at": time.time() if stored_at is None else stored_at,
+            "etag": etag,
+            "last_modified": last_modified,
+            "size": len(body)
+        }, body)
+
+    def get_json(self, url, headers=None, timeout=10):
+        return json.loads(self.get(url, headers=headers, timeout=timeout).decode("utf-8"))
+
+    def summary(self):
+        s = self.stats
+        return "HTTP cache: %d fresh, %d revalidated (304), %d downloaded, %.1f KB transferred" % (
+            s["fresh"], s["revalidated"], s["downloaded"], s["bytes"] / 1024)
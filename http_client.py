@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP client used by every fetcher.
+
+Keeps one keep-alive connection pool per host, caps concurrent requests per
+host and retries transient failures with exponential backoff and full jitter.
+429/503 responses honour the server's Retry-After header.
+
+Tuning lives here (or in the environment) rather than in each script:
+    SKIRK_HTTP_MAX_RETRIES=n              retries after the first attempt (default 4)
+    SKIRK_HTTP_HOST_LIMITS=host=n,...     per-host concurrency caps (default 8 per host)
+    SKIRK_BASE_URL=http://127.0.0.1:8765  send every request to a stand-in server
+                                          (see api_replay.py) as <base>/<host>/<path>
+
+With SKIRK_BASE_URL set, host limits, retries and the HTTP cache still see
+the original URL; only the connection goes to the stand-in.
+"""
+import email.utils
+import os
+import random
+import threading
+import time
+from urllib.parse import urlparse, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import instrumentation
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+}
+DEFAULT_POOL_SIZE = 16
+DEFAULT_HOST_LIMIT = 8
+MAX_RETRIES = int(os.environ.get("SKIRK_HTTP_MAX_RETRIES", 4))
+BACKOFF_BASE = 0.5   # seconds, doubled per attempt
+BACKOFF_CAP = 30.0   # longest single wait, including Retry-After
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+BASE_URL = os.environ.get("SKIRK_BASE_URL") or None
+
+
+def parse_host_limits(value):
+    limits = {}
+    for part in filter(None, (p.strip() for p in (value or "").split(","))):
+        host, _, limit = part.partition("=")
+        limits[host.strip()] = int(limit)
+    return limits
+
+
+def rewrite_url(url, base_url):
+    """https://host/path?q -> <base_url>/host/path?q"""
+    parts = urlsplit(url)
+    target = "%s/%s%s" % (base_url.rstrip("/"), parts.netloc, parts.path or "/")
+    return target + ("?" + parts.query if parts.query else "")
+
+
+def retry_after_seconds(response):
+    """Seconds requested by a Retry-After header (delta or HTTP date), or None"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class HttpClient:
+    """Pooled, retrying HTTP client with per-host concurrency caps"""
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, max_retries=MAX_RETRIES,
+                 host_limits=None, default_host_limit=DEFAULT_HOST_LIMIT, headers=None, base_url=None):
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.host_limits = dict(host_limits or {})
+        self.default_host_limit = default_host_limit
+        self.headers = dict(DEFAULT_HEADERS if headers is None else headers)
+        self.base_url = base_url
+        self.lock = threading.Lock()
+        self.sessions = {}
+        self.semaphores = {}
+
+    def _host_state(self, host):
+        with self.lock:
+            if host not in self.sessions:
+                session = requests.Session()
+                session.headers.update(self.headers)
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self.sessions[host] = session
+                limit = self.host_limits.get(host, self.default_host_limit)
+                self.semaphores[host] = threading.BoundedSemaphore(limit)
+            return self.sessions[host], self.semaphores[host]
+
+    def backoff(self, attempt):
+        """Full-jitter exponential backoff for the given retry attempt (0-based)"""
+        return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt)))
+
+    def request(self, method, url, headers=None, timeout=10, stream=False):
+        """Send a request, retrying connection errors and retryable statuses"""
+        session, slots = self._host_state(urlparse(url).netloc)
+        if self.base_url:
+            url = rewrite_url(url, self.base_url)
+        attempt = 0
+        while True:
+            delay = None
+            with slots:
+                started = time.perf_counter()
+                try:
+                    response = session.request(method, url, headers=headers, timeout=timeout, stream=stream)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    instrumentation.record_http(None, time.perf_counter() - started, error=e)
+                    if attempt >= self.max_retries:
+                        raise
+                    delay = self.backoff(attempt)
+                else:
+                    # Time to response headers; streamed bodies are read by the caller
+                    instrumentation.record_http(response.status_code, time.perf_counter() - started)
+                    if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                        return response
+                    if response.status_code in (429, 503):
+                        delay = retry_after_seconds(response)
+                    if delay is None:
+                        delay = self.backoff(attempt)
+                    response.close()
+            # Wait without holding the host slot, so other requests to the host carry on
+            time.sleep(min(delay, BACKOFF_CAP))
+            attempt += 1
+            instrumentation.count("http.retries")
+
+    def get(self, url, headers=None, timeout=10, stream=False):
+        return self.request("GET", url, headers=headers, timeout=timeout, stream=stream)
+
+    def get_json(self, url, headers=None, timeout=10):
+        response = self.get(url, headers=headers, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def close(self):
+        with self.lock:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions.clear()
+            self.semaphores.clear()
+
+
+_default_client = None
+_default_lock = threading.Lock()
+
+
+def get_client():
+    """Process-wide client shared by every fetcher"""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = HttpClient(host_limits=parse_host_limits(os.environ.get("SKIRK_HTTP_HOST_LIMITS")),
+                                         base_url=BASE_URL)
+        return _default_client
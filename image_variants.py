@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Lookup helpers for the WebP/AVIF variants written by optimize_images.py.
+
+Page generators call picture_sources() to emit <source srcset> markup for an
+image URL; when no variants exist the helpers return an empty string so the
+page falls back to the original hot-linked image.
+
+The grid pages are rendered in the browser by script.js and characters.js,
+which read the smaller copy of the manifest that grid_manifest() builds.
+"""
+import json
+from functools import lru_cache
+
+VARIANTS_MANIFEST = "images/variants.json"
+GRID_MANIFEST = "images/grid-variants.json"
+
+
+@lru_cache(maxsize=None)
+def load_variants(path=VARIANTS_MANIFEST):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def variant_entry(url):
+    """Manifest entry for `url`, ignoring cache-busting query strings such as ?vh="""
+    variants = load_variants()
+    return variants.get(url) or variants.get(url.split("?", 1)[0])
+
+
+def srcset(url, fmt="webp", prefix=""):
+    """srcset value listing every width of `url` in `fmt`, or '' if none"""
+    entry = variant_entry(url)
+    if not entry or fmt not in entry["formats"]:
+        return ""
+    widths = entry["formats"][fmt]
+    return ", ".join("%s%s %sw" % (prefix, path, width)
+                     for width, path in sorted(widths.items(), key=lambda item: int(item[0])))
+
+
+def picture_sources(url, sizes, prefix=""):
+    """<source> tags (AVIF first, then WebP) to place before the <img> in a <picture>"""
+    tags = []
+    for fmt in ("avif", "webp"):
+        value = srcset(url, fmt, prefix)
+        if value:
+            tags.append('<source type="image/%s" srcset="%s" sizes="%s">' % (fmt, value, sizes))
+    return "".join(tags)
+
+
+def grid_manifest(variants):
+    """Browser copy of `variants` for the grid pages: URL without query string -> {fmt: {width: path}}"""
+    return {url.split("?", 1)[0]: entry["formats"] for url, entry in variants.items()}
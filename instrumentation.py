@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Lightweight metrics shared by the fetchers and generators.
+
+The shared layers report into one process-wide registry:
+
+    http_client   every attempt: latency, status, errors, retries
+    http_cache    fresh hits, 304 revalidations, downloads, bytes transferred
+    jsonio, parallel_render, download_images
+                  files and bytes written
+
+Counters are plain dict increments under a lock, so recording is always on.
+When SKIRK_METRICS_FILE is set (build.py sets it for every step) the process
+writes a snapshot there on exit, including wall and CPU time and, on Linux,
+the process I/O counters from /proc/self/io. build.py merges the snapshots
+into build_report.json.
+
+Compare two reports to spot regressions:
+
+    python instrumentation.py diff                         # previous build vs last build
+    python instrumentation.py diff old.json new.json --threshold 20
+    python instrumentation.py show build_report.json
+"""
+import argparse
+import atexit
+import json
+import math
+import os
+import sys
+import threading
+import time
+
+METRICS_FILE = os.environ.get("SKIRK_METRICS_FILE")
+REPORT_PATH = "build_report.json"
+PREVIOUS_REPORT_PATH = os.path.join(".cache", "build", "build_report.prev.json")
+REPORT_VERSION = 1
+
+_lock = threading.Lock()
+_counters = {}
+_samples = {}
+_started = time.perf_counter()
+_cpu_started = time.process_time()
+
+
+def count(name, n=1):
+    """Add `n` to the counter `name`"""
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def observe(name, value):
+    """Record one sample (e.g. a latency in ms) for percentile reporting"""
+    with _lock:
+        _samples.setdefault(name, []).append(value)
+
+
+def record_write(path, nbytes):
+    count("files.written")
+    count("bytes.written", nbytes)
+
+
+def record_http(status, seconds, error=None):
+    """One HTTP attempt; `status` is None when the attempt raised `error`"""
+    count("http.requests")
+    observe("http.latency_ms", seconds * 1000)
+    if error is not None:
+        count("http.errors")
+        count("http.error.%s" % type(error).__name__)
+    else:
+        count("http.status.%d" % status)
+
+
+def percentiles(values):
+    """p50/p90/p99/max/mean of `values` (nearest-rank), or None when empty"""
+    if not values:
+        return None
+    ordered = sorted(values)
+
+    def rank(p):
+        return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+    return {
+        "count": len(ordered),
+        "p50": round(rank(50), 2),
+        "p90": round(rank(90), 2),
+        "p99": round(rank(99), 2),
+        "max": round(ordered[-1], 2),
+        "mean": round(sum(ordered) / len(ordered), 2),
+    }
+
+
+def process_io():
+    """Syscall-level I/O of this process (Linux only; rchar/wchar include sockets)"""
+    try:
+        with open("/proc/self/io", "r") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+    except OSError:
+        return None
+    return {key: int(value) for key, value in fields.items()}
+
+
+def snapshot():
+    """Everything recorded so far in this process"""
+    with _lock:
+        counters = dict(_counters)
+        samples = {name: list(values) for name, values in _samples.items()}
+    children = os.times()
+    return {
+        "pid": os.getpid(),
+        "wall_seconds": round(time.perf_counter() - _started, 3),
+        "cpu_seconds": round(time.process_time() - _cpu_started + children.children_user
+                             + children.children_system, 3),
+        "io": process_io(),
+        "counters": counters,
+        "samples": samples,
+    }
+
+
+def _write_snapshot():
+    data = snapshot()
+    directory = os.path.dirname(METRICS_FILE)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = METRICS_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp, METRICS_FILE)
+
+
+if METRICS_FILE:
+    atexit.register(_write_snapshot)
+
+
+def http_summary(counters, latencies):
+    """The http section of a report from raw counters and latency samples"""
+    status = {key.rsplit(".", 1)[1]: n for key, n in counters.items() if key.startswith("http.status.")}
+    errors = {key.rsplit(".", 1)[1]: n for key, n in counters.items() if key.startswith("http.error.")}
+    return {
+        "requests": counters.get("http.requests", 0),
+        "retries": counters.get("http.retries", 0),
+        "errors": errors,
+        "status": status,
+        "latency_ms": percentiles(latencies),
+        "cache": {
+            "fresh": counters.get("http.cache.fresh", 0),
+            "revalidated": counters.get("http.cache.revalidated", 0),
+            "downloaded": counters.get("http.cache.downloaded", 0),
+            "bytes": counters.get("http.cache.bytes", 0),
+        },
+    }
+
+
+def step_metrics(data):
+    """Summarize a process snapshot (as written to SKIRK_METRICS_FILE) for a report"""
+    counters = data.get("counters", {})
+    io = data.get("io") or {}
+    return {
+        "files_written": counters.get("files.written", 0),
+        "bytes_written": counters.get("bytes.written", 0),
+        "io": {
+            "read_chars": io.get("rchar"),
+            "write_chars": io.get("wchar"),
+            "read_bytes": io.get("read_bytes"),
+            "write_bytes": io.get("write_bytes"),
+        } if io else None,
+        "http": http_summary(counters, data.get("samples", {}).get("http.latency_ms", [])),
+        "counters": counters,
+    }
+
+
+def load_report(path):
+    with open(path, "r", encoding="utf-8") as f:
+        report = json.load(f)
+    if report.get("version") != REPORT_VERSION:
+        raise ValueError("%s: unsupported report version %r" % (path, report.get("version")))
+    return report
+
+
+def _metrics(step):
+    """Flat comparable numbers for one report step"""
+    http = step.get("http") or {}
+    latency = http.get("latency_ms") or {}
+    return {
+        "wall_seconds": step.get("wall_seconds"),
+        "cpu_seconds": step.get("cpu_seconds"),
+        "bytes_written": step.get("bytes_written"),
+        "files_written": step.get("files_written"),
+        "http_requests": http.get("requests"),
+        "http_retries": http.get("retries"),
+        "http_p90_ms": latency.get("p90"),
+    }
+
+
+# Changes smaller than these are noise, whatever the percentage
+ABSOLUTE_FLOOR = {"wall_seconds": 0.5, "cpu_seconds": 0.5, "bytes_written": 64 * 1024, "files_written": 5,
+                  "http_requests": 5, "http_retries": 3, "http_p90_ms": 50}
+
+
+def diff_reports(old, new, threshold=10.0):
+    """Rows of (step, metric, old, new, percent change, regression?) for steps that ran in both builds"""
+    rows = []
+    old_steps = dict(old.get("steps", {}), __total__=dict(old.get("totals", {}), status="ran"))
+    new_steps = dict(new.get("steps", {}), __total__=dict(new.get("totals", {}), status="ran"))
+    for name, step in new_steps.items():
+        # A skipped step did no work; comparing it with a real run says nothing
+        if step.get("status") != "ran" or old_steps.get(name, {}).get("status") != "ran":
+            continue
+        before = _metrics(old_steps[name])
+        after = _metrics(step)
+        for metric, value in after.items():
+            previous = before.get(metric)
+            if value is None or previous is None or value == previous:
+                continue
+            change = 100.0 * (value - previous) / previous if previous else math.inf
+            regression = (change > threshold and value - previous >= ABSOLUTE_FLOOR[metric])
+            rows.append((name, metric, previous, value, change, regression))
+    return rows
+
+
+def print_report(report):
+    print("Build of %s at %s: %.1fs wall, %.1fs CPU" % (
+        report.get("commit") or "unknown commit", report.get("started_at"),
+        report["totals"]["wall_seconds"], report["totals"]["cpu_seconds"]))
+    print("%-22s %-8s %8s %8s %10s %6s %6s %9s" % (
+        "step", "status", "wall", "cpu", "written", "files", "http", "p90 ms"))
+    for name, step in report["steps"].items():
+        http = step.get("http") or {}
+        latency = http.get("latency_ms") or {}
+        print("%-22s %-8s %7.1fs %7.1fs %9.1fK %6s %6s %9s" % (
+            name, step["status"], step.get("wall_seconds") or 0, step.get("cpu_seconds") or 0,
+            (step.get("bytes_written") or 0) / 1024, step.get("files_written") or 0,
+            http.get("requests") or 0, latency.get("p90", "-")))
+    if report.get("critical_path"):
+        print("Critical path: %s" % " → ".join(report["critical_path"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect and compare build reports")
+    commands = parser.add_subparsers(dest="command", required=True)
+    show = commands.add_parser("show", help="print a report as a table")
+    show.add_argument("report", nargs="?", default=REPORT_PATH)
+    diff = commands.add_parser("diff", help="compare two reports; exits 1 on regressions")
+    diff.add_argument("old", nargs="?", default=PREVIOUS_REPORT_PATH)
+    diff.add_argument("new", nargs="?", default=REPORT_PATH)
+    diff.add_argument("--threshold", type=float, default=10.0,
+                      help="percent increase counted as a regression (default: %(default)s)")
+    args = parser.parse_args()
+
+    if args.command == "show":
+        print_report(load_report(args.report))
+        return
+
+    old, new = load_report(args.old), load_report(args.new)
+    print("%s (%s) -> %s (%s)" % (args.old, old.get("commit") or "?", args.new, new.get("commit") or "?"))
+    rows = diff_reports(old, new, args.threshold)
+    if not rows:
+        print("No differences")
+        return
+    print("%-22s %-14s %12s %12s %9s" % ("step", "metric", "old", "new", "change"))
+    for name, metric, previous, value, change, regression in rows:
+        print("%-22s %-14s %12s %12s %8.0f%%%s" % (
+            "total" if name == "__total__" else name, metric, previous, value, change,
+            "  ⚠ regression" if regression else ""))
+    regressions = sum(1 for row in rows if row[5])
+    if regressions:
+        print("\n%d regression(s) above %.0f%%" % (regressions, args.threshold))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
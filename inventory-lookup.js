@@ -0,0 +1,76 @@
+// Resolves inventory item ids using the sharded files in inventory-index/,
+// written by generate_inventory.py. Each shard covers a contiguous id range;
+// lookup shards map id -> {name, icon, rank, category} and items shards hold
+// the full inventory.json records. Only the shards covering the requested ids
+// are fetched, and each is fetched at most once per page.
+const InventoryLookup = (() => {
+    const INDEX_URL = new URL('inventory-index/', document.currentScript ? document.currentScript.src : location.href).href;
+    let manifestPromise = null;
+    const shardPromises = new Map();
+
+    function loadManifest() {
+        if (!manifestPromise) {
+            manifestPromise = fetch(INDEX_URL + 'manifest.json').then(r => {
+                if (!r.ok) throw new Error(`inventory manifest: HTTP ${r.status}`);
+                return r.json();
+            });
+        }
+        return manifestPromise;
+    }
+
+    function loadShard(file) {
+        if (!shardPromises.has(file)) {
+            shardPromises.set(file, fetch(INDEX_URL + file).then(r => r.json()));
+        }
+        return shardPromises.get(file);
+    }
+
+    function shardFor(manifest, id) {
+        // Shards are sorted by id range: binary search for the one containing id
+        let lo = 0;
+        let hi = manifest.shards.length - 1;
+        while (lo <= hi) {
+            const mid = (lo + hi) >> 1;
+            const shard = manifest.shards[mid];
+            if (id < shard.first) hi = mid - 1;
+            else if (id > shard.last) lo = mid + 1;
+            else return shard;
+        }
+        return null;
+    }
+
+    // Array of {id, ...fields} for the ids that exist; kind is 'lookup' or 'items'
+    async function getItems(ids, kind = 'lookup') {
+        const manifest = await loadManifest();
+        const wanted = [...new Set(ids.map(id => parseInt(id)))].filter(id => !isNaN(id));
+        const files = new Map();
+        wanted.forEach(id => {
+            const shard = shardFor(manifest, id);
+            if (shard) files.set(id, shard[kind]);
+        });
+        const shards = new Map();
+        await Promise.all([...new Set(files.values())].map(async file => {
+            shards.set(file, await loadShard(file));
+        }));
+        const items = [];
+        files.forEach((file, id) => {
+            const entry = shards.get(file)[id];
+            if (entry) items.push({ id, ...entry });
+        });
+        return items;
+    }
+
+    async function getItem(id, kind = 'lookup') {
+        const [item] = await getItems([id], kind);
+        return item || null;
+    }
+
+    // Every item's lookup fields, for pages that search across the inventory
+    async function all() {
+        const manifest = await loadManifest();
+        const shards = await Promise.all(manifest.shards.map(shard => loadShard(shard.lookup)));
+        return shards.flatMap(shard => Object.entries(shard).map(([id, entry]) => ({ id: parseInt(id), ...entry })));
+    }
+
+    return { loadManifest, getItems, getItem, all };
+})();
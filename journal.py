@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Append-only progress journal for resumable downloads.
+
+Each completed item is appended as one JSON line and flushed to disk right
+away, so a run that dies halfway (timeout, Ctrl-C, fatal error) leaves a record
+of everything it finished. The next run loads the journal, skips those items
+and rebuilds the aggregate output from the journal plus the per-item files.
+The journal is removed once the aggregate has been written.
+"""
+import json
+import os
+import threading
+import time
+
+
+class Journal:
+    """JSON-lines log of completed items keyed by item id"""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.records = {}
+        self.started_at = None
+
+    def load(self):
+        """Read completed items from a previous run whose per-item file still exists"""
+        self.records = {}
+        self.started_at = None
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A torn final line from a crash mid-write
+                        continue
+                    if "started_at" in record:
+                        self.started_at = record["started_at"]
+                    elif os.path.exists(record.get("file", "")):
+                        self.records[record["id"]] = record
+        except OSError:
+            pass
+        return self.records
+
+    def start(self):
+        """Begin a run, keeping any items completed by an interrupted one"""
+        if not os.path.exists(self.path):
+            self.started_at = time.strftime("%Y-%m-%d %H:%M:%S")
+            self._append({"started_at": self.started_at})
+
+    def record(self, item_id, file_path, entry):
+        """Mark an item as completed once its per-item file is on disk"""
+        record = {"id": item_id, "file": file_path, "entry": entry}
+        with self.lock:
+            self.records[item_id] = record
+            self._append(record)
+
+    def _append(self, record):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def entries(self, order):
+        """Aggregate entries for completed items, in the given id order"""
+        return [self.records[item_id]["entry"] for item_id in order if item_id in self.records]
+
+    def finish(self):
+        """Drop the journal once the aggregate output is safely written"""
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+        self.records = {}
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Shared JSON serialization for every data file the site serves.
+
+In the default (development) mode write_json() produces exactly what the
+writers used to produce with json.dump(..., indent=N), and keeps the line
+endings of the file it replaces, so regenerating a file checked in with CRLF
+endings does not rewrite every line (new files get LF). Production mode,
+enabled with SKIRK_JSON_MODE=production or set_production(True), writes:
+
+  * minified JSON (no whitespace), keys in the same insertion order as the
+    source data, so output is stable run to run without reordering lists of
+    versions or banners the way sort_keys would
+  * a gzip sibling (<file>.gz, level 9, zero mtime so it is reproducible)
+  * a brotli sibling (<file>.br) when the optional brotli package is installed
+
+and prints a before/after byte report for every file written when the
+process exits. Stale .gz/.br siblings are removed when writing in
+development mode so a server never picks up an outdated precompressed copy.
+
+Existing files can be converted in place:
+
+    SKIRK_JSON_MODE=production python jsonio.py inventory.json materials.json
+"""
+import argparse
+import atexit
+import gzip
+import json
+import os
+import threading
+
+import instrumentation
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+PRODUCTION = os.environ.get("SKIRK_JSON_MODE", "").lower() == "production"
+COMPRESSED_SUFFIXES = (".gz", ".br")
+
+_lock = threading.Lock()
+_report = []
+_report_registered = False
+
+
+def set_production(enabled=True):
+    global PRODUCTION
+    PRODUCTION = enabled
+
+
+def dumps(obj, indent=2, ensure_ascii=False, production=None):
+    """Serialize `obj`: minified in production mode, indented otherwise"""
+    if PRODUCTION if production is None else production:
+        return json.dumps(obj, ensure_ascii=ensure_ascii, separators=(",", ":"))
+    return json.dumps(obj, indent=indent, ensure_ascii=ensure_ascii)
+
+
+def line_ending(path, default="\n"):
+    """The line ending ("\\r\\n" or "\\n") of the first line of `path`; `default` if there is none"""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(65536)
+    except OSError:
+        return default
+    end = head.find(b"\n")
+    if end < 0:
+        return default
+    return "\r\n" if end and head[end - 1:end] == b"\r" else "\n"
+
+
+def _write_atomic(path, data):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    instrumentation.record_write(path, len(data))
+
+
+def precompress(path, data):
+    """Write .gz (and .br when available) siblings of `path` holding `data`; returns their sizes"""
+    sizes = {}
+    gz = gzip.compress(data, compresslevel=9, mtime=0)
+    _write_atomic(path + ".gz", gz)
+    sizes["gz"] = len(gz)
+    if brotli is not None:
+        br = brotli.compress(data, quality=11)
+        _write_atomic(path + ".br", br)
+        sizes["br"] = len(br)
+    return sizes
+
+
+def remove_precompressed(path):
+    for suffix in COMPRESSED_SUFFIXES:
+        try:
+            os.remove(path + suffix)
+        except FileNotFoundError:
+            pass
+
+
+def write_bytes(path, data, before=None, production=None):
+    """
+    Write already-serialized JSON bytes. In production mode the compressed
+    siblings are written too and the file is added to the exit report, with
+    `before` as the size of its development-mode form.
+    """
+    production = PRODUCTION if production is None else production
+    path = os.fspath(path)
+    _write_atomic(path, data)
+    if not production:
+        remove_precompressed(path)
+        return
+    sizes = precompress(path, data)
+    _record(path, before if before is not None else len(data), len(data), sizes)
+
+
+def write_json(path, obj, indent=2, ensure_ascii=False, production=None, newline=None):
+    """
+    Drop-in replacement for `json.dump(obj, f, indent=indent, ensure_ascii=ensure_ascii)`.
+    Lines end with `newline`, by default whatever the existing file at `path` uses.
+    """
+    production = PRODUCTION if production is None else production
+    path = os.fspath(path)
+    text = dumps(obj, indent=indent, ensure_ascii=ensure_ascii, production=production)
+    if not production:
+        # JSON strings never hold a raw newline, so every "\n" here is a line break
+        if (newline or line_ending(path)) == "\r\n":
+            text = text.replace("\n", "\r\n")
+    before = None
+    if production:
+        before = len(dumps(obj, indent=indent, ensure_ascii=ensure_ascii, production=False).encode("utf-8"))
+    write_bytes(path, text.encode("utf-8"), before=before, production=production)
+
+
+def _record(path, before, after, sizes):
+    global _report_registered
+    with _lock:
+        _report.append((path, before, after, sizes))
+        if not _report_registered:
+            atexit.register(print_report)
+            _report_registered = True
+
+
+def print_report():
+    """Per-file byte report for everything written in production mode"""
+    with _lock:
+        rows = list(_report)
+        _report.clear()
+    if not rows:
+        return
+
+    def kb(n):
+        return "%.1f KB" % (n / 1024) if n is not None else "-"
+
+    width = min(max(len(path) for path, *_ in rows), 48)
+    print("\nJSON output (production mode):")
+    print("  %-*s %10s %10s %10s %10s" % (width, "file", "pretty", "minified", "gzip", "brotli"))
+    totals = [0, 0, 0, 0]
+    for path, before, after, sizes in rows:
+        gz = sizes.get("gz")
+        br = sizes.get("br")
+        print("  %-*s %10s %10s %10s %10s" % (width, path[-width:], kb(before), kb(after), kb(gz), kb(br)))
+        totals[0] += before
+        totals[1] += after
+        totals[2] += gz or 0
+        totals[3] += br or 0
+    if len(rows) > 1:
+        print("  %-*s %10s %10s %10s %10s" % (width, "total (%d files)" % len(rows), kb(totals[0]), kb(totals[1]),
+                                              kb(totals[2]), kb(totals[3]) if brotli is not None else "-"))
+    smallest = totals[3] if brotli is not None else totals[2]
+    print("  over the wire: %s -> %s (%.0f%% smaller)%s" % (
+        kb(totals[0]), kb(smallest), 100 * (1 - smallest / max(totals[0], 1)),
+        "" if brotli is not None else "; install brotli for .br output"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rewrite JSON files through the shared serializer")
+    parser.add_argument("files", nargs="+", help="JSON files to rewrite in place")
+    parser.add_argument("--indent", type=int, default=2,
+                        help="indentation for development mode (default: %(default)s)")
+    args = parser.parse_args()
+
+    for path in args.files:
+        with open(path, "r", encoding="utf-8") as f:
+            obj = json.load(f)
+        data = dumps(obj, indent=args.indent).encode("utf-8")
+        # Report against the file as it was on disk, not a re-indented copy
+        write_bytes(path, data, before=os.path.getsize(path))
+    if not PRODUCTION:
+        print("Rewrote %d file(s) in development mode; set SKIRK_JSON_MODE=production to minify" % len(args.files))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Transcode mirrored icons into WebP (and AVIF where Pillow supports it) at
+several thumbnail widths, on a process pool.
+
+Reads the image references in characters.json, weapons.json, artifacts.json
+and inventory.json (the same sources download_images.py mirrors), resolves
+them to the mirrored copies in images/objects and writes:
+
+    images/variants/<sha256>-<width>.<fmt>
+    images/variants.json    original URL -> {width, height, formats: {fmt: {width: path}}}
+    images/grid-variants.json   the same without sizes or query strings, read
+                                by the grid pages in script.js/characters.js
+
+Run download_images.py first; URLs that have not been mirrored are skipped.
+Requires Pillow (pip install Pillow).
+"""
+import argparse
+import json
+import os
+import sys
+from multiprocessing import Pool
+
+from download_images import SOURCES, MANIFEST_PATH as MIRROR_MANIFEST
+from image_variants import GRID_MANIFEST, VARIANTS_MANIFEST, grid_manifest
+from jsonio import write_json
+
+try:
+    from PIL import Image, features
+except ImportError:
+    Image = None
+
+VARIANTS_DIR = "images/variants"
+# Grid tiles are 60-180px wide; these cover them at 1x and 2x density
+THUMB_WIDTHS = (64, 128, 256)
+QUALITY = {"webp": 80, "avif": 55}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build WebP/AVIF thumbnails for mirrored images")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: %(default)s)")
+    parser.add_argument("--widths", type=int, nargs="+", default=list(THUMB_WIDTHS),
+                        help="thumbnail widths in pixels (default: %(default)s)")
+    parser.add_argument("--no-avif", action="store_true", help="only produce WebP")
+    return parser.parse_args()
+
+
+def output_formats(no_avif):
+    formats = ["webp"]
+    if not no_avif and features.check("avif"):
+        formats.append("avif")
+    return formats
+
+
+def transcode(task):
+    """Write every variant of one stored image; runs in a worker process"""
+    digest, source_path, widths, formats = task
+    try:
+        with Image.open(source_path) as img:
+            img.load()
+            width, height = img.size
+            if img.mode not in ("RGB", "RGBA"):
+                img = img.convert("RGBA" if "transparency" in img.info or img.mode in ("LA", "PA") else "RGB")
+
+            # Never upscale: thumbnails wider than the original collapse into the full size
+            targets = sorted({w for w in widths if w < width} | {width})
+            variants = {fmt: {} for fmt in formats}
+            for target in targets:
+                resized = None
+                for fmt in formats:
+                    path = "%s/%s-%d.%s" % (VARIANTS_DIR, digest, target, fmt)
+                    if not os.path.exists(path):
+                        if resized is None:
+                            target_height = max(1, round(height * target / width))
+                            resized = img if target == width else img.resize((target, target_height), Image.LANCZOS)
+                        tmp_path = "%s.%d.tmp" % (path, os.getpid())
+                        resized.save(tmp_path, fmt.upper(), quality=QUALITY[fmt])
+                        os.replace(tmp_path, path)
+                    variants[fmt][str(target)] = path
+        return digest, {"width": width, "height": height, "formats": variants}, None
+    except Exception as e:
+        return digest, None, str(e)
+
+
+def main():
+    args = parse_args()
+    if Image is None:
+        print("✗ Pillow is required: pip install Pillow")
+        sys.exit(1)
+
+    try:
+        with open(MIRROR_MANIFEST, "r", encoding="utf-8") as f:
+            mirror = json.load(f)
+    except (OSError, ValueError):
+        print(f"✗ No mirror manifest at {MIRROR_MANIFEST}; run download_images.py first")
+        sys.exit(1)
+
+    urls = []
+    for source in SOURCES.values():
+        urls.extend(img_url for img_url, _ in source())
+    urls = list(dict.fromkeys(urls))
+
+    # One task per distinct image body, however many URLs point at it
+    tasks = {}
+    missing = 0
+    for img_url in urls:
+        record = mirror.get(img_url)
+        if record and os.path.exists(record["path"]):
+            tasks.setdefault(record["sha256"], record["path"])
+        else:
+            missing += 1
+
+    formats = output_formats(args.no_avif)
+    os.makedirs(VARIANTS_DIR, exist_ok=True)
+    print(f"Transcoding {len(tasks)} unique images to {', '.join(formats)} "
+          f"at widths {args.widths} on {args.jobs} processes...")
+    if missing:
+        print(f"⚠ {missing} referenced images are not mirrored yet (run download_images.py)")
+
+    results = {}
+    errors = 0
+    work = [(digest, path, args.widths, formats) for digest, path in tasks.items()]
+    with Pool(processes=args.jobs) as pool:
+        for digest, info, error in pool.imap_unordered(transcode, work, chunksize=8):
+            if error:
+                errors += 1
+                print(f"✗ {tasks[digest]}: {error}")
+            else:
+                results[digest] = info
+
+    variants = {}
+    for img_url in urls:
+        record = mirror.get(img_url)
+        if record and record["sha256"] in results:
+            variants[img_url] = results[record["sha256"]]
+
+    with open(VARIANTS_MANIFEST, "w", encoding="utf-8") as f:
+        json.dump(variants, f, indent=2, ensure_ascii=False)
+    write_json(GRID_MANIFEST, grid_manifest(variants), indent=None)
+
+    # Compare what a grid tile used to download with the 128px WebP it can use now;
+    # benchmarks/bench_grid_bytes.py measures what each grid page actually loads
+    original_bytes = sum(os.path.getsize(tasks[d]) for d in results)
+    thumb_bytes = 0
+    for info in results.values():
+        webp = info["formats"]["webp"]
+        thumb = webp.get("128") or webp[max(webp, key=int)]
+        thumb_bytes += os.path.getsize(thumb)
+
+    print(f"\n✓ Wrote variants for {len(variants)} URLs ({len(results)} unique images, {errors} errors)")
+    print(f"✓ Saved manifest to {VARIANTS_MANIFEST} (grid pages: {GRID_MANIFEST})")
+    if thumb_bytes:
+        print(f"  Originals: {original_bytes / 1024:.1f} KB -> 128px WebP: {thumb_bytes / 1024:.1f} KB "
+              f"({original_bytes / thumb_bytes:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
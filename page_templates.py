@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Minimal compiled template engine for the static page generators.
+
+Templates live in templates/ and support three constructs:
+
+    {{ name }}                   value from the context, HTML-escaped
+    {{ name|safe }}              value inserted as-is (pre-rendered markup)
+    {% include "partial.html" %} another template, inlined at compile time
+
+Each template is parsed once per process into a flat list of literal chunks
+and lookups; rendering is a single join over that list. Pages are rendered
+into a shared layout with render_page().
+"""
+import hashlib
+import html
+import os
+import re
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+
+TOKEN_RE = re.compile(r"\{\{\s*(.+?)\s*\}\}|\{%\s*(.+?)\s*%\}")
+INCLUDE_RE = re.compile(r"""include\s+["']([^"']+)["']$""")
+
+
+class TemplateError(Exception):
+    pass
+
+
+class Template:
+    """A compiled template: literal strings interleaved with (name, escape) lookups"""
+
+    def __init__(self, name, parts, sources):
+        self.name = name
+        self.parts = parts
+        # Every file this template was compiled from, for fingerprinting
+        self.sources = sources
+
+    def render(self, context):
+        out = []
+        for part in self.parts:
+            if isinstance(part, str):
+                out.append(part)
+                continue
+            key, escape = part
+            try:
+                value = context[key]
+            except KeyError:
+                raise TemplateError("%s: missing value for '%s'" % (self.name, key))
+            value = "" if value is None else str(value)
+            out.append(html.escape(value) if escape else value)
+        return "".join(out)
+
+
+class TemplateEngine:
+    def __init__(self, directory=TEMPLATE_DIR):
+        self.directory = directory
+        self.cache = {}
+
+    def _read(self, name):
+        with open(os.path.join(self.directory, name), "r", encoding="utf-8") as f:
+            return f.read()
+
+    def _compile(self, name, stack=()):
+        if name in stack:
+            raise TemplateError("include cycle: %s" % " -> ".join(stack + (name,)))
+        source = self._read(name)
+        parts = []
+        sources = [name]
+        pos = 0
+        for match in TOKEN_RE.finditer(source):
+            parts.append(source[pos:match.start()])
+            pos = match.end()
+            expr, tag = match.groups()
+            if expr is not None:
+                key, _, flt = expr.partition("|")
+                if flt.strip() not in ("", "safe"):
+                    raise TemplateError("%s: unknown filter '%s'" % (name, flt.strip()))
+                parts.append((key.strip(), flt.strip() != "safe"))
+                continue
+            include = INCLUDE_RE.match(tag)
+            if not include:
+                raise TemplateError("%s: unknown tag '{%% %s %%}'" % (name, tag))
+            partial = self._compile(include.group(1), stack + (name,))
+            parts.extend(partial.parts)
+            sources.extend(partial.sources)
+        parts.append(source[pos:])
+
+        # Merge adjacent literals so rendering touches as few items as possible
+        merged = []
+        for part in parts:
+            if isinstance(part, str):
+                if not part:
+                    continue
+                if merged and isinstance(merged[-1], str):
+                    merged[-1] += part
+                    continue
+            merged.append(part)
+        return Template(name, merged, sources)
+
+    def get(self, name):
+        template = self.cache.get(name)
+        if template is None:
+            template = self.cache[name] = self._compile(name)
+        return template
+
+    def render(self, template, /, **context):
+        return self.get(template).render(context)
+
+    def render_page(self, template, /, layout="layout.html", **context):
+        """Render a page template and wrap it in the shared layout"""
+        content = self.render(template, **context)
+        return self.render(layout, content=content, **context)
+
+    def fingerprint(self, *names):
+        """Hash of every source file behind the given templates"""
+        h = hashlib.sha256()
+        for source in sorted({s for name in names for s in self.get(name).sources}):
+            h.update(source.encode("utf-8") + b"\0" + self._read(source).encode("utf-8") + b"\0")
+        return h.hexdigest()
+
+
+_engine = None
+
+
+def get_engine():
+    """Process-wide engine so templates are compiled once per process"""
+    global _engine
+    if _engine is None:
+        _engine = TemplateEngine()
+    return _engine
+
+
+def render_page(template, /, **context):
+    return get_engine().render_page(template, **context)
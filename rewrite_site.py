@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Site-wide find/replace for HTML pages and templates, in one pass per file.
+
+All rules are compiled into a single regular expression (an alternation,
+longest rule first) and each file is rewritten with one scan, on a thread
+pool. Files whose content does not change are never written; line endings
+and encoding are preserved byte for byte.
+
+A rule's text may contain {root}, the path back to the site root. It matches
+any run of "../" (so one rule covers root pages, weapons/*.html and deeper
+pages alike) as well as the {{ root }} placeholder in templates/, and the
+replacement reuses whatever prefix was matched (so a replacement may only
+use {root} if its find text does).
+
+    python rewrite_site.py --rule '<a href="{root}achievements.html">Achievements</a>' \\
+                                  '<a href="{root}wishes.html">Banners</a>' --dry-run
+    python rewrite_site.py --rules nav-rules.json
+    python rewrite_site.py --preset banners-menu
+
+A rules file is a JSON list of [find, replace] pairs or {"find", "replace"}
+objects. --dry-run prints a unified diff instead of writing.
+"""
+import argparse
+import difflib
+import fnmatch
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT_TOKEN = "{root}"
+# Relative prefixes in pages, or the placeholder the page templates use
+ROOT_PATTERN = r"(?:\.\./)*|\{\{ root \}\}"
+SKIP_DIRS = {".git", ".cache", "node_modules", "__pycache__"}
+
+PRESETS = {
+    # What update_menu_across_pages.py and update_menu_subdirs.py did
+    "banners-menu": [
+        ('<a href="{root}achievements.html">Achievements</a>', '<a href="{root}wishes.html">Banners</a>'),
+    ],
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Apply find/replace rules across the site in one pass per file")
+    parser.add_argument("paths", nargs="*", default=["."], help="files or directories (default: .)")
+    parser.add_argument("--rule", nargs=2, action="append", default=[], metavar=("FIND", "REPLACE"),
+                        help="literal rule; {root} matches the path back to the site root")
+    parser.add_argument("--rules", metavar="FILE", help="JSON file of rules")
+    parser.add_argument("--preset", choices=sorted(PRESETS), action="append", default=[],
+                        help="built-in rule set")
+    parser.add_argument("--glob", default="*.html", help="file name pattern (default: %(default)s)")
+    parser.add_argument("--jobs", type=int, default=min(32, (os.cpu_count() or 1) + 4),
+                        help="worker threads (default: %(default)s)")
+    parser.add_argument("--dry-run", action="store_true", help="print a diff instead of writing")
+    return parser.parse_args()
+
+
+def load_rules(args):
+    rules = [tuple(rule) for rule in args.rule]
+    for name in args.preset:
+        rules.extend(PRESETS[name])
+    if args.rules:
+        with open(args.rules, "r", encoding="utf-8") as f:
+            for entry in json.load(f):
+                rules.append((entry["find"], entry["replace"]) if isinstance(entry, dict) else tuple(entry))
+    return rules
+
+
+class Rewriter:
+    """A rule set compiled into one matcher"""
+
+    def __init__(self, rules):
+        if not rules:
+            raise ValueError("no rules given (use --rule, --rules or --preset)")
+        for find, replace in rules:
+            # The replacement's {root} is filled from what the find text's {root} matched
+            if ROOT_TOKEN in replace and ROOT_TOKEN not in find:
+                raise ValueError("rule %r -> %r: the replacement uses %s but the find text does not"
+                                 % (find, replace, ROOT_TOKEN))
+        self.rules = list(rules)
+        # Longest first, so a rule that extends another wins where both match
+        order = sorted(range(len(self.rules)), key=lambda i: -len(self.rules[i][0]))
+        self.regex = re.compile("|".join(self._compile(i, self.rules[i][0]) for i in order))
+        # Plain-text fragments: a file containing none of them cannot match
+        self.anchors = [max(find.split(ROOT_TOKEN), key=len) for find, _ in self.rules]
+        self.templates = [replace.split(ROOT_TOKEN) for _, replace in self.rules]
+
+    @staticmethod
+    def _compile(index, find):
+        parts = find.split(ROOT_TOKEN)
+        pattern = re.escape(parts[0])
+        for n, part in enumerate(parts[1:]):
+            # Later {root}s in the same rule must repeat the first one's prefix
+            pattern += ("(?P<root%d>%s)" % (index, ROOT_PATTERN) if n == 0 else "(?P=root%d)" % index)
+            pattern += re.escape(part)
+        return "(?P<rule%d>%s)" % (index, pattern)
+
+    def rewrite(self, text):
+        """(new text, replacements per rule index)"""
+        if not any(anchor in text for anchor in self.anchors):
+            return text, {}
+        counts = {}
+
+        def replace(match):
+            index = int(match.lastgroup[len("rule"):])
+            counts[index] = counts.get(index, 0) + 1
+            template = self.templates[index]
+            if len(template) == 1:
+                return template[0]
+            return match.group("root%d" % index).join(template)
+
+        return self.regex.sub(replace, text), counts
+
+
+def find_files(paths, pattern):
+    for path in paths:
+        if os.path.isfile(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+            for name in sorted(files):
+                if fnmatch.fnmatch(name, pattern):
+                    yield os.path.join(root, name)
+
+
+def process(rewriter, path, dry_run):
+    """(path, replacement counts, diff text or None); writes the file unless dry_run"""
+    with open(path, "rb") as f:
+        data = f.read()
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError:
+        return path, None, None
+    new_text, counts = rewriter.rewrite(text)
+    if new_text == text:
+        return path, {}, None
+    if dry_run:
+        diff = "".join(difflib.unified_diff(text.splitlines(True), new_text.splitlines(True),
+                                            "a/" + os.path.normpath(path), "b/" + os.path.normpath(path)))
+        return path, counts, diff
+    with open(path, "wb") as f:
+        f.write(new_text.encode("utf-8"))
+    return path, counts, None
+
+
+def main():
+    args = parse_args()
+    try:
+        rewriter = Rewriter(load_rules(args))
+    except ValueError as e:
+        sys.exit("✗ %s" % e)
+
+    started = time.perf_counter()
+    files = list(find_files(args.paths, args.glob))
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        results = list(pool.map(lambda path: process(rewriter, path, args.dry_run), files))
+
+    totals = [0] * len(rewriter.rules)
+    changed = 0
+    for path, counts, diff in results:
+        if counts is None:
+            print("⚠ Skipped %s (not UTF-8)" % path)
+            continue
+        if not counts:
+            continue
+        changed += 1
+        for index, n in counts.items():
+            totals[index] += n
+        if diff:
+            sys.stdout.write(diff)
+        else:
+            print("✓ Updated: %s (%d replacement%s)" % (path, sum(counts.values()),
+                                                     "" if sum(counts.values()) == 1 else "s"))
+
+    print("\n%s %d of %d files in %.2fs" % ("Would update" if args.dry_run else "Updated", changed,
+                                            len(files), time.perf_counter() - started))
+    for (find, _), n in zip(rewriter.rules, totals):
+        print("  %5d × %s" % (n, find))
+
+
+if __name__ == "__main__":
+    main()
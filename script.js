@@ -16,9 +16,6 @@ function initializeSearch() {
     const searchClose = document.getElementById('searchClose');
     const searchOverlay = document.getElementById('searchOverlay');
     const searchResults = document.getElementById('searchResults');
-    let charactersData = [];
-    let weaponsData = [];
-    let artifactsData = [];
 
     // Open search modal
     if (searchBtn) {
@@ -50,74 +47,23 @@ function initializeSearch() {
         }
     });
 
-    // Fetch data
-    Promise.all([
-        fetch('characters.json').then(r => r.json()).catch(() => []),
-        fetch('weapons.json').then(r => r.json()).catch(() => []),
-        fetch('artifacts.json').then(r => r.json()).catch(() => [])
-    ]).then(([chars, weaps, arts]) => {
-        charactersData = chars || [];
-        weaponsData = weaps || [];
-        artifactsData = arts || [];
-    });
+    // Prebuilt index from build_search_index.py: one small file, no full scans per keystroke
+    let searchIndex = null;
+    fetch(new URL('search-index.json', SITE_ROOT))
+        .then(r => r.json())
+        .then(index => { searchIndex = prepareSearchIndex(index); })
+        .catch(() => {});
 
     // Search input functionality
     if (searchInput) {
         searchInput.addEventListener('input', (e) => {
-            const query = e.target.value.toLowerCase();
-            if (query.length === 0) {
+            const query = e.target.value;
+            if (query.trim().length === 0) {
                 searchResults.innerHTML = '<p style="text-align: center; color: #999; margin-top: 20px;">Start typing to search...</p>';
                 return;
             }
 
-            let results = [];
-
-            // Search characters
-            const matchingChars = charactersData.filter(c => 
-                c.name.toLowerCase().includes(query) || 
-                c.title?.toLowerCase().includes(query)
-            ).slice(0, 5);
-
-            matchingChars.forEach(char => {
-                results.push({
-                    type: 'character',
-                    name: char.name,
-                    description: char.title || 'Character',
-                    link: `characters.html?search=${char.name}`,
-                    image: char.image
-                });
-            });
-
-            // Search weapons
-            const matchingWeaps = weaponsData.filter(w => 
-                w.name.toLowerCase().includes(query) || 
-                w.type?.toLowerCase().includes(query)
-            ).slice(0, 3);
-
-            matchingWeaps.forEach(weap => {
-                results.push({
-                    type: 'weapon',
-                    name: weap.name,
-                    description: weap.type || 'Weapon',
-                    link: 'weapons.html',
-                    image: weap.image
-                });
-            });
-
-            // Search artifacts
-            const matchingArts = artifactsData.filter(a => 
-                a.name.toLowerCase().includes(query)
-            ).slice(0, 3);
-
-            matchingArts.forEach(art => {
-                results.push({
-                    type: 'artifact',
-                    name: art.name,
-                    description: 'Artifact Set',
-                    link: 'artifacts.html',
-                    image: art.image
-                });
-            });
+            const results = searchIndex ? querySearchIndex(searchIndex, query) : [];
 
             if (results.length === 0) {
                 searchResults.innerHTML = '<p style="text-align: center; color: #999; margin-top: 20px;">No results found</p>';
@@ -140,6 +86,69 @@ function initializeSearch() {
     }
 }
 
+// Site root, taken from this script's own URL so pages in subfolders find the index
+const SITE_ROOT = new URL('.', document.currentScript ? document.currentScript.src : location.href).href;
+
+// Results shown per type, in index order: characters, weapons, artifacts
+const SEARCH_LIMITS = [5, 3, 3];
+
+// Must match normalize() in build_search_index.py (validate.py checks both against
+// search-normalize-vectors.json)
+function normalizeSearchText(text) {
+    return (text || '').normalize('NFKD').replace(/\p{M}/gu, '').toLowerCase()
+        .replace(/['’]/g, '').replace(/[^\p{L}\p{N}]+/gu, ' ').trim();
+}
+
+function prepareSearchIndex(index) {
+    // Posting lists are stored as gaps between ascending record ids
+    const decode = (table) => {
+        const out = new Map();
+        for (const [key, gaps] of Object.entries(table)) {
+            let id = 0;
+            out.set(key, gaps.map(gap => (id += gap)));
+        }
+        return out;
+    };
+    return {
+        types: index.types,
+        records: index.records,
+        keys: index.keys,
+        prefix: decode(index.prefix)
+    };
+}
+
+function querySearchIndex(index, query) {
+    const q = normalizeSearchText(query);
+    if (!q) return [];
+
+    // Queries match at the start of a word, so every hit has a word beginning
+    // with the first 1-2 characters of the query's first word
+    const candidates = index.prefix.get(q.split(' ')[0].slice(0, 2)) || [];
+    const verify = q.length > 2;
+
+    const counts = SEARCH_LIMITS.map(() => 0);
+    const results = [];
+    for (const id of candidates) {
+        const [type, name, description, linkArg, imageArg] = index.records[id];
+        if (counts[type] >= SEARCH_LIMITS[type]) continue;
+        if (verify && !(' ' + index.keys[id]).includes(' ' + q)) continue;
+        counts[type]++;
+
+        const [tag, linkPattern, imagePattern, defaultDescription] = index.types[type];
+        const image = !imageArg ? '' : imageArg.includes('://') ? imageArg : imagePattern.replace('%s', imageArg);
+        results.push({
+            type: tag,
+            name,
+            description: description || defaultDescription,
+            link: new URL(linkPattern.replace('%s', encodeURIComponent(linkArg || name)), SITE_ROOT).href,
+            image
+        });
+        if (counts.every((count, i) => count >= SEARCH_LIMITS[i])) break;
+    }
+    // Records are stored characters, weapons, artifacts, so results keep that grouping
+    return results;
+}
+
 // Initialize search on page load
 if (document.readyState === 'loading') {
     document.addEventListener('DOMContentLoaded', initializeSearch);
@@ -613,6 +622,59 @@ function applyUnreleasedContent() {
     }
 }
 
+// -------------------- grid thumbnails --------------------
+// images/grid-variants.json from optimize_images.py: original URL (no query
+// string) -> {format: {width: path}}. Tiles without an entry, or a site built
+// without the images step, keep loading the original URL.
+let gridVariantsRequest = null;
+function loadGridVariants() {
+    if (!gridVariantsRequest) {
+        gridVariantsRequest = fetch(new URL('images/grid-variants.json', SITE_ROOT))
+            .then(r => r.ok ? r.json() : {})
+            .catch(() => ({}));
+    }
+    return gridVariantsRequest;
+}
+
+// <source> tags (AVIF first, then WebP) for `url`, or '' if it has no variants
+function variantSources(variants, url, sizes) {
+    const entry = variants[url.split('?')[0]];
+    if (!entry) return '';
+    return ['avif', 'webp'].filter(fmt => entry[fmt]).map(fmt => {
+        const srcset = Object.entries(entry[fmt])
+            .map(([width, path]) => `${new URL(path, SITE_ROOT).href} ${width}w`)
+            .join(', ');
+        return `<source type="image/${fmt}" srcset="${srcset}" sizes="${sizes}">`;
+    }).join('');
+}
+
+// Tile markup: the <img> wrapped in a <picture> when `url` has thumbnails
+function tileImageHtml(variants, url, sizes, imgHtml) {
+    const sources = variantSources(variants, url, sizes);
+    return sources ? `<picture>${sources}${imgHtml}</picture>` : imgHtml;
+}
+
+// Same for an <img> element built with createElement
+function tileImageElement(variants, img, sizes) {
+    const sources = variantSources(variants, img.getAttribute('src') || '', sizes);
+    if (!sources) return img;
+    const picture = document.createElement('picture');
+    picture.innerHTML = sources;
+    picture.appendChild(img);
+    return picture;
+}
+
+// A thumbnail that fails to load drops its <source>s so the <img> retries the
+// original URL; only when that fails too does the tile's own onerror run
+document.addEventListener('error', (e) => {
+    const img = e.target;
+    if (img.tagName !== 'IMG' || !img.parentNode || img.parentNode.tagName !== 'PICTURE') return;
+    const sources = img.parentNode.querySelectorAll('source');
+    if (!sources.length) return;
+    e.stopPropagation();
+    sources.forEach(source => source.remove());
+}, true);
+
 // -------------------- generic search support --------------------
 function initializePageSearch() {
     const input = document.getElementById('pageSearchInput');
@@ -620,6 +682,7 @@ function initializePageSearch() {
     if (!input || !results) return;
     const url = results.dataset.source;
     let items = [];
+    let variants = {};
     
     // Filter state
     let activeFilters = {
@@ -642,7 +705,7 @@ function initializePageSearch() {
             
             card.innerHTML = `
                 <div class="weapon-image-container">
-                    <img src="${iconUrl}" alt="${item.name}" onerror="this.src='data:image/svg+xml,%3Csvg xmlns=%22http://www.w3.org/2000/svg%22 width=%22100%22 height=%22100%22%3E%3Crect fill=%22%23333%22 width=%22100%22 height=%22100%22/%3E%3Ctext fill=%22%23666%22 text-anchor=%22middle%22 x=%2250%22 y=%2250%22%3E?%3C/text%3E%3C/svg%3E'">
+                    ${tileImageHtml(variants, iconUrl, '(max-width: 768px) 64px, 136px', `<img src="${iconUrl}" alt="${item.name}" onerror="this.src='data:image/svg+xml,%3Csvg xmlns=%22http://www.w3.org/2000/svg%22 width=%22100%22 height=%22100%22%3E%3Crect fill=%22%23333%22 width=%22100%22 height=%22100%22/%3E%3Ctext fill=%22%23666%22 text-anchor=%22middle%22 x=%2250%22 y=%2250%22%3E?%3C/text%3E%3C/svg%3E'">`)}
                 </div>
                 <div class="weapon-info">
                     <div class="weapon-name">${item.name || 'Unknown Weapon'}</div>
@@ -665,7 +728,9 @@ function initializePageSearch() {
             
             // Add click handler to navigate to weapon detail page
             card.addEventListener('click', () => {
-                window.location.href = `weapon.html?id=${item.id}`;
+                // Pre-rendered page written by generate_weapon_pages.py (same name sanitising)
+                const pageName = item.name.replace(/[\/\\:*?"<>|]/g, '_');
+                window.location.href = `weapons/${encodeURIComponent(pageName)}.html`;
             });
         } else if (url === 'artifacts.json') {
             // Artifact card
@@ -681,7 +746,7 @@ function initializePageSearch() {
             
             card.innerHTML = `
                 <div class="artifact-image-container">
-                    <img src="${iconUrl}" alt="${item.name}" onerror="this.src='data:image/svg+xml,%3Csvg xmlns=%22http://www.w3.org/2000/svg%22 width=%22100%22 height=%22100%22%3E%3Crect fill=%22%23333%22 width=%22100%22 height=%22100%22/%3E%3Ctext fill=%22%23666%22 text-anchor=%22middle%22 x=%2250%22 y=%2250%22%3E?%3C/text%3E%3C/svg%3E'">
+                    ${tileImageHtml(variants, iconUrl, '(max-width: 768px) 64px, 124px', `<img src="${iconUrl}" alt="${item.name}" onerror="this.src='data:image/svg+xml,%3Csvg xmlns=%22http://www.w3.org/2000/svg%22 width=%22100%22 height=%22100%22%3E%3Crect fill=%22%23333%22 width=%22100%22 height=%22100%22/%3E%3Ctext fill=%22%23666%22 text-anchor=%22middle%22 x=%2250%22 y=%2250%22%3E?%3C/text%3E%3C/svg%3E'">`)}
                 </div>
                 <div class="artifact-info">
                     <div class="artifact-name">${item.name || 'Unknown Artifact'}</div>
@@ -721,7 +786,7 @@ function initializePageSearch() {
             
             card.innerHTML = `
                 <div style="width: 60px; height: 60px; display: flex; align-items: center; justify-content: center;">
-                    <img src="${iconUrl}" alt="${item.name}" style="max-width: 100%; max-height: 100%; object-fit: contain;" onerror="this.src='data:image/svg+xml,%3Csvg xmlns=%22http://www.w3.org/2000/svg%22 width=%2260%22 height=%2260%22%3E%3Crect fill=%22%23333%22 width=%2260%22 height=%2260%22/%3E%3Ctext fill=%22%23666%22 text-anchor=%22middle%22 x=%2230%22 y=%2235%22%3E?%3C/text%3E%3C/svg%3E'">
+                    ${tileImageHtml(variants, iconUrl, '60px', `<img src="${iconUrl}" alt="${item.name}" style="max-width: 100%; max-height: 100%; object-fit: contain;" onerror="this.src='data:image/svg+xml,%3Csvg xmlns=%22http://www.w3.org/2000/svg%22 width=%2260%22 height=%2260%22%3E%3Crect fill=%22%23333%22 width=%2260%22 height=%2260%22/%3E%3Ctext fill=%22%23666%22 text-anchor=%22middle%22 x=%2230%22 y=%2235%22%3E?%3C/text%3E%3C/svg%3E'">`)}
                 </div>
                 <div style="text-align: center; width: 100%;">
                     <div style="font-size: 12px; color: #999; font-size: 10px; text-transform: uppercase; letter-spacing: 0.5px; margin-bottom: 4px;">${item.category}</div>
@@ -800,10 +865,11 @@ function initializePageSearch() {
         render(filtered);
     };
 
-    fetch(url)
-        .then(r => r.json())
-        .then(data => {
+    // Thumbnails are optional: loadGridVariants() resolves to {} without them
+    Promise.all([fetch(url).then(r => r.json()), loadGridVariants()])
+        .then(([data, gridVariants]) => {
             items = data || [];
+            variants = gridVariants;
             render(items);
         })
         .catch(err => {
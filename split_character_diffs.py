@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Split version_diffs.json and character_changes.json per character for
+character.html.
+
+Writes character-diffs/<key>.json with one character's version diffs, plus
+character-diffs/manifest.json, the only file every changelog tab fetches. It
+is always minified and holds just {"characters": {key: {"diffs": file,
+"versions": [...]}}}: the diff file (null when there is no diff data, so the
+page can skip that fetch entirely) and the versions the character changed
+in. Patch versions and the changes themselves stay in the diff files.
+"""
+import os
+
+from catalogue import get_catalogue
+from jsonio import COMPRESSED_SUFFIXES, dumps, write_bytes, write_json
+
+DIFFS_PATH = 'version_diffs.json'
+CHANGES_PATH = 'character_changes.json'
+OUTPUT_DIR = 'character-diffs'
+MANIFEST_NAME = 'manifest.json'
+
+
+def load_document(name, path, default):
+    try:
+        return get_catalogue().document(name)
+    except (OSError, ValueError) as e:
+        print(f"⚠ Could not read {path}: {e}")
+        return default
+
+
+def diff_filename(key):
+    safe = "".join(c if c.isalnum() or c in ('-', '_') else '_' for c in str(key))
+    return f"{safe}.json"
+
+
+def main():
+    version_diffs = load_document('version_diffs', DIFFS_PATH, {})
+    changes = load_document('character_changes', CHANGES_PATH, {'meta': {}, 'characters': {}})
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    characters = {}
+    written = set()
+    diff_bytes = 0
+    for key, entry in changes.get('characters', {}).items():
+        characters[key] = {'diffs': None, 'versions': entry.get('changed_in_versions', [])}
+
+    for key, diff in version_diffs.items():
+        filename = diff_filename(key)
+        path = os.path.join(OUTPUT_DIR, filename)
+        write_json(path, diff, indent=2)
+        diff_bytes += os.path.getsize(path)
+        written.add(filename)
+
+        entry = characters.setdefault(key, {
+            'diffs': None,
+            'versions': sorted({v.rsplit('.', 1)[0] for v in diff.get('diffs', {})}),
+        })
+        entry['diffs'] = filename
+
+    # Minified even in development mode: this is on every changelog tab's path
+    manifest = {'characters': characters}
+    write_bytes(os.path.join(OUTPUT_DIR, MANIFEST_NAME), dumps(manifest, production=True).encode('utf-8'))
+    written.add(MANIFEST_NAME)
+
+    # Drop files for characters that no longer have diffs
+    for name in os.listdir(OUTPUT_DIR):
+        base, ext = os.path.splitext(name)
+        if name not in written and not (ext in COMPRESSED_SUFFIXES and base in written):
+            os.remove(os.path.join(OUTPUT_DIR, name))
+
+    manifest_bytes = os.path.getsize(os.path.join(OUTPUT_DIR, MANIFEST_NAME))
+    source_bytes = sum(os.path.getsize(p) for p in (DIFFS_PATH, CHANGES_PATH) if os.path.exists(p))
+    count = len(written) - 1
+    print(f"✓ Split diffs for {count} characters into {OUTPUT_DIR}/")
+    print(f"  manifest: {manifest_bytes / 1024:.1f} KB, "
+          f"diff files: {diff_bytes / max(count, 1) / 1024:.1f} KB on average")
+    print(f"  sources: {source_bytes / 1024:.1f} KB fetched per page before")
+
+
+if __name__ == '__main__':
+    main()
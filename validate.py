@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Schema and referential-integrity checks for the whole catalogue.
+
+    schema:<dataset>   required fields and their types, duplicate ids (and
+                       duplicate names where pages are named after them)
+    inventory          inventory.json holds exactly the items of materials.json
+    weapon-ascension   every ascension material in Data/weapons/ is in inventory.json
+    character-map      every character_map.json entry is a character in
+                       characters.json (and back), with its Data/data/ file
+    banners            every character featured in banners-data.json is in characters.json
+    weapon-pages       every weapons/*.html page has its weapons.json entry and
+                       Data/weapons/ file, and every weapon has its page
+    artifact-pages     the same for artifacts/*.html, artifacts.json and Data/artifacts/
+    character-diffs    every diff file named in character-diffs/manifest.json exists
+    inventory-index    every shard in inventory-index/manifest.json exists and the
+                       count matches inventory.json
+    catalogue-db       importing into a scratch catalogue_db.py database and exporting
+                       reproduces every JSON file it covers byte for byte
+    search-normalize:py / :js
+                       normalize() in build_search_index.py and normalizeSearchText()
+                       in script.js (run with node, skipped without it) give the
+                       expected output for every pair in search-normalize-vectors.json
+
+Cross-references are checked as set differences over id and name indexes
+built once (through catalogue.py), with the checks running in parallel.
+Checks whose inputs are not there (Data/ before a fetch, pages before a
+render) are skipped with a note. Prints one line per check plus the first
+few problems of each, and exits 1 if any check found an error.
+
+    python validate.py
+    python validate.py --only banners character-map --max-errors 50
+
+Replaces check_materials.py, check_weapons.py, verify_inventory.py,
+verify_materials_update.py, verify_character_update.py and
+test_material_ids.py, which printed spot checks but never failed.
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from build_search_index import normalize
+from catalogue import get_catalogue
+from catalogue_db import EXPORTS, round_trip
+from download_weapons import weapon_detail_path
+from generate_artifact_pages import sanitize_filename
+from generate_weapon_pages import page_path
+
+NULL = type(None)
+# dataset -> {field: type or tuple of types}; every field must be present
+SCHEMAS = {
+    # The player characters (Traveler, Manekin, Manekina) have no vision
+    "characters": {"id": int, "name": str, "vision": (str, NULL), "weapon": str, "rarity": int},
+    "weapons": {"id": str, "name": str, "type": str, "rarity": int, "icon": str},
+    "artifacts": {"id": str, "name": str, "icon": str},
+    "materials": {"id": int, "name": str, "type": str, "icon": str},
+    "inventory": {"id": int, "name": str, "category": str, "icon": str, "rank": int},
+    "character_map": {"name": str, "route": str, "file": str},
+}
+# Pages are named after these, so two records with one name would share a page
+UNIQUE_NAMES = {"characters", "weapons", "artifacts"}
+NORMALIZE_VECTORS = "search-normalize-vectors.json"
+NODE_NORMALIZE = """
+const normalizeSearchText = (%s);
+const vectors = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+console.log(JSON.stringify(vectors.map(([input]) => normalizeSearchText(input))));
+"""
+
+
+class Findings:
+    """What one check found"""
+
+    def __init__(self, name):
+        self.name = name
+        self.checked = 0
+        self.errors = []
+        self.skipped = None
+        self.seconds = 0.0
+
+    def error(self, message):
+        self.errors.append(message)
+
+    def skip(self, reason):
+        self.skipped = reason
+
+
+def artifact_detail_path(name):
+    # Named the way download_artifacts.py saves them
+    return "Data/artifacts/%s.json" % "".join(c if c.isalnum() or c in (" ", "-", "_") else "" for c in name)
+
+
+def load_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def check_schema(findings, catalogue, dataset_name):
+    dataset = catalogue.dataset(dataset_name)
+    filename = os.path.basename(dataset.path)
+    schema = SCHEMAS[dataset_name]
+    seen_ids = set()
+    seen_names = set()
+    for record in dataset:
+        findings.checked += 1
+        label = "%s: %s" % (filename, record.id)
+        for field, kind in schema.items():
+            if field not in record.raw:
+                findings.error("%s: missing %s" % (label, field))
+            elif not isinstance(record.raw[field], kind):
+                expected = " or ".join(k.__name__ for k in (kind if isinstance(kind, tuple) else (kind,)))
+                findings.error("%s: %s is %s, expected %s" % (label, field, type(record.raw[field]).__name__, expected))
+        key = str(record.id)
+        if key in seen_ids:
+            findings.error("%s: duplicate id" % label)
+        seen_ids.add(key)
+        if dataset_name in UNIQUE_NAMES and record.name is not None:
+            if record.name in seen_names:
+                findings.error("%s: duplicate name %r" % (label, record.name))
+            seen_names.add(record.name)
+
+
+def check_inventory(findings, catalogue):
+    inventory = {str(item.id) for item in catalogue.inventory}
+    materials = {str(item.id) for item in catalogue.materials}
+    findings.checked = len(inventory | materials)
+    for item_id in sorted(materials - inventory, key=int):
+        findings.error("materials.json item %s is missing from inventory.json (run generate_inventory.py)" % item_id)
+    for item_id in sorted(inventory - materials, key=int):
+        findings.error("inventory.json item %s is not in materials.json" % item_id)
+
+
+def check_weapon_ascension(findings, catalogue):
+    if not os.path.isdir("Data/weapons"):
+        return findings.skip("no Data/weapons/ (run download_weapons.py)")
+    inventory = {str(item.id) for item in catalogue.inventory}
+    for path in sorted(glob.glob("Data/weapons/*.json")):
+        detail = load_json(path)
+        used = {str(item_id) for item_id in (detail.get("ascension") or {})}
+        findings.checked += len(used)
+        for item_id in sorted(used - inventory):
+            findings.error("%s: ascension material %s is not in inventory.json" % (path, item_id))
+
+
+def check_character_map(findings, catalogue):
+    mapped = {str(entry.id) for entry in catalogue.character_map}
+    characters = {str(char.id) for char in catalogue.characters}
+    findings.checked = len(mapped | characters)
+    for char_id in sorted(mapped - characters):
+        findings.error("character_map.json: %s (%s) is not in characters.json"
+                       % (char_id, catalogue.character_map.get(char_id).name))
+    for char_id in sorted(characters - mapped):
+        findings.error("characters.json: %s (%s) has no character_map.json entry, so it has no character page"
+                       % (char_id, catalogue.characters.get(char_id).name))
+    # character.html loads Data/data/<file>.json
+    if os.path.isdir("Data/data"):
+        present = {os.path.splitext(name)[0] for name in os.listdir("Data/data")}
+        for entry in catalogue.character_map:
+            if entry.file not in present:
+                findings.error("character_map.json: %s: Data/data/%s.json does not exist" % (entry.id, entry.file))
+
+
+def check_banners(findings, catalogue):
+    banners = load_json("banners-data.json")
+    characters = {char.id for char in catalogue.characters}
+    featured = {}
+    for version, entries in banners.get("banners", {}).items():
+        for entry in entries:
+            featured.setdefault(entry.get("id"), (version, entry.get("name")))
+    for name, info in banners.get("characters", {}).items():
+        featured.setdefault(info.get("id"), (", ".join(info.get("versions", [])), name))
+    findings.checked = len(featured)
+    for char_id in sorted(set(featured) - characters, key=str):
+        version, name = featured[char_id]
+        findings.error("banners-data.json: %s (%s, %s) is not in characters.json" % (char_id, name, version))
+
+
+def check_pages(findings, directory, records, page_name, detail_path, source):
+    """Pages in `directory` against the records they are rendered from"""
+    if not os.path.isdir(directory):
+        return findings.skip("no %s/ (run the page generator)" % directory)
+    pages = {name for name in os.listdir(directory) if name.endswith(".html")}
+    by_page = {}
+    for record in records:
+        name = page_name(record)
+        if name in by_page:
+            findings.error("%s and %s both render to %s/%s" % (by_page[name].name, record.name, directory, name))
+        by_page[name] = record
+    details = os.path.isdir(os.path.dirname(detail_path("x")))
+    findings.checked = len(pages | set(by_page))
+    for name in sorted(pages - set(by_page)):
+        findings.error("%s/%s has no entry in %s (stale page)" % (directory, name, source))
+    for name in sorted(set(by_page) - pages):
+        findings.error("%s (%s) has no page %s/%s" % (by_page[name].name, by_page[name].id, directory, name))
+    if details:
+        for name in sorted(pages & set(by_page)):
+            path = detail_path(by_page[name].name or "")
+            if not os.path.exists(path):
+                findings.error("%s/%s: data file %s does not exist" % (directory, name, path))
+
+
+def check_weapon_pages(findings, catalogue):
+    check_pages(findings, "weapons", catalogue.weapons, lambda weapon: page_path(weapon).name,
+                weapon_detail_path, "weapons.json")
+
+
+def check_artifact_pages(findings, catalogue):
+    check_pages(findings, "artifacts", catalogue.artifacts, lambda artifact: sanitize_filename(artifact.name) + ".html",
+                artifact_detail_path, "artifacts.json")
+
+
+def check_character_diffs(findings, catalogue):
+    if not os.path.exists("character-diffs/manifest.json"):
+        return findings.skip("no character-diffs/manifest.json (run split_character_diffs.py)")
+    manifest = load_json("character-diffs/manifest.json")
+    present = set(os.listdir("character-diffs"))
+    for key, entry in manifest.get("characters", {}).items():
+        findings.checked += 1
+        if entry.get("diffs") and entry["diffs"] not in present:
+            findings.error("character-diffs/manifest.json: %s names %s, which does not exist" % (key, entry["diffs"]))
+
+
+def check_inventory_index(findings, catalogue):
+    if not os.path.exists("inventory-index/manifest.json"):
+        return findings.skip("no inventory-index/manifest.json (run generate_inventory.py)")
+    manifest = load_json("inventory-index/manifest.json")
+    present = set(os.listdir("inventory-index"))
+    for shard in manifest.get("shards", []):
+        for field in ("lookup", "items"):
+            findings.checked += 1
+            if shard.get(field) not in present:
+                findings.error("inventory-index/manifest.json: %s shard %s does not exist" % (field, shard.get(field)))
+    if manifest.get("count") != len(catalogue.inventory):
+        findings.error("inventory-index/manifest.json counts %s items, inventory.json has %d (run "
+                       "generate_inventory.py --index-only)" % (manifest.get("count"), len(catalogue.inventory)))
+
+
+def check_catalogue_db(findings, catalogue):
+    findings.checked = len(EXPORTS)
+    for file in round_trip():
+        findings.error("%s: catalogue_db.py export does not reproduce it (see python catalogue_db.py roundtrip)"
+                       % file)
+
+
+def compare_normalized(findings, vectors, outputs, label):
+    findings.checked = len(vectors)
+    for (text, expected), actual in zip(vectors, outputs):
+        if actual != expected:
+            findings.error("%s(%r) is %r, expected %r" % (label, text, actual, expected))
+
+
+def check_search_normalize_py(findings, catalogue):
+    vectors = load_json(NORMALIZE_VECTORS)
+    compare_normalized(findings, vectors, [normalize(text) for text, _ in vectors], "normalize")
+
+
+def check_search_normalize_js(findings, catalogue):
+    node = shutil.which("node")
+    if node is None:
+        return findings.skip("node is not installed")
+    with open("script.js", "r", encoding="utf-8") as f:
+        match = re.search(r"^function normalizeSearchText\(.*?^\}", f.read(), re.M | re.S)
+    if match is None:
+        return findings.error("script.js: normalizeSearchText() not found")
+    vectors = load_json(NORMALIZE_VECTORS)
+    result = subprocess.run([node, "-e", NODE_NORMALIZE % match.group(0)], input=json.dumps(vectors),
+                            capture_output=True, text=True, encoding="utf-8", timeout=60)
+    if result.returncode != 0:
+        return findings.error("node failed: %s" % result.stderr.strip().splitlines()[-1:])
+    compare_normalized(findings, vectors, json.loads(result.stdout), "normalizeSearchText")
+
+
+CHECKS = [("schema:%s" % name, lambda f, c, name=name: check_schema(f, c, name)) for name in SCHEMAS] + [
+    ("inventory", check_inventory),
+    ("weapon-ascension", check_weapon_ascension),
+    ("character-map", check_character_map),
+    ("banners", check_banners),
+    ("weapon-pages", check_weapon_pages),
+    ("artifact-pages", check_artifact_pages),
+    ("character-diffs", check_character_diffs),
+    ("inventory-index", check_inventory_index),
+    ("catalogue-db", check_catalogue_db),
+    ("search-normalize:py", check_search_normalize_py),
+    ("search-normalize:js", check_search_normalize_js),
+]
+
+
+def run_check(name, function, catalogue):
+    findings = Findings(name)
+    started = time.perf_counter()
+    try:
+        function(findings, catalogue)
+    except (OSError, ValueError, KeyError, AttributeError, TypeError) as e:
+        findings.error("could not run: %s: %s" % (type(e).__name__, e))
+    findings.seconds = time.perf_counter() - started
+    return findings
+
+
+def parse_args():
+    names = [name for name, _ in CHECKS]
+    parser = argparse.ArgumentParser(description="Validate the catalogue's schema and cross-references")
+    parser.add_argument("--only", nargs="+", metavar="CHECK",
+                        help="run only these checks (a dataset name selects its schema check); one of: %s"
+                             % ", ".join(names))
+    parser.add_argument("--max-errors", type=int, default=10, help="problems listed per check (default: 10)")
+    parser.add_argument("--jobs", type=int, default=min(8, len(names)), help="checks run at once")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    checks = CHECKS
+    if args.only:
+        wanted = set(args.only) | {"schema:" + name for name in args.only}
+        checks = [(name, function) for name, function in CHECKS if name in wanted]
+        unknown = set(args.only) - {name for name, _ in CHECKS} - set(SCHEMAS)
+        if unknown:
+            sys.exit("Unknown check: %s" % ", ".join(sorted(unknown)))
+
+    started = time.perf_counter()
+    catalogue = get_catalogue()
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        results = list(pool.map(lambda check: run_check(check[0], check[1], catalogue), checks))
+
+    errors = 0
+    for findings in results:
+        if findings.skipped:
+            print("- %-20s skipped: %s" % (findings.name, findings.skipped))
+        elif findings.errors:
+            print("✗ %-20s %d error%s in %d checked" % (findings.name, len(findings.errors),
+                                                       "" if len(findings.errors) == 1 else "s", findings.checked))
+            for message in findings.errors[:args.max_errors]:
+                print("    %s" % message)
+            if len(findings.errors) > args.max_errors:
+                print("    ... and %d more" % (len(findings.errors) - args.max_errors))
+        else:
+            print("✓ %-20s %d checked" % (findings.name, findings.checked))
+        errors += len(findings.errors)
+
+    failed = sum(1 for findings in results if findings.errors)
+    print("\n%s: %d error%s in %d of %d checks (%.2fs)" % (
+        "FAILED" if errors else "OK", errors, "" if errors == 1 else "s", failed, len(results),
+        time.perf_counter() - started))
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()
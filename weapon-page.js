@@ -0,0 +1,29 @@
+// Weapon details are rendered into the page by generate_weapon_pages.py;
+// this script only wires up the interactive controls.
+
+function switchTab(tabName, btn) {
+    document.querySelectorAll('.content-section').forEach(el => el.classList.remove('active'));
+    document.querySelectorAll('.tab-btn').forEach(el => el.classList.remove('active'));
+    document.getElementById(tabName).classList.add('active');
+    btn.classList.add('active');
+}
+
+function changeRank(rank, btn) {
+    document.querySelectorAll('.rank-btn').forEach(b => b.classList.remove('active'));
+    btn.classList.add('active');
+    document.querySelectorAll('.passive-description').forEach(desc => {
+        desc.hidden = desc.dataset.rank !== rank;
+    });
+}
+
+document.querySelectorAll('.tab-btn').forEach(btn => {
+    btn.addEventListener('click', () => switchTab(btn.dataset.tab, btn));
+});
+
+document.querySelectorAll('.rank-btn').forEach(btn => {
+    btn.addEventListener('click', () => changeRank(btn.dataset.rank, btn));
+});
+
+document.getElementById('levelSlider').addEventListener('input', (e) => {
+    document.getElementById('levelValue').textContent = `Lv. ${e.target.value}`;
+});